@@ -0,0 +1,54 @@
+"""Throughput de Clinica.agendar_turnos_lote frente a un bucle de agendar_turno.
+
+Uso: python -m benchmarks.bench_agendar_lote [--filas 100000]
+"""
+import argparse
+from time import perf_counter
+
+from benchmarks.comun import (
+    crear_clinica,
+    dni_sintetico,
+    fecha_sintetica,
+    matricula_sintetica
+)
+
+CANTIDAD_MEDICOS = 100
+CANTIDAD_PACIENTES = 1000
+
+
+def generar_filas(cantidad: int) -> list[tuple]:
+
+    return [
+        (dni_sintetico(i % CANTIDAD_PACIENTES), matricula_sintetica(i % CANTIDAD_MEDICOS),
+         "Clinica Medica", fecha_sintetica(i // CANTIDAD_MEDICOS))
+        for i in range(cantidad)
+    ]
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--filas", type=int, default=100_000)
+    args = parser.parse_args()
+
+    filas = generar_filas(args.filas)
+
+    clinica = crear_clinica(CANTIDAD_PACIENTES, CANTIDAD_MEDICOS)
+    inicio = perf_counter()
+    for fila in filas:
+        clinica.agendar_turno(*fila)
+    tiempo_bucle = perf_counter() - inicio
+
+    clinica = crear_clinica(CANTIDAD_PACIENTES, CANTIDAD_MEDICOS)
+    inicio = perf_counter()
+    reporte = clinica.agendar_turnos_lote(filas)
+    tiempo_lote = perf_counter() - inicio
+    assert all(resultado["ok"] for resultado in reporte)
+
+    print(f"bucle agendar_turno: {args.filas / tiempo_bucle:>12,.0f} turnos/s")
+    print(f"agendar_turnos_lote: {args.filas / tiempo_lote:>12,.0f} turnos/s")
+    print(f"aceleracion:         {tiempo_bucle / tiempo_lote:>12.2f}x")
+
+
+if __name__ == "__main__":
+    main()
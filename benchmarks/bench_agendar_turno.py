@@ -0,0 +1,62 @@
+"""Latencia de Clinica.agendar_turno a medida que crece la agenda.
+
+Uso: python -m benchmarks.bench_agendar_turno [--tamanios 1000 10000 ...]
+"""
+import argparse
+
+from benchmarks.comun import (
+    crear_clinica,
+    cronometrar,
+    dni_sintetico,
+    fecha_sintetica,
+    matricula_sintetica,
+    percentil
+)
+
+CANTIDAD_MEDICOS = 100
+CANTIDAD_PACIENTES = 1000
+
+
+def sembrar(clinica, desde: int, hasta: int):
+
+    for i in range(desde, hasta):
+        clinica.agendar_turno(
+            dni_sintetico(i % CANTIDAD_PACIENTES),
+            matricula_sintetica(i % CANTIDAD_MEDICOS),
+            "Clinica Medica",
+            fecha_sintetica(i // CANTIDAD_MEDICOS)
+        )
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tamanios", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--muestras", type=int, default=2_000)
+    args = parser.parse_args()
+
+    clinica = crear_clinica(CANTIDAD_PACIENTES, CANTIDAD_MEDICOS)
+    existentes = 0
+
+    print(f"{'turnos':>10} {'media (us)':>12} {'p50 (us)':>10} {'p99 (us)':>10}")
+    for tamanio in sorted(args.tamanios):
+        sembrar(clinica, existentes, tamanio)
+        existentes = tamanio
+
+        tiempos = []
+        for i in range(existentes, existentes + args.muestras):
+            tiempos.append(cronometrar(
+                clinica.agendar_turno,
+                dni_sintetico(i % CANTIDAD_PACIENTES),
+                matricula_sintetica(i % CANTIDAD_MEDICOS),
+                "Clinica Medica",
+                fecha_sintetica(i // CANTIDAD_MEDICOS)
+            ))
+        existentes += args.muestras
+
+        media = sum(tiempos) / len(tiempos) * 1e6
+        print(f"{tamanio:>10} {media:>12.2f} {percentil(tiempos, 50) * 1e6:>10.2f} {percentil(tiempos, 99) * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
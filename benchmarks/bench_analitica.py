@@ -0,0 +1,113 @@
+"""Consultas de analitica sobre la copia columnar de turnos frente a recorrer objetos Turno.
+
+Carga N turnos sinteticos repartidos en varios anios, medicos y especialidades, y mide cada
+consulta de ColumnasTurnos contra el mismo calculo hecho fila por fila sobre los Turno.
+
+Uso: python -m benchmarks.bench_analitica [--turnos 100000 1000000]
+"""
+import argparse
+from collections import Counter
+from datetime import timedelta
+from time import perf_counter
+
+from benchmarks.comun import FECHA_BASE, dni_sintetico, matricula_sintetica
+from src.models.columnasTurnos import ColumnasTurnos
+from src.models.especialidad import DIAS_SEMANA
+from src.models.medico import Medico
+from src.models.paciente import Paciente
+from src.models.turno import Turno
+
+CANTIDAD_MEDICOS = 500
+CANTIDAD_PACIENTES = 10_000
+ESPECIALIDADES = ("Clinica Medica", "Cardiologia", "Pediatria", "Traumatologia", "Dermatologia")
+
+
+def crear_turnos(cantidad: int) -> list[Turno]:
+
+    # Cada medico atiende un turno cada 30 minutos entre las 8 y las 18, sin superposiciones
+    medicos = [Medico("Medico Sintetico", matricula_sintetica(i)) for i in range(CANTIDAD_MEDICOS)]
+    pacientes = [Paciente("Paciente Sintetico", dni_sintetico(i), "01/01/1990") for i in range(CANTIDAD_PACIENTES)]
+    turnos = []
+    for i in range(cantidad):
+        bloque = i // CANTIDAD_MEDICOS
+        fecha_hora = FECHA_BASE + timedelta(days=bloque // 20, hours=8, minutes=30 * (bloque % 20))
+        turnos.append(Turno.restaurar(pacientes[i % CANTIDAD_PACIENTES], medicos[i % CANTIDAD_MEDICOS], fecha_hora,
+                                      ESPECIALIDADES[i % len(ESPECIALIDADES)], 30))
+    return turnos
+
+
+def utilizacion_por_objetos(turnos: list[Turno]) -> dict:
+
+    # Cada turno suma a todas las horas que ocupa, no solo a la de inicio
+    resultado: dict = {}
+    for turno in turnos:
+        fecha_hora = turno.obtener_fecha_hora()
+        matricula = turno.obtener_medico().obtener_matricula()
+        hora_semana = fecha_hora.weekday() * 24 + fecha_hora.hour
+        inicio = fecha_hora.minute
+        duracion = turno.obtener_duracion()
+        while duracion > 0:
+            tramo = min(duracion, 60 - inicio)
+            clave = (matricula, DIAS_SEMANA[hora_semana // 24], hora_semana % 24)
+            resultado[clave] = resultado.get(clave, 0) + tramo
+            duracion -= tramo
+            inicio = 0
+            hora_semana = (hora_semana + 1) % (7 * 24)
+    return resultado
+
+
+def utilizacion_de_medico_por_objetos(turnos: list[Turno], matricula: str) -> dict:
+
+    return utilizacion_por_objetos([t for t in turnos if t.obtener_medico().obtener_matricula() == matricula])
+
+
+def especialidades_por_objetos(turnos: list[Turno]) -> Counter:
+
+    return Counter(turno.obtener_especialidad() for turno in turnos)
+
+
+def tendencia_por_objetos(turnos: list[Turno], especialidad: str) -> Counter:
+
+    return Counter((t.obtener_fecha_hora().year, t.obtener_fecha_hora().month)
+                   for t in turnos if t.obtener_especialidad() == especialidad)
+
+
+def medir(funcion, *args) -> tuple[float, object]:
+
+    inicio = perf_counter()
+    resultado = funcion(*args)
+    return (perf_counter() - inicio) * 1e3, resultado
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turnos", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'turnos':>9} {'consulta':<28} {'objetos (ms)':>13} {'columnas (ms)':>14} {'aceleracion':>12}")
+    for cantidad in args.turnos:
+        turnos = crear_turnos(cantidad)
+        columnas = ColumnasTurnos()
+        for turno in turnos:
+            columnas.agregar(turno)
+
+        consultas = (
+            ("utilizacion semanal", (utilizacion_por_objetos, turnos), (columnas.utilizacion_semanal,)),
+            ("cantidad por especialidad", (especialidades_por_objetos, turnos), (columnas.cantidad_por_especialidad,)),
+            ("tendencia mensual", (tendencia_por_objetos, turnos, "Pediatria"),
+             (columnas.tendencia_mensual, "Pediatria")),
+            ("utilizacion de un medico", (utilizacion_de_medico_por_objetos, turnos, matricula_sintetica(7)),
+             (columnas.utilizacion_semanal, matricula_sintetica(7))),
+        )
+        for nombre, por_objetos, por_columnas in consultas:
+            ms_objetos, esperado = medir(*por_objetos)
+            ms_columnas, obtenido = medir(*por_columnas)
+            if dict(esperado) != dict(obtenido):
+                raise SystemExit(f"{nombre}: los resultados no coinciden")
+            print(f"{cantidad:>9} {nombre:<28} {ms_objetos:>13.1f} {ms_columnas:>14.1f} "
+                  f"{ms_objetos / ms_columnas:>11.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Particion caliente/fria: memoria y latencias antes y despues de archivar los turnos terminados.
+
+Restaura N turnos pasados (como al reproducir el diario), mide memoria retenida, latencia de
+agendar_turno y lectura de historias clinicas, archiva con Clinica.archivar_turnos y vuelve a medir.
+
+Uso: python -m benchmarks.bench_archivo [--turnos 100000 1000000] [--reservas 2000]
+"""
+import argparse
+import gc
+import tracemalloc
+from datetime import datetime, timedelta
+from time import perf_counter
+
+from benchmarks.comun import FECHA_BASE, crear_clinica, dni_sintetico, matricula_sintetica, percentil
+from src.models.clinica import Clinica
+from src.models.turno import Turno
+
+CANTIDAD_MEDICOS = 500
+CANTIDAD_PACIENTES = 10_000
+# Inicio de los turnos pasados sinteticos
+FECHA_PASADA = datetime(2015, 1, 5, 0, 0)
+
+
+def cargar_pasados(clinica: Clinica, cantidad: int):
+
+    # Cada medico atiende un turno cada 30 minutos entre las 8 y las 18, sin superposiciones
+    turnos = []
+    for i in range(cantidad):
+        bloque = i // CANTIDAD_MEDICOS
+        fecha_hora = FECHA_PASADA + timedelta(days=bloque // 20, hours=8, minutes=30 * (bloque % 20))
+        turnos.append(Turno.restaurar(clinica.obtener_paciente_por_dni(dni_sintetico(i % CANTIDAD_PACIENTES)),
+                                      clinica.obtener_medico_por_matricula(matricula_sintetica(i % CANTIDAD_MEDICOS)),
+                                      fecha_hora, "Clinica Medica", 30))
+    clinica._registrar_turnos_lote(turnos)
+
+
+def medir_reservas(clinica: Clinica, desde: int, cantidad: int) -> tuple[float, float]:
+
+    latencias = []
+    for i in range(desde, desde + cantidad):
+        fecha_hora = FECHA_BASE + timedelta(days=i // CANTIDAD_MEDICOS, hours=8)
+        inicio = perf_counter()
+        clinica.agendar_turno(dni_sintetico(i % CANTIDAD_PACIENTES), matricula_sintetica(i % CANTIDAD_MEDICOS),
+                              "Clinica Medica", fecha_hora)
+        latencias.append((perf_counter() - inicio) * 1e6)
+    return percentil(latencias, 50), percentil(latencias, 99)
+
+
+def medir_historias(clinica: Clinica, cantidad: int = 200) -> float:
+
+    inicio = perf_counter()
+    for i in range(cantidad):
+        str(clinica.obtener_historia_clinica(dni_sintetico(i)))
+    return (perf_counter() - inicio) / cantidad * 1e3
+
+
+def memoria() -> float:
+
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0] / 2**20
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turnos", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--reservas", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'turnos':>9} {'estado':<10} {'memoria (MiB)':>14} {'agendar p50 (us)':>17} {'p99 (us)':>9} "
+          f"{'historia (ms)':>14}")
+    for cantidad in args.turnos:
+        tracemalloc.start()
+        clinica = crear_clinica(CANTIDAD_PACIENTES, CANTIDAD_MEDICOS)
+        cargar_pasados(clinica, cantidad)
+        for estado in ("caliente", "archivado"):
+            if estado == "archivado":
+                inicio = perf_counter()
+                archivados = clinica.archivar_turnos()
+                print(f"{cantidad:>9} archivados {archivados} turnos en {perf_counter() - inicio:.2f} s")
+            mib = memoria()
+            p50, p99 = medir_reservas(clinica, 0 if estado == "caliente" else args.reservas, args.reservas)
+            ms_historia = medir_historias(clinica)
+            print(f"{cantidad:>9} {estado:<10} {mib:>14.1f} {p50:>17.1f} {p99:>9.1f} {ms_historia:>14.3f}")
+
+        problemas = clinica.verificar_contadores_ocupacion()
+        if problemas or len(clinica.obtener_turnos()) != cantidad + 2 * args.reservas:
+            raise SystemExit("Los turnos archivados no coinciden con los restaurados")
+        tracemalloc.stop()
+        del clinica
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Latencia de Clinica.buscar_turnos_disponibles con agendas cada vez mas llenas.
+
+Uso: python -m benchmarks.bench_buscar_turnos [--medicos 1000] [--ocupacion 0.5 0.9 0.99]
+"""
+import argparse
+import random
+from datetime import timedelta
+
+from benchmarks.comun import (
+    FECHA_BASE,
+    crear_clinica,
+    cronometrar,
+    dni_sintetico,
+    matricula_sintetica,
+    percentil
+)
+from src.models.clinica import HORA_APERTURA, HORA_CIERRE
+from src.models.turno import DURACION_POR_DEFECTO
+
+CANTIDAD_PACIENTES = 1000
+DIAS = 5
+
+
+def llenar(clinica, cantidad_medicos: int, ocupacion: float, azar: random.Random):
+
+    # Ocupa al azar la fraccion pedida de los horarios de la grilla de los primeros DIAS dias
+    por_dia = (HORA_CIERRE.hour - HORA_APERTURA.hour) * 60 // DURACION_POR_DEFECTO
+    filas = []
+    for m in range(cantidad_medicos):
+        for dia in range(DIAS):
+            apertura = FECHA_BASE.replace(hour=HORA_APERTURA.hour) + timedelta(days=dia)
+            for bloque in range(por_dia):
+                if azar.random() < ocupacion:
+                    filas.append((dni_sintetico(len(filas) % CANTIDAD_PACIENTES), matricula_sintetica(m),
+                                  "Clinica Medica", apertura + timedelta(minutes=bloque * DURACION_POR_DEFECTO)))
+    clinica.agendar_turnos_lote(filas)
+    return len(filas)
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--medicos", type=int, default=1_000)
+    parser.add_argument("--ocupacion", type=float, nargs="+", default=[0.5, 0.9, 0.99])
+    parser.add_argument("--cantidad", type=int, default=5)
+    parser.add_argument("--muestras", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'ocupacion':>10} {'turnos':>10} {'p50 (us)':>10} {'p99 (us)':>10}")
+    for ocupacion in args.ocupacion:
+        clinica = crear_clinica(CANTIDAD_PACIENTES, args.medicos)
+        turnos = llenar(clinica, args.medicos, ocupacion, random.Random(0))
+
+        tiempos = [
+            cronometrar(clinica.buscar_turnos_disponibles, "Clinica Medica", args.cantidad, FECHA_BASE)
+            for _ in range(args.muestras)
+        ]
+        print(f"{ocupacion:>10.2f} {turnos:>10} {percentil(tiempos, 50) * 1e6:>10.1f} {percentil(tiempos, 99) * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Cancelaciones y reprogramaciones a medida que crece la agenda.
+
+Sobre una clinica con N turnos alterna cancelar un turno al azar y volver a agendar su horario, y
+reprogramar otro turno al azar a un horario libre. Informa ops/s y latencia p50/p99 de cada operacion
+y al final verifica que la agenda, el indice, la copia columnar y los contadores sigan coincidiendo.
+
+Uso: python -m benchmarks.bench_cancelaciones [--tamanios 10000 100000 1000000] [--muestras 2000]
+"""
+import argparse
+import random
+from datetime import datetime
+from time import perf_counter
+
+from benchmarks.bench_agendar_turno import CANTIDAD_MEDICOS, CANTIDAD_PACIENTES, sembrar
+from benchmarks.comun import crear_clinica, cronometrar, fecha_sintetica, percentil
+
+
+def verificar(clinica, cantidad: int):
+
+    turnos = clinica.obtener_turnos()
+    en_agendas = sum(len(medico.obtener_turnos_entre(datetime.min, datetime.max))
+                     for medico in clinica.obtener_medicos())
+    problemas = clinica.verificar_contadores_ocupacion()
+    if len(turnos) != cantidad:
+        problemas.append(f"Hay {len(turnos)} turnos en lugar de {cantidad}")
+    if en_agendas != cantidad or len(clinica.obtener_columnas_turnos()) != cantidad:
+        problemas.append(f"Agendas con {en_agendas} turnos y columnas con "
+                         f"{len(clinica.obtener_columnas_turnos())} en lugar de {cantidad}")
+    if problemas:
+        raise SystemExit("\n".join(problemas[:10]))
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tamanios", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--muestras", type=int, default=2_000)
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+
+    azar = random.Random(args.semilla)
+    clinica = crear_clinica(CANTIDAD_PACIENTES, CANTIDAD_MEDICOS)
+    existentes = 0
+    # Los turnos reprogramados van a horarios posteriores a todos los sembrados
+    libre = max(args.tamanios) // CANTIDAD_MEDICOS + 1
+
+    print(f"{'turnos':>10} {'operacion':<12} {'ops/s':>10} {'p50 (us)':>10} {'p99 (us)':>10}")
+    for tamanio in sorted(args.tamanios):
+        sembrar(clinica, existentes, tamanio)
+        existentes = tamanio
+        # Ids de los turnos vivos; cancelar y reagendar conserva el id, reprogramar lo cambia
+        ids = [turno.obtener_id() for turno in clinica.obtener_turnos()]
+
+        tiempos: dict[str, list[float]] = {"cancelar": [], "reagendar": [], "reprogramar": []}
+        for _ in range(args.muestras):
+            cancelado = clinica.obtener_turno(ids[azar.randrange(existentes)])
+            tiempos["cancelar"].append(cronometrar(clinica.cancelar_turno, cancelado.obtener_id()))
+            tiempos["reagendar"].append(cronometrar(
+                clinica.agendar_turno, cancelado.obtener_paciente().obtener_dni(),
+                cancelado.obtener_medico().obtener_matricula(), cancelado.obtener_especialidad(),
+                cancelado.obtener_fecha_hora()
+            ))
+            posicion = azar.randrange(existentes)
+            inicio = perf_counter()
+            movido = clinica.reprogramar_turno(ids[posicion], fecha_sintetica(libre))
+            tiempos["reprogramar"].append(perf_counter() - inicio)
+            ids[posicion] = movido.obtener_id()
+            libre += 1
+
+        for operacion, muestras in tiempos.items():
+            ops = len(muestras) / sum(muestras) if muestras else 0.0
+            print(f"{tamanio:>10} {operacion:<12} {ops:>10.0f} {percentil(muestras, 50) * 1e6:>10.2f} "
+                  f"{percentil(muestras, 99) * 1e6:>10.2f}")
+        verificar(clinica, existentes)
+
+
+if __name__ == "__main__":
+    main()
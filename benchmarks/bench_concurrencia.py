@@ -0,0 +1,127 @@
+"""Prueba de estres de ClinicaConcurrente: muchos hilos reservando sobre horarios disputados.
+
+Cada hilo intenta reservar horarios al azar de un conjunto chico, con inicios desplazados para
+provocar superposiciones. Al terminar verifica que no haya turnos duplicados ni superpuestos y
+que la lista, el indice y las historias clinicas coincidan con las reservas exitosas. Compara
+las franjas de candados contra una sola franja (equivalente a un candado global).
+
+Uso: python -m benchmarks.bench_concurrencia [--hilos 1 2 4 8 16] [--intentos 5000]
+"""
+import argparse
+import random
+import sys
+import threading
+from datetime import timedelta
+from time import perf_counter
+
+from benchmarks.comun import dni_sintetico, fecha_sintetica, matricula_sintetica
+from src.models.clinicaConcurrente import ClinicaConcurrente, FRANJAS_POR_DEFECTO
+from src.models.especialidad import Especialidad, DIAS_SEMANA
+from src.models.medico import Medico
+from src.models.paciente import Paciente
+from src.exceptions.error import TurnoOcupadoException
+
+CANTIDAD_MEDICOS = 200
+CANTIDAD_PACIENTES = 2000
+HORARIOS_POR_MEDICO = 50
+
+
+def crear_clinica(franjas: int) -> ClinicaConcurrente:
+
+    clinica = ClinicaConcurrente(franjas=franjas)
+    for i in range(CANTIDAD_PACIENTES):
+        clinica.agregar_paciente(Paciente("Paciente Sintetico", dni_sintetico(i), "01/01/1990"))
+    for i in range(CANTIDAD_MEDICOS):
+        medico = Medico("Medico Sintetico", matricula_sintetica(i))
+        medico.agregar_especialidad(Especialidad("Clinica Medica", DIAS_SEMANA))
+        clinica.agregar_medico(medico)
+    return clinica
+
+
+def reservar(clinica: ClinicaConcurrente, semilla: int, intentos: int, exitos: list[int], barrera: threading.Barrier):
+
+    azar = random.Random(semilla)
+    propios = 0
+    barrera.wait()
+    for _ in range(intentos):
+        horario = azar.randrange(CANTIDAD_MEDICOS * HORARIOS_POR_MEDICO)
+        desplazamiento = timedelta(minutes=azar.choice((0, 10, 20)))
+        try:
+            clinica.agendar_turno(
+                dni_sintetico(azar.randrange(CANTIDAD_PACIENTES)),
+                matricula_sintetica(horario % CANTIDAD_MEDICOS),
+                "Clinica Medica",
+                fecha_sintetica(horario // CANTIDAD_MEDICOS) + desplazamiento
+            )
+            propios += 1
+        except TurnoOcupadoException:
+            pass
+    exitos.append(propios)
+
+
+def verificar(clinica: ClinicaConcurrente, exitos: int) -> list[str]:
+
+    problemas = []
+    turnos = clinica.obtener_turnos()
+    if len(turnos) != exitos:
+        problemas.append(f"{len(turnos)} turnos registrados para {exitos} reservas exitosas")
+
+    claves = {(t.obtener_medico().obtener_matricula(), t.obtener_fecha_hora()) for t in turnos}
+    if len(claves) != len(turnos):
+        problemas.append(f"{len(turnos) - len(claves)} turnos duplicados")
+
+    for medico in clinica.obtener_medicos():
+        propios = sorted(medico.obtener_turnos_entre(fecha_sintetica(0) - timedelta(days=1),
+                                                     fecha_sintetica(HORARIOS_POR_MEDICO + 1)),
+                         key=lambda t: t.obtener_fecha_hora())
+        for anterior, siguiente in zip(propios, propios[1:]):
+            if siguiente.obtener_fecha_hora() < anterior.obtener_fin():
+                problemas.append(f"Turnos superpuestos para {medico.obtener_matricula()}")
+                break
+
+    en_historias = sum(len(clinica.obtener_historia_clinica(dni_sintetico(i)).vista_turnos())
+                       for i in range(CANTIDAD_PACIENTES))
+    if en_historias != exitos:
+        problemas.append(f"{en_historias} turnos en historias clinicas para {exitos} reservas exitosas")
+    if len(clinica.obtener_turnos(especialidad="Clinica Medica")) != exitos:
+        problemas.append("El indice de turnos no coincide con las reservas exitosas")
+    problemas.extend(clinica.verificar_contadores_ocupacion())
+    return problemas
+
+
+def correr(hilos: int, intentos: int, franjas: int) -> tuple[float, int, list[str]]:
+
+    clinica = crear_clinica(franjas)
+    exitos: list[int] = []
+    barrera = threading.Barrier(hilos + 1)
+    trabajadores = [threading.Thread(target=reservar, args=(clinica, semilla, intentos, exitos, barrera))
+                    for semilla in range(hilos)]
+    for trabajador in trabajadores:
+        trabajador.start()
+    barrera.wait()
+    inicio = perf_counter()
+    for trabajador in trabajadores:
+        trabajador.join()
+    duracion = perf_counter() - inicio
+    return hilos * intentos / duracion, sum(exitos), verificar(clinica, sum(exitos))
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hilos", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--intentos", type=int, default=5_000, help="reservas intentadas por hilo")
+    args = parser.parse_args()
+
+    fallas = 0
+    print(f"{'hilos':>6} {'franjas':>8} {'intentos/s':>12} {'exitosas':>9}  verificacion")
+    for hilos in args.hilos:
+        for franjas in (FRANJAS_POR_DEFECTO, 1):
+            por_segundo, exitosas, problemas = correr(hilos, args.intentos, franjas)
+            fallas += len(problemas)
+            print(f"{hilos:>6} {franjas:>8} {por_segundo:>12,.0f} {exitosas:>9}  {'; '.join(problemas) or 'ok'}")
+    sys.exit(1 if fallas else 0)
+
+
+if __name__ == "__main__":
+    main()
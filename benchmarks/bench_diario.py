@@ -0,0 +1,81 @@
+"""Tiempo de reinicio a partir del diario, con y sin snapshot compactado.
+
+Uso: python -m benchmarks.bench_diario [--operaciones 1000000]
+"""
+import argparse
+import tempfile
+from time import perf_counter
+
+from benchmarks.comun import dni_sintetico, fecha_sintetica, matricula_sintetica
+from src.models.clinica import Clinica
+from src.models.especialidad import Especialidad, DIAS_SEMANA
+from src.models.medico import Medico
+from src.models.paciente import Paciente
+from src.persistencia.diario import Diario
+
+CANTIDAD_MEDICOS = 500
+
+
+def generar_historial(directorio: str, operaciones: int):
+
+    # 5% pacientes, 5% recetas y el resto turnos, registrados a traves de la clinica
+    cantidad_pacientes = max(1, operaciones // 20)
+    cantidad_recetas = operaciones // 20
+    cantidad_turnos = operaciones - cantidad_pacientes - cantidad_recetas - 2 * CANTIDAD_MEDICOS
+
+    diario = Diario(directorio, tamanio_grupo=4096)
+    clinica = Clinica(diario=diario)
+    for i in range(cantidad_pacientes):
+        clinica.agregar_paciente(Paciente("Paciente Sintetico", dni_sintetico(i), "01/01/1990"))
+    for i in range(CANTIDAD_MEDICOS):
+        medico = Medico("Medico Sintetico", matricula_sintetica(i))
+        medico.agregar_especialidad(Especialidad("Clinica Medica", list(DIAS_SEMANA)))
+        clinica.agregar_medico(medico)
+    clinica.agendar_turnos_lote([
+        (dni_sintetico(i % cantidad_pacientes), matricula_sintetica(i % CANTIDAD_MEDICOS),
+         "Clinica Medica", fecha_sintetica(i // CANTIDAD_MEDICOS))
+        for i in range(cantidad_turnos)
+    ])
+    for i in range(cantidad_recetas):
+        clinica.emitir_receta(dni_sintetico(i % cantidad_pacientes), matricula_sintetica(i % CANTIDAD_MEDICOS),
+                              ["Paracetamol"])
+    diario.cerrar()
+
+
+def reiniciar(directorio: str) -> tuple[float, int]:
+
+    inicio = perf_counter()
+    diario = Diario(directorio)
+    clinica = Clinica(diario=diario)
+    tiempo = perf_counter() - inicio
+    cantidad = len(clinica.vista_turnos())
+    diario.cerrar()
+    return tiempo, cantidad
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--operaciones", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        inicio = perf_counter()
+        generar_historial(directorio, args.operaciones)
+        print(f"generacion del diario:      {perf_counter() - inicio:>8.2f} s")
+
+        tiempo, turnos = reiniciar(directorio)
+        print(f"reinicio solo con diario:   {tiempo:>8.2f} s ({turnos:,} turnos)")
+
+        diario = Diario(directorio)
+        inicio = perf_counter()
+        diario.compactar()
+        print(f"compactacion:               {perf_counter() - inicio:>8.2f} s")
+        diario.cerrar()
+
+        tiempo, turnos = reiniciar(directorio)
+        print(f"reinicio desde snapshot:    {tiempo:>8.2f} s ({turnos:,} turnos)")
+
+
+if __name__ == "__main__":
+    main()
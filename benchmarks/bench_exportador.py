@@ -0,0 +1,84 @@
+"""Exportacion de historias clinicas a archivos con un pool de 1 a N procesos.
+
+Arma una clinica sintetica con turnos y recetas por paciente, la exporta con distinta cantidad
+de procesos y compara el tiempo contra la exportacion serial con str(historia). Con --db la
+clinica se persiste antes en SQLite y cada proceso lee sus historias de ahi.
+
+Uso: python -m benchmarks.bench_exportador [--pacientes 20000] [--procesos 1 2 4 8] [--db]
+"""
+import argparse
+import os
+import tempfile
+from time import perf_counter
+
+from benchmarks.comun import crear_clinica, dni_sintetico, fecha_sintetica, matricula_sintetica
+from src.exportador import exportar_historias, exportar_historias_db, ruta_historia
+from src.persistencia.almacenamientoSQLite import AlmacenamientoSQLite
+
+CANTIDAD_MEDICOS = 100
+TURNOS_POR_PACIENTE = 10
+RECETAS_POR_PACIENTE = 3
+
+
+def poblar(clinica, pacientes: int):
+
+    for i in range(pacientes):
+        for k in range(TURNOS_POR_PACIENTE):
+            horario = i * TURNOS_POR_PACIENTE + k
+            clinica.agendar_turno(dni_sintetico(i), matricula_sintetica(horario % CANTIDAD_MEDICOS),
+                                  "Clinica Medica", fecha_sintetica(horario // CANTIDAD_MEDICOS))
+        for k in range(RECETAS_POR_PACIENTE):
+            clinica.emitir_receta(dni_sintetico(i), matricula_sintetica(k), ["Paracetamol", "Ibuprofeno"])
+
+
+def exportar_serial(clinica, directorio: str) -> float:
+
+    os.makedirs(directorio)
+    inicio = perf_counter()
+    for dni in clinica.vista_pacientes():
+        with open(ruta_historia(directorio, dni), "w", encoding="utf-8") as archivo:
+            archivo.write(str(clinica.obtener_historia_clinica(dni)))
+    return perf_counter() - inicio
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pacientes", type=int, default=20_000)
+    parser.add_argument("--procesos", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--db", action="store_true", help="exportar leyendo desde SQLite")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        clinica = crear_clinica(args.pacientes, CANTIDAD_MEDICOS)
+        poblar(clinica, args.pacientes)
+        ruta_db = os.path.join(directorio, "clinica.db")
+        if args.db:
+            almacenamiento = AlmacenamientoSQLite(ruta_db)
+            for paciente in clinica.vista_pacientes().values():
+                almacenamiento.guardar_paciente(paciente)
+            for medico in clinica.vista_medicos().values():
+                almacenamiento.guardar_medico(medico)
+            for turno in clinica.obtener_turnos():
+                almacenamiento.guardar_turno(turno)
+            for dni in clinica.vista_pacientes():
+                for receta in clinica.obtener_historia_clinica(dni).vista_recetas():
+                    almacenamiento.guardar_receta(receta)
+            almacenamiento.cerrar()
+
+        serial = exportar_serial(clinica, os.path.join(directorio, "serial"))
+        print(f"{'procesos':>9} {'segundos':>9} {'historias/s':>12} {'aceleracion':>12}  trabajo por proceso (s)")
+        print(f"{'serial':>9} {serial:>9.2f} {args.pacientes / serial:>12,.0f} {1:>12.2f}x")
+        for procesos in args.procesos:
+            salida = os.path.join(directorio, f"pool_{procesos}")
+            if args.db:
+                reporte = exportar_historias_db(ruta_db, salida, procesos)
+            else:
+                reporte = exportar_historias(clinica, salida, procesos)
+            trabajo = " ".join(f"{p['segundos']:.2f}" for p in reporte["procesos"].values())
+            print(f"{procesos:>9} {reporte['segundos']:>9.2f} {reporte['historias'] / reporte['segundos']:>12,.0f} "
+                  f"{serial / reporte['segundos']:>12.2f}x  {trabajo}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Exportacion de turnos desde SQLite a CSV y JSONL: filas por segundo y memoria pico.
+
+Llena la tabla de turnos directamente con filas sinteticas y exporta cada tamanio en ambos
+formatos, una vez para medir el tiempo y otra bajo tracemalloc para la memoria pico, que deberia
+mantenerse igual al crecer la cantidad de filas.
+
+Uso: python -m benchmarks.bench_exportar_filas [--filas 10000 100000 1000000]
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import tracemalloc
+from time import perf_counter
+
+from benchmarks.comun import dni_sintetico, fecha_sintetica, matricula_sintetica
+from src.exportador import exportar_turnos_db
+from src.persistencia.almacenamientoSQLite import AlmacenamientoSQLite
+
+CANTIDAD_MEDICOS = 1000
+CANTIDAD_PACIENTES = 100_000
+
+
+def crear_db(ruta: str, filas: int):
+
+    AlmacenamientoSQLite(ruta).cerrar()
+    conexion = sqlite3.connect(ruta)
+    with conexion:
+        conexion.executemany(
+            "INSERT INTO turnos (dni, matricula, especialidad, fecha_hora, duracion) VALUES (?, ?, ?, ?, ?)",
+            ((dni_sintetico(i % CANTIDAD_PACIENTES), matricula_sintetica(i % CANTIDAD_MEDICOS), "Clinica Medica",
+              fecha_sintetica(i // CANTIDAD_MEDICOS).isoformat(), 30) for i in range(filas))
+        )
+    conexion.close()
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filas", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'filas':>10} {'formato':>8} {'filas/s':>10} {'pico (KiB)':>11}")
+    with tempfile.TemporaryDirectory() as directorio:
+        for filas in args.filas:
+            ruta_db = os.path.join(directorio, f"turnos_{filas}.db")
+            crear_db(ruta_db, filas)
+            for formato in ("csv", "jsonl"):
+                salida = os.path.join(directorio, f"turnos.{formato}")
+                inicio = perf_counter()
+                exportadas = exportar_turnos_db(ruta_db, salida, formato)
+                segundos = perf_counter() - inicio
+                tracemalloc.start()
+                exportar_turnos_db(ruta_db, salida, formato)
+                _, pico = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                print(f"{exportadas:>10} {formato:>8} {exportadas / segundos:>10,.0f} {pico / 1024:>11,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Filas por segundo al importar pacientes desde CSV y JSONL.
+
+Uso: python -m benchmarks.bench_importador [--filas 200000]
+"""
+import argparse
+import json
+import os
+import tempfile
+from time import perf_counter
+
+from benchmarks.comun import dni_sintetico
+from src.importador import importar_pacientes
+from src.models.clinica import Clinica
+
+
+def generar(directorio: str, filas: int) -> tuple[str, str]:
+
+    ruta_csv = os.path.join(directorio, "pacientes.csv")
+    ruta_jsonl = os.path.join(directorio, "pacientes.jsonl")
+    with open(ruta_csv, "w", encoding="utf-8") as csv, open(ruta_jsonl, "w", encoding="utf-8") as jsonl:
+        csv.write("nombre,dni,fecha_nacimiento\n")
+        for i in range(filas):
+            fecha = f"{i % 28 + 1:02d}/{i % 12 + 1:02d}/{1940 + i % 80}"
+            csv.write(f"Paciente Sintetico,{dni_sintetico(i)},{fecha}\n")
+            jsonl.write(json.dumps({"nombre": "Paciente Sintetico", "dni": dni_sintetico(i),
+                                    "fecha_nacimiento": fecha}) + "\n")
+    return ruta_csv, ruta_jsonl
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--filas", type=int, default=200_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        for ruta in generar(directorio, args.filas):
+            inicio = perf_counter()
+            reporte = importar_pacientes(Clinica(), ruta)
+            tiempo = perf_counter() - inicio
+            assert reporte["importadas"] == args.filas
+            print(f"{os.path.basename(ruta):<16} {args.filas / tiempo:>12,.0f} filas/s")
+
+
+if __name__ == "__main__":
+    main()
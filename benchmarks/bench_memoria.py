@@ -0,0 +1,65 @@
+"""Bytes por registro de los modelos y de un turno agendado en la clinica (tracemalloc).
+
+Uso: python -m benchmarks.bench_memoria [--registros 100000]
+"""
+import argparse
+import gc
+import tracemalloc
+
+from benchmarks.comun import crear_clinica, dni_sintetico, fecha_sintetica, matricula_sintetica
+from src.models.medico import Medico
+from src.models.paciente import Paciente
+from src.models.receta import Receta
+from src.models.turno import Turno
+
+CANTIDAD_MEDICOS = 100
+CANTIDAD_PACIENTES = 1000
+
+
+def medir(construir, cantidad: int) -> float:
+
+    gc.collect()
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    objetos = construir(cantidad)
+    despues = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objetos
+    return (despues - antes) / cantidad
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--registros", type=int, default=100_000)
+    args = parser.parse_args()
+
+    paciente = Paciente("Paciente Sintetico", dni_sintetico(0), "01/01/1990")
+    medico = Medico("Medico Sintetico", matricula_sintetica(0))
+
+    resultados = {
+        "Paciente": medir(lambda n: [Paciente("Paciente Sintetico", dni_sintetico(i), "01/01/1990")
+                                     for i in range(n)], args.registros),
+        "Turno": medir(lambda n: [Turno(paciente, medico, fecha_sintetica(i), "Clinica Medica")
+                                  for i in range(n)], args.registros),
+        "Receta": medir(lambda n: [Receta(paciente, medico, ["Paracetamol"]) for i in range(n)], args.registros),
+    }
+
+    clinica = crear_clinica(CANTIDAD_PACIENTES, CANTIDAD_MEDICOS)
+
+    def agendar(n):
+        clinica.agendar_turnos_lote([
+            (dni_sintetico(i % CANTIDAD_PACIENTES), matricula_sintetica(i % CANTIDAD_MEDICOS),
+             "Clinica Medica", fecha_sintetica(i // CANTIDAD_MEDICOS))
+            for i in range(n)
+        ])
+        return clinica
+
+    resultados["Turno agendado (con indices)"] = medir(agendar, args.registros)
+
+    for nombre, bytes_por_registro in resultados.items():
+        print(f"{nombre:<30} {bytes_por_registro:>8.1f} bytes/registro")
+
+
+if __name__ == "__main__":
+    main()
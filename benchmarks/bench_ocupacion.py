@@ -0,0 +1,75 @@
+"""Lecturas de tablero con contadores de ocupacion frente a recorrer la agenda en cada consulta.
+
+Carga N turnos sinteticos y mide "turnos de hoy por especialidad" y "carga semanal de un medico"
+leyendo ContadoresOcupacion y recalculando sobre los objetos Turno, ademas del costo que agregan los
+contadores a cada turno registrado. Al final verifica los contadores contra un recalculo completo.
+
+Uso: python -m benchmarks.bench_ocupacion [--turnos 100000 1000000] [--lecturas 10000]
+"""
+import argparse
+from collections import Counter
+from datetime import timedelta
+from time import perf_counter
+
+from benchmarks.bench_analitica import crear_turnos
+from benchmarks.comun import matricula_sintetica
+from src.models.contadoresOcupacion import ContadoresOcupacion
+from src.models.turno import Turno
+
+
+def especialidades_del_dia_por_objetos(turnos: list[Turno], dia) -> Counter:
+
+    return Counter(t.obtener_especialidad() for t in turnos if t.obtener_fecha_hora().date() == dia)
+
+
+def carga_semanal_por_objetos(turnos: list[Turno], matricula: str, dia) -> int:
+
+    lunes = dia - timedelta(days=dia.weekday())
+    return sum(t.obtener_duracion() for t in turnos
+               if t.obtener_medico().obtener_matricula() == matricula
+               and lunes <= t.obtener_fecha_hora().date() < lunes + timedelta(days=7))
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turnos", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--lecturas", type=int, default=10_000)
+    args = parser.parse_args()
+
+    print(f"{'turnos':>9} {'consulta':<26} {'recorrido (ms)':>15} {'contadores (us)':>16} {'alta (us/turno)':>16}")
+    for cantidad in args.turnos:
+        turnos = crear_turnos(cantidad)
+        contadores = ContadoresOcupacion()
+        inicio = perf_counter()
+        for turno in turnos:
+            contadores.agregar(turno)
+        alta_us = (perf_counter() - inicio) / cantidad * 1e6
+
+        dia = turnos[-1].obtener_fecha_hora().date()
+        matricula = matricula_sintetica(7)
+        consultas = (
+            ("turnos del dia por esp.", (especialidades_del_dia_por_objetos, turnos, dia),
+             (contadores.turnos_por_especialidad, dia)),
+            ("carga semanal de un medico", (carga_semanal_por_objetos, turnos, matricula, dia),
+             (contadores.carga_semanal, matricula, dia)),
+        )
+        for nombre, (por_objetos, *argumentos_objetos), (por_contadores, *argumentos) in consultas:
+            inicio = perf_counter()
+            esperado = por_objetos(*argumentos_objetos)
+            ms_recorrido = (perf_counter() - inicio) * 1e3
+            inicio = perf_counter()
+            for _ in range(args.lecturas):
+                obtenido = por_contadores(*argumentos)
+            us_contadores = (perf_counter() - inicio) / args.lecturas * 1e6
+            if esperado != obtenido:
+                raise SystemExit(f"{nombre}: los resultados no coinciden")
+            print(f"{cantidad:>9} {nombre:<26} {ms_recorrido:>15.1f} {us_contadores:>16.2f} {alta_us:>16.2f}")
+
+        problemas = contadores.verificar(turnos)
+        if problemas:
+            raise SystemExit("\n".join(problemas[:10]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Construcciones de Paciente por segundo con fechas de nacimiento variadas.
+
+Uso: python -m benchmarks.bench_paciente [--pacientes 1000000]
+"""
+import argparse
+from datetime import datetime
+from time import perf_counter
+
+from benchmarks.comun import dni_sintetico
+from src.models.paciente import Paciente
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pacientes", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    filas = [
+        ("Paciente Sintetico", dni_sintetico(i), f"{i % 28 + 1:02d}/{i % 12 + 1:02d}/{1940 + i % 80}")
+        for i in range(args.pacientes)
+    ]
+
+    inicio = perf_counter()
+    for nombre, dni, fecha in filas:
+        Paciente(nombre, dni, fecha)
+    tiempo = perf_counter() - inicio
+    print(f"Paciente(...):            {args.pacientes / tiempo:>12,.0f} pacientes/s ({tiempo:.2f} s)")
+
+    ahora = datetime.now()
+    inicio = perf_counter()
+    for nombre, dni, fecha in filas:
+        Paciente(nombre, dni, fecha, ahora=ahora)
+    tiempo = perf_counter() - inicio
+    print(f"Paciente(..., ahora=...): {args.pacientes / tiempo:>12,.0f} pacientes/s ({tiempo:.2f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""Carga sobre el servidor HTTP/JSON: peticiones por segundo y latencia con 1 a 500 clientes.
+
+Cada cliente usa su propia conexion persistente y alterna reservas (POST /turnos) con consultas
+(GET /turnos). Los clientes se agrupan de a dos sobre los mismos horarios, asi que cada horario
+se disputa y al final se verifica que ninguno quedo reservado dos veces.
+
+Sin --puerto levanta el servidor en un hilo del mismo proceso sobre una clinica en memoria.
+
+Uso: python -m benchmarks.bench_servidor [--clientes 1 10 100 500] [--peticiones 200] [--puerto 8080]
+"""
+import argparse
+import asyncio
+import json
+import threading
+from collections import Counter
+from time import perf_counter
+
+from benchmarks.comun import dni_sintetico, fecha_sintetica, matricula_sintetica, percentil
+from src.models.clinica import Clinica
+from src.servidor import ServidorClinica
+
+CANTIDAD_MEDICOS = 100
+CANTIDAD_PACIENTES = 1000
+
+
+class Cliente:
+
+    def __init__(self, host: str, puerto: int):
+
+        self.host = host
+        self.puerto = puerto
+        self.lector = None
+        self.escritor = None
+
+    async def conectar(self):
+
+        self.lector, self.escritor = await asyncio.open_connection(self.host, self.puerto)
+
+    async def pedir(self, metodo: str, ruta: str, datos: dict | None = None) -> tuple[int, object]:
+
+        cuerpo = json.dumps(datos).encode() if datos is not None else b""
+        self.escritor.write(f"{metodo} {ruta} HTTP/1.1\r\nHost: {self.host}\r\n"
+                            f"Content-Length: {len(cuerpo)}\r\n\r\n".encode() + cuerpo)
+        await self.escritor.drain()
+
+        estado = int((await self.lector.readline()).split()[1])
+        largo = 0
+        while (linea := await self.lector.readline()) != b"\r\n":
+            nombre, _, valor = linea.decode("latin-1").partition(":")
+            if nombre.lower() == "content-length":
+                largo = int(valor)
+        return estado, json.loads(await self.lector.readexactly(largo))
+
+    def cerrar(self):
+
+        self.escritor.close()
+
+
+async def sembrar(host: str, puerto: int):
+
+    cliente = Cliente(host, puerto)
+    await cliente.conectar()
+    for i in range(CANTIDAD_PACIENTES):
+        await cliente.pedir("POST", "/pacientes", {"nombre": "Paciente Sintetico", "dni": dni_sintetico(i),
+                                                   "fecha_nacimiento": "01/01/1990"})
+    for i in range(CANTIDAD_MEDICOS):
+        await cliente.pedir("POST", "/medicos", {"nombre": "Medico Sintetico", "matricula": matricula_sintetica(i),
+                                                 "especialidades": "Clinica Medica:lunes|martes|miercoles|jueves|viernes|sabado|domingo"})
+    cliente.cerrar()
+
+
+async def correr_cliente(host: str, puerto: int, numero: int, peticiones: int, base: int,
+                         tiempos: list[float], reservas: Counter, errores: Counter):
+
+    cliente = Cliente(host, puerto)
+    await cliente.conectar()
+    pareja = numero // 2
+    for k in range(peticiones):
+        if k % 2 == 0:
+            horario = base + pareja * peticiones + k
+            datos = {"dni": dni_sintetico(numero % CANTIDAD_PACIENTES),
+                     "matricula": matricula_sintetica(horario % CANTIDAD_MEDICOS),
+                     "especialidad": "Clinica Medica",
+                     "fecha_hora": fecha_sintetica(horario // CANTIDAD_MEDICOS).isoformat()}
+            inicio = perf_counter()
+            estado, _ = await cliente.pedir("POST", "/turnos", datos)
+            if estado == 201:
+                reservas[horario] += 1
+        else:
+            inicio = perf_counter()
+            estado, _ = await cliente.pedir("GET", f"/turnos?matricula={matricula_sintetica(k % CANTIDAD_MEDICOS)}&limit=10")
+        tiempos.append(perf_counter() - inicio)
+        if estado >= 500:
+            errores[estado] += 1
+    cliente.cerrar()
+
+
+async def medir(host: str, puerto: int, clientes: int, peticiones: int, base: int) -> dict:
+
+    tiempos: list[float] = []
+    reservas: Counter = Counter()
+    errores: Counter = Counter()
+    inicio = perf_counter()
+    await asyncio.gather(*(correr_cliente(host, puerto, numero, peticiones, base, tiempos, reservas, errores)
+                           for numero in range(clientes)))
+    total = perf_counter() - inicio
+    return {
+        "peticiones_por_segundo": len(tiempos) / total,
+        "p50_ms": percentil(tiempos, 50) * 1e3,
+        "p99_ms": percentil(tiempos, 99) * 1e3,
+        "duplicadas": sum(cantidad - 1 for cantidad in reservas.values() if cantidad > 1),
+        "errores": sum(errores.values()),
+    }
+
+
+def levantar_servidor() -> int:
+
+    # Corre el servidor en su propio bucle de eventos dentro de un hilo demonio
+    listo = threading.Event()
+    puerto = []
+
+    def correr():
+        async def principal():
+            servidor = await ServidorClinica(Clinica(), puerto=0).iniciar()
+            puerto.append(servidor.obtener_puerto())
+            listo.set()
+            await servidor.servir()
+        asyncio.run(principal())
+
+    threading.Thread(target=correr, daemon=True).start()
+    listo.wait()
+    return puerto[0]
+
+
+async def principal(args):
+
+    puerto = args.puerto if args.puerto is not None else levantar_servidor()
+    await sembrar(args.host, puerto)
+
+    print(f"{'clientes':>9} {'pet/s':>10} {'p50 (ms)':>10} {'p99 (ms)':>10} {'duplicadas':>11} {'errores':>8}")
+    base = 0
+    for clientes in args.clientes:
+        resultado = await medir(args.host, puerto, clientes, args.peticiones, base)
+        base += (clientes // 2 + 1) * args.peticiones
+        print(f"{clientes:>9} {resultado['peticiones_por_segundo']:>10,.0f} {resultado['p50_ms']:>10.2f} "
+              f"{resultado['p99_ms']:>10.2f} {resultado['duplicadas']:>11} {resultado['errores']:>8}")
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clientes", type=int, nargs="+", default=[1, 10, 100, 500])
+    parser.add_argument("--peticiones", type=int, default=200, help="peticiones por cliente")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, help="puerto de un servidor ya levantado")
+    args = parser.parse_args()
+    asyncio.run(principal(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Insercion y consulta con AlmacenamientoSQLite frente a la clinica en memoria.
+
+Uso: python -m benchmarks.bench_sqlite [--pacientes 20000] [--turnos 100000]
+"""
+import argparse
+import os
+import random
+import tempfile
+from time import perf_counter
+
+from benchmarks.comun import dni_sintetico, fecha_sintetica, matricula_sintetica
+from src.models.clinica import Clinica
+from src.models.especialidad import Especialidad, DIAS_SEMANA
+from src.models.medico import Medico
+from src.models.paciente import Paciente
+from src.persistencia.almacenamientoSQLite import AlmacenamientoSQLite
+
+CANTIDAD_MEDICOS = 100
+
+
+def poblar(clinica: Clinica, cantidad_pacientes: int, cantidad_turnos: int) -> float:
+
+    inicio = perf_counter()
+    for i in range(cantidad_pacientes):
+        clinica.agregar_paciente(Paciente("Paciente Sintetico", dni_sintetico(i), "01/01/1990"))
+    for i in range(CANTIDAD_MEDICOS):
+        medico = Medico("Medico Sintetico", matricula_sintetica(i))
+        medico.agregar_especialidad(Especialidad("Clinica Medica", list(DIAS_SEMANA)))
+        clinica.agregar_medico(medico)
+    filas = [
+        (dni_sintetico(i % cantidad_pacientes), matricula_sintetica(i % CANTIDAD_MEDICOS),
+         "Clinica Medica", fecha_sintetica(i // CANTIDAD_MEDICOS))
+        for i in range(cantidad_turnos)
+    ]
+    clinica.agendar_turnos_lote(filas)
+    clinica.confirmar()
+    return perf_counter() - inicio
+
+
+def consultar(clinica: Clinica, dnis: list[str]) -> float:
+
+    inicio = perf_counter()
+    for dni in dnis:
+        clinica.obtener_historia_clinica(dni).obtener_turnos()
+    return perf_counter() - inicio
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pacientes", type=int, default=20_000)
+    parser.add_argument("--turnos", type=int, default=100_000)
+    parser.add_argument("--consultas", type=int, default=5_000)
+    args = parser.parse_args()
+
+    registros = args.pacientes + args.turnos
+    dnis = [dni_sintetico(random.randrange(args.pacientes)) for _ in range(args.consultas)]
+
+    memoria = Clinica()
+    tiempo_memoria = poblar(memoria, args.pacientes, args.turnos)
+    consulta_memoria = consultar(memoria, dnis)
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "clinica.db")
+        almacenamiento = AlmacenamientoSQLite(ruta)
+        tiempo_sqlite = poblar(Clinica(almacenamiento), args.pacientes, args.turnos)
+        almacenamiento.cerrar()
+
+        almacenamiento = AlmacenamientoSQLite(ruta)
+        inicio = perf_counter()
+        reabierta = Clinica(almacenamiento)
+        tiempo_apertura = perf_counter() - inicio
+        consulta_fria = consultar(reabierta, dnis)
+        consulta_caliente = consultar(reabierta, dnis)
+        almacenamiento.cerrar()
+
+    print(f"insercion en memoria:  {registros / tiempo_memoria:>12,.0f} registros/s")
+    print(f"insercion en SQLite:   {registros / tiempo_sqlite:>12,.0f} registros/s")
+    print(f"apertura de SQLite:    {tiempo_apertura * 1e3:>12.2f} ms")
+    print(f"consulta en memoria:   {args.consultas / consulta_memoria:>12,.0f} historias/s")
+    print(f"consulta SQLite (fria):{args.consultas / consulta_fria:>12,.0f} historias/s")
+    print(f"consulta SQLite (cache):{args.consultas / consulta_caliente:>11,.0f} historias/s")
+
+
+if __name__ == "__main__":
+    main()
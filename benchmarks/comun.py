@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta
+from time import perf_counter
+
+from src.models.clinica import Clinica
+from src.models.paciente import Paciente
+from src.models.medico import Medico
+from src.models.especialidad import Especialidad, DIAS_SEMANA
+from src.models.turno import DURACION_POR_DEFECTO
+
+# Fecha base lejana para que ningun turno sintetico quede en el pasado
+FECHA_BASE = datetime(2030, 6, 3, 0, 0)
+
+
+def dni_sintetico(i: int) -> str:
+
+    return f"{10000000 + i:08d}"
+
+
+def matricula_sintetica(i: int) -> str:
+
+    return f"MP{i:06d}"
+
+
+def crear_clinica(cantidad_pacientes: int, cantidad_medicos: int) -> Clinica:
+
+    clinica = Clinica()
+    for i in range(cantidad_pacientes):
+        clinica.agregar_paciente(Paciente("Paciente Sintetico", dni_sintetico(i), "01/01/1990"))
+    for i in range(cantidad_medicos):
+        medico = Medico("Medico Sintetico", matricula_sintetica(i))
+        medico.agregar_especialidad(Especialidad("Clinica Medica", DIAS_SEMANA))
+        clinica.agregar_medico(medico)
+    return clinica
+
+
+def fecha_sintetica(indice: int) -> datetime:
+
+    # Un turno por bloque de DURACION_POR_DEFECTO para que turnos consecutivos no se superpongan
+    return FECHA_BASE + timedelta(minutes=indice * DURACION_POR_DEFECTO)
+
+
+def percentil(muestras: list[float], p: float) -> float:
+
+    if not muestras:
+        return 0.0
+    ordenadas = sorted(muestras)
+    posicion = min(len(ordenadas) - 1, int(round(p / 100 * (len(ordenadas) - 1))))
+    return ordenadas[posicion]
+
+
+def cronometrar(funcion, *args) -> float:
+
+    inicio = perf_counter()
+    funcion(*args)
+    return perf_counter() - inicio
@@ -0,0 +1,231 @@
+"""Suite de rendimiento de las operaciones centrales de Clinica a distintas escalas.
+
+Para cada tamanio arma una clinica sintetica con ese numero de pacientes, turnos y recetas
+y mide ops/s, latencia p50/p99 y memoria pico por operacion. El resultado puede guardarse
+en JSON para comparar entre versiones.
+
+Uso: python -m benchmarks.suite [--tamanios 1000 100000 1000000] [--salida resultados.json]
+                                [--comparar anterior.json]
+"""
+import argparse
+import gc
+import json
+import platform
+import random
+import tracemalloc
+from datetime import datetime
+from time import perf_counter
+
+from benchmarks.comun import (
+    crear_clinica,
+    dni_sintetico,
+    fecha_sintetica,
+    matricula_sintetica,
+    percentil
+)
+from src.models.especialidad import DIAS_SEMANA
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+MEDICAMENTOS = ["Paracetamol", "Ibuprofeno"]
+
+
+class Escenario:
+
+    def __init__(self, tamanio: int, semilla: int):
+
+        self.tamanio = tamanio
+        self.cantidad_pacientes = tamanio
+        self.cantidad_medicos = max(10, tamanio // 100)
+        self.azar = random.Random(semilla)
+        self.siguiente_turno = 0
+
+        self.clinica = crear_clinica(self.cantidad_pacientes, self.cantidad_medicos)
+        self.clinica.agendar_turnos_lote([self.fila_turno(i) for i in range(tamanio)])
+        self.siguiente_turno = tamanio
+        for i in range(tamanio):
+            self.clinica.emitir_receta(self.dni_de(i), matricula_sintetica(i % self.cantidad_medicos), MEDICAMENTOS)
+
+    def dni_de(self, i: int) -> str:
+
+        # El paciente 0 concentra el 1% de los registros para que su historia crezca con la clinica
+        if i % 100 == 0:
+            return dni_sintetico(0)
+        return dni_sintetico(i % self.cantidad_pacientes)
+
+    def fila_turno(self, i: int) -> tuple:
+
+        return (
+            self.dni_de(i),
+            matricula_sintetica(i % self.cantidad_medicos),
+            "Clinica Medica",
+            fecha_sintetica(i // self.cantidad_medicos)
+        )
+
+    def dni_al_azar(self) -> str:
+
+        return dni_sintetico(self.azar.randrange(self.cantidad_pacientes))
+
+    def medico_al_azar(self):
+
+        return self.clinica.obtener_medico_por_matricula(
+            matricula_sintetica(self.azar.randrange(self.cantidad_medicos)))
+
+    #Operaciones medidas: cada una prepara sus argumentos y devuelve la llamada a cronometrar
+
+    def agendar_turno(self):
+
+        fila = self.fila_turno(self.siguiente_turno)
+        self.siguiente_turno += 1
+        return lambda: self.clinica.agendar_turno(*fila)
+
+    def emitir_receta(self):
+
+        dni = self.dni_al_azar()
+        matricula = matricula_sintetica(self.azar.randrange(self.cantidad_medicos))
+        return lambda: self.clinica.emitir_receta(dni, matricula, MEDICAMENTOS)
+
+    def obtener_historia_clinica(self):
+
+        dni = self.dni_al_azar()
+        return lambda: self.clinica.obtener_historia_clinica(dni)
+
+    def historia_str(self):
+
+        historia = self.clinica.obtener_historia_clinica(dni_sintetico(0))
+        return lambda: str(historia)
+
+    def validar_especialidad_en_dia(self):
+
+        medico = self.medico_al_azar()
+        dia = DIAS_SEMANA[self.azar.randrange(len(DIAS_SEMANA))]
+        return lambda: self.clinica.validar_especialidad_en_dia(medico, "Clinica Medica", dia)
+
+
+OPERACIONES = {
+    "agendar_turno": Escenario.agendar_turno,
+    "emitir_receta": Escenario.emitir_receta,
+    "obtener_historia_clinica": Escenario.obtener_historia_clinica,
+    "HistoriaClinica.__str__": Escenario.historia_str,
+    "validar_especialidad_en_dia": Escenario.validar_especialidad_en_dia,
+}
+
+
+def medir_tiempos(escenario: Escenario, preparar, muestras: int, presupuesto: float) -> list[float]:
+
+    # Corta por presupuesto de tiempo para que las operaciones caras no dominen la corrida
+    tiempos = []
+    limite = perf_counter() + presupuesto
+    while len(tiempos) < muestras and (len(tiempos) < 10 or perf_counter() < limite):
+        llamada = preparar(escenario)
+        inicio = perf_counter()
+        llamada()
+        tiempos.append(perf_counter() - inicio)
+    return tiempos
+
+
+def medir_memoria(escenario: Escenario, preparar, muestras: int) -> int:
+
+    pico = 0
+    tracemalloc.start()
+    for _ in range(muestras):
+        llamada = preparar(escenario)
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        llamada()
+        pico = max(pico, tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+    return pico
+
+
+def rss_maximo_kb() -> int | None:
+
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def ejecutar(tamanios: list[int], muestras: int, muestras_memoria: int, presupuesto: float, semilla: int) -> dict:
+
+    resultados = []
+    for tamanio in sorted(tamanios):
+        inicio = perf_counter()
+        escenario = Escenario(tamanio, semilla)
+        construccion = perf_counter() - inicio
+        gc.collect()
+
+        for operacion, preparar in OPERACIONES.items():
+            tiempos = medir_tiempos(escenario, preparar, muestras, presupuesto)
+            resultados.append({
+                "tamanio": tamanio,
+                "operacion": operacion,
+                "muestras": len(tiempos),
+                "ops_por_segundo": len(tiempos) / sum(tiempos),
+                "p50_us": percentil(tiempos, 50) * 1e6,
+                "p99_us": percentil(tiempos, 99) * 1e6,
+                "memoria_pico_bytes": medir_memoria(escenario, preparar, min(muestras_memoria, len(tiempos))),
+                "construccion_s": construccion,
+                "rss_maximo_kb": rss_maximo_kb(),
+            })
+        del escenario
+        gc.collect()
+
+    return {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "semilla": semilla,
+        "resultados": resultados,
+    }
+
+
+def imprimir(informe: dict, anterior: dict | None):
+
+    previos = {}
+    if anterior is not None:
+        previos = {(r["tamanio"], r["operacion"]): r for r in anterior["resultados"]}
+
+    encabezado = f"{'tamanio':>9} {'operacion':<28} {'ops/s':>12} {'p50 (us)':>10} {'p99 (us)':>10} {'pico (B)':>10}"
+    if previos:
+        encabezado += f" {'vs anterior':>12}"
+    print(encabezado)
+    for r in informe["resultados"]:
+        linea = (f"{r['tamanio']:>9} {r['operacion']:<28} {r['ops_por_segundo']:>12,.0f} "
+                 f"{r['p50_us']:>10.2f} {r['p99_us']:>10.2f} {r['memoria_pico_bytes']:>10,}")
+        previo = previos.get((r["tamanio"], r["operacion"]))
+        if previo is not None:
+            linea += f" {r['ops_por_segundo'] / previo['ops_por_segundo']:>11.2f}x"
+        print(linea)
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tamanios", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--muestras", type=int, default=1_000)
+    parser.add_argument("--muestras-memoria", type=int, default=100)
+    parser.add_argument("--presupuesto", type=float, default=5.0,
+                        help="segundos maximos de medicion por operacion y tamanio")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--salida", help="archivo JSON donde guardar los resultados")
+    parser.add_argument("--comparar", help="JSON de una corrida anterior para comparar ops/s")
+    args = parser.parse_args()
+
+    anterior = None
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as archivo:
+            anterior = json.load(archivo)
+
+    informe = ejecutar(args.tamanios, args.muestras, args.muestras_memoria, args.presupuesto, args.semilla)
+    imprimir(informe, anterior)
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump(informe, archivo, indent=2)
+
+
+if __name__ == "__main__":
+    main()
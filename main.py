@@ -1,8 +1,60 @@
+import argparse
+import sys
+
 from src.models.clinica import Clinica
 from src.cli import CLI
+from src.comandos import AYUDA, EjecutorComandos
+from src.persistencia.almacenamientoSQLite import AlmacenamientoSQLite
+from src.persistencia.diario import Diario
+
+# Segundos entre compactaciones del diario mientras el sistema esta abierto
+INTERVALO_COMPACTACION = 300
+
+# Buffer de lectura y escritura en modo comandos
+TAMANIO_BUFFER = 1 << 16
+
+
+def ejecutar_comandos(clinica: Clinica, ruta: str, resumen: bool):
+
+    entrada = sys.stdin if ruta == "-" else open(ruta, encoding="utf-8", buffering=TAMANIO_BUFFER)
+    salida = open(sys.stdout.fileno(), "w", encoding="utf-8", buffering=TAMANIO_BUFFER, closefd=False)
+    try:
+        ejecutor = EjecutorComandos(clinica, salida, resumen)
+        reporte = ejecutor.ejecutar(entrada)
+        if resumen:
+            ejecutor.escribir_resumen(reporte)
+    finally:
+        salida.close()
+        if entrada is not sys.stdin:
+            entrada.close()
+    return 1 if reporte["fallidas"] else 0
+
 
 if __name__ == "__main__":
-    clinica = Clinica()
-    cli = CLI()
+    parser = argparse.ArgumentParser(description="Sistema de gestion clinica", epilog=AYUDA,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    persistencia = parser.add_mutually_exclusive_group()
+    persistencia.add_argument("--db", help="Archivo SQLite donde persistir los datos de la clinica")
+    persistencia.add_argument("--diario", help="Directorio del diario de operaciones y sus snapshots")
+    parser.add_argument("--comandos", metavar="ARCHIVO",
+                        help="Ejecuta las operaciones del archivo ('-' para la entrada estandar) sin menu")
+    parser.add_argument("--resumen", action="store_true",
+                        help="Con --comandos, informa solo errores y un resumen final")
+    args = parser.parse_args()
+
+    almacenamiento = AlmacenamientoSQLite(args.db) if args.db else None
+    diario = Diario(args.diario, intervalo_compactacion=INTERVALO_COMPACTACION) if args.diario else None
+    clinica = Clinica(almacenamiento, diario)
+    codigo = 0
 
-    cli.ejecutar()
\ No newline at end of file
+    try:
+        if args.comandos:
+            codigo = ejecutar_comandos(clinica, args.comandos, args.resumen)
+        else:
+            CLI(clinica).ejecutar()
+    finally:
+        if almacenamiento is not None:
+            almacenamiento.cerrar()
+        if diario is not None:
+            diario.cerrar()
+    sys.exit(codigo)
@@ -1,8 +1,10 @@
+import sys
 from datetime import datetime
 from src.models.clinica import Clinica
 from src.models.paciente import Paciente
 from src.models.especialidad import Especialidad
 from src.models.medico import Medico
+from src.models.turno import DURACION_POR_DEFECTO
 from src.exceptions.error import (
     DatoInvalidoException,
     EspecialidadInvalidaException,
@@ -15,8 +17,8 @@ from src.exceptions.error import (
 
 
 class CLI:
-    def __init__(self):
-        self.clinica = Clinica()
+    def __init__(self, clinica: Clinica | None = None):
+        self.clinica = clinica if clinica is not None else Clinica()
     
     def mostrar_menu(self):
 
@@ -118,16 +120,20 @@ class CLI:
 
             fecha_str = input("Fecha del turno (dd/mm/aaaa): ").strip()
             hora_str = input("Hora del turno (HH:MM): ").strip()
+            duracion_str = input(f"Duracion en minutos (Enter para {DURACION_POR_DEFECTO}): ").strip()
             
 
             fecha_hora_str = f"{fecha_str} {hora_str}"
             fecha_hora = datetime.strptime(fecha_hora_str, "%d/%m/%Y %H:%M")
+            duracion = int(duracion_str) if duracion_str else DURACION_POR_DEFECTO
             
-            self.clinica.agendar_turno(dni, matricula, especialidad, fecha_hora)
+            self.clinica.agendar_turno(dni, matricula, especialidad, fecha_hora, duracion)
             print("  Turno agendado exitosamente.")
             
         except ValueError as e:
-            print("Error en el formato de fecha/hora. Usa dd/mm/aaaa HH:MM")
+            print("Error en el formato de fecha/hora. Usa dd/mm/aaaa HH:MM y la duracion en minutos")
+        except DatoInvalidoException as e:
+            print(f" Error en los datos: {e}")
         except (PacienteNoEncontradoException, MedicoNoEncontradoException, 
                 MedicoNoDisponibleException, TurnoOcupadoException) as e:
             print(f" {e}")
@@ -142,7 +148,7 @@ class CLI:
         
         try:
             matricula = input("Matricula del medico: ").strip()
-            medico = self.clinica.obtener_medico_por_matricula(matricula)
+            self.clinica.obtener_medico_por_matricula(matricula)
             
             especialidad_nombre = input("Nombre de la especialidad: ").strip()
             print("Dias de atencion (separados por comas):")
@@ -151,7 +157,7 @@ class CLI:
             
             dias = [dia.strip() for dia in dias_input.split(',')]
             especialidad = Especialidad(especialidad_nombre, dias)
-            medico.agregar_especialidad(especialidad)
+            self.clinica.agregar_especialidad(matricula, especialidad)
             
             print(f"\nEspecialidad {especialidad_nombre} agregada al medico.")
             
@@ -201,10 +207,16 @@ class CLI:
         try:
             dni = input("DNI del paciente: ").strip()
             historia = self.clinica.obtener_historia_clinica(dni)
-            print("\n" + str(historia))
+            ultimos = input("Cantidad de registros recientes a mostrar (Enter para todos): ").strip()
+            print()
+            historia.escribir(sys.stdout, ultimos=int(ultimos) if ultimos else None)
             
         except PacienteNoEncontradoException as e:
             print(f"{e}")
+        except DatoInvalidoException as e:
+            print(f"{e}")
+        except ValueError:
+            print("La cantidad de registros debe ser un numero entero")
         except Exception as e:
             print(f"Error inesperado: {e}")
     
@@ -213,7 +225,7 @@ class CLI:
         print("\n TODOS LOS TURNOS")
         print("*" * 50)
         
-        turnos = self.clinica.obtener_turnos()
+        turnos = self.clinica.vista_turnos()
         if not turnos:
             print("No hay turnos agendados.")
             return
@@ -226,7 +238,7 @@ class CLI:
         print("\n TODOS LOS PACIENTES")
         print("*" * 50)
         
-        pacientes = self.clinica.obtener_pacientes()
+        pacientes = self.clinica.vista_pacientes().values()
         if not pacientes:
             print("No hay pacientes registrados.")
             return
@@ -239,7 +251,7 @@ class CLI:
         print("\n TODOS LOS MEDICOS")
         print("*" * 50)
         
-        medicos = self.clinica.obtener_medicos()
+        medicos = self.clinica.vista_medicos().values()
         if not medicos:
             print("No hay medicos registrados.")
             return
@@ -279,6 +291,8 @@ class CLI:
                 elif opcion == '9':
                     self.ver_todos_medicos()
 
+                self.clinica.confirmar()
+
                 if opcion != '0':
                     input("\nPresione Enter para continuar...")
                     
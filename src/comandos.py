@@ -0,0 +1,205 @@
+import shlex
+from collections import Counter
+from datetime import datetime
+from time import perf_counter
+from typing import Callable, Iterable, TextIO
+
+from src.models.clinica import Clinica
+from src.models.paciente import Paciente
+from src.models.medico import Medico
+from src.models.especialidad import Especialidad
+from src.models.turno import DURACION_POR_DEFECTO
+from src.importador import parsear_especialidades
+from src.exceptions.error import (
+    DatoInvalidoException,
+    EspecialidadInvalidaException,
+    PacienteNoEncontradoException,
+    PacienteDuplicadoException,
+    MedicoNoDisponibleException,
+    MedicoNoEncontradoException,
+    MedicoDuplicadoException,
+    TurnoOcupadoException,
+    RecetaInvalidaException
+)
+
+# Errores de una operacion que se informan sin cortar la ejecucion del archivo
+ERRORES_DE_OPERACION = (
+    DatoInvalidoException,
+    EspecialidadInvalidaException,
+    PacienteNoEncontradoException,
+    PacienteDuplicadoException,
+    MedicoNoDisponibleException,
+    MedicoNoEncontradoException,
+    MedicoDuplicadoException,
+    TurnoOcupadoException,
+    RecetaInvalidaException
+)
+
+# Operaciones entre cada confirmacion de los almacenamientos
+CONFIRMAR_CADA = 10_000
+
+AYUDA = """\
+Una operacion por linea; los valores con espacios van entre comillas y '#' inicia un comentario.
+
+  paciente NOMBRE DNI dd/mm/aaaa
+  medico NOMBRE MATRICULA [ESPECIALIDADES]      p. ej. "Cardiologia:lunes|miercoles;Pediatria:martes"
+  especialidad MATRICULA ESPECIALIDAD DIAS      p. ej. Pediatria lunes,martes
+  turno DNI MATRICULA ESPECIALIDAD dd/mm/aaaa HH:MM [DURACION]
+  receta DNI MATRICULA MEDICAMENTO [MEDICAMENTO ...]
+  historia DNI [ULTIMOS]"""
+
+
+def separar(linea: str) -> list[str]:
+
+    # shlex es lento para miles de lineas; solo se usa con comillas simples, escapes o comentarios
+    if "'" in linea or "\\" in linea or "#" in linea:
+        return shlex.split(linea, comments=True)
+    if '"' not in linea:
+        return linea.split()
+    trozos = linea.split('"')
+    if len(trozos) % 2 == 0:
+        raise ValueError("Comillas sin cerrar")
+    partes = []
+    for i, trozo in enumerate(trozos):
+        if i % 2:
+            partes.append(trozo)
+        else:
+            partes.extend(trozo.split())
+    return partes
+
+
+def parsear_fecha_hora(fecha: str, hora: str) -> datetime:
+
+    # Equivale a strptime con "%d/%m/%Y %H:%M" pero varias veces mas rapido
+    dia, mes, anio = fecha.split("/")
+    horas, minutos = hora.split(":")
+    return datetime(int(anio), int(mes), int(dia), int(horas), int(minutos))
+
+
+def _argumentos(argumentos: list[str], minimo: int, maximo: int | None, uso: str):
+
+    if len(argumentos) < minimo or (maximo is not None and len(argumentos) > maximo):
+        raise DatoInvalidoException(f"Uso: {uso}")
+
+
+class EjecutorComandos:
+
+    # Corre operaciones de texto contra una Clinica sin pedir datos por teclado. Los mensajes van
+    # a un archivo con buffer; en modo resumen solo se escriben los errores y las historias pedidas
+
+    def __init__(self, clinica: Clinica, salida: TextIO, resumen: bool = False):
+
+        self.clinica = clinica
+        self.salida = salida
+        self.resumen = resumen
+        self.operaciones: dict[str, Callable[[list[str]], str]] = {
+            "paciente": self.agregar_paciente,
+            "medico": self.agregar_medico,
+            "especialidad": self.agregar_especialidad_medico,
+            "turno": self.agendar_turno,
+            "receta": self.emitir_receta,
+            "historia": self.ver_historia_clinica,
+        }
+
+    def ejecutar(self, lineas: Iterable[str]) -> dict:
+
+        exitosas: Counter = Counter()
+        fallidas: Counter = Counter()
+        realizadas = 0
+        inicio = perf_counter()
+
+        for numero, linea in enumerate(lineas, 1):
+            try:
+                partes = separar(linea)
+            except ValueError as e:
+                fallidas["?"] += 1
+                self.salida.write(f"linea {numero}: {e}\n")
+                continue
+            if not partes:
+                continue
+
+            nombre, argumentos = partes[0].lower(), partes[1:]
+            operacion = self.operaciones.get(nombre)
+            try:
+                if operacion is None:
+                    raise DatoInvalidoException(f"Operacion desconocida: {partes[0]}")
+                mensaje = operacion(argumentos)
+            except ERRORES_DE_OPERACION as e:
+                fallidas[nombre] += 1
+                self.salida.write(f"linea {numero}: {e}\n")
+                continue
+            except ValueError:
+                fallidas[nombre] += 1
+                self.salida.write(f"linea {numero}: Formato invalido en {nombre}: {' '.join(argumentos)}\n")
+                continue
+
+            exitosas[nombre] += 1
+            realizadas += 1
+            if mensaje and not self.resumen:
+                self.salida.write(mensaje)
+            if realizadas % CONFIRMAR_CADA == 0:
+                self.clinica.confirmar()
+
+        self.clinica.confirmar()
+        return {"exitosas": exitosas, "fallidas": fallidas, "segundos": perf_counter() - inicio}
+
+    def escribir_resumen(self, reporte: dict):
+
+        total = sum(reporte["exitosas"].values()) + sum(reporte["fallidas"].values())
+        segundos = reporte["segundos"]
+        self.salida.write(f"\n{total} operaciones en {segundos:.2f} s"
+                          f" ({total / segundos if segundos else 0:,.0f} ops/s)\n")
+        for nombre in sorted(reporte["exitosas"].keys() | reporte["fallidas"].keys()):
+            self.salida.write(f"  {nombre}: {reporte['exitosas'][nombre]} exitosas, "
+                              f"{reporte['fallidas'][nombre]} con errores\n")
+
+    #Operaciones
+
+    def agregar_paciente(self, argumentos: list[str]) -> str:
+
+        _argumentos(argumentos, 3, 3, "paciente NOMBRE DNI dd/mm/aaaa")
+        nombre, dni, fecha_nacimiento = argumentos
+        self.clinica.agregar_paciente(Paciente(nombre, dni, fecha_nacimiento))
+        return f"Paciente {nombre} agregado exitosamente.\n"
+
+    def agregar_medico(self, argumentos: list[str]) -> str:
+
+        _argumentos(argumentos, 2, 3, "medico NOMBRE MATRICULA [ESPECIALIDADES]")
+        medico = Medico(argumentos[0], argumentos[1])
+        for especialidad in parsear_especialidades(argumentos[2] if len(argumentos) == 3 else None):
+            medico.agregar_especialidad(especialidad)
+        self.clinica.agregar_medico(medico)
+        return f"Medico {argumentos[0]} agregado exitosamente.\n"
+
+    def agregar_especialidad_medico(self, argumentos: list[str]) -> str:
+
+        _argumentos(argumentos, 3, 3, "especialidad MATRICULA ESPECIALIDAD DIAS")
+        matricula, nombre, dias = argumentos
+        self.clinica.obtener_medico_por_matricula(matricula)
+        self.clinica.agregar_especialidad(matricula, Especialidad(nombre, [dia.strip() for dia in dias.split(",")]))
+        return f"Especialidad {nombre} agregada al medico.\n"
+
+    def agendar_turno(self, argumentos: list[str]) -> str:
+
+        _argumentos(argumentos, 5, 6, "turno DNI MATRICULA ESPECIALIDAD dd/mm/aaaa HH:MM [DURACION]")
+        dni, matricula, especialidad, fecha, hora = argumentos[:5]
+        fecha_hora = parsear_fecha_hora(fecha, hora)
+        duracion = int(argumentos[5]) if len(argumentos) == 6 else DURACION_POR_DEFECTO
+        self.clinica.agendar_turno(dni, matricula, especialidad, fecha_hora, duracion)
+        return "Turno agendado exitosamente.\n"
+
+    def emitir_receta(self, argumentos: list[str]) -> str:
+
+        _argumentos(argumentos, 3, None, "receta DNI MATRICULA MEDICAMENTO [MEDICAMENTO ...]")
+        self.clinica.emitir_receta(argumentos[0], argumentos[1], argumentos[2:])
+        return "Receta emitida exitosamente.\n"
+
+    def ver_historia_clinica(self, argumentos: list[str]) -> str:
+
+        # La historia se pidio explicitamente, asi que se escribe tambien en modo resumen
+        _argumentos(argumentos, 1, 2, "historia DNI [ULTIMOS]")
+        historia = self.clinica.obtener_historia_clinica(argumentos[0])
+        ultimos = int(argumentos[1]) if len(argumentos) == 2 else None
+        historia.escribir(self.salida, ultimos=ultimos)
+        self.salida.write("\n")
+        return ""
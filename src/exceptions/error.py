@@ -22,5 +22,8 @@ class DatoInvalidoException(Exception):
 class TurnoOcupadoException(Exception):
     pass
 
+class TurnoNoEncontradoException(Exception):
+    pass
+
 class RecetaInvalidaException(Exception):
     pass
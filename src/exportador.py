@@ -0,0 +1,358 @@
+import argparse
+import csv
+import json
+import os
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+from itertools import islice
+from time import perf_counter
+
+from src.models.cacheRenderizado import CacheRenderizado
+from src.models.clinica import Clinica
+from src.models.historiaClinica import HistoriaClinica
+from src.models.medico import Medico
+from src.models.paciente import Paciente
+from src.models.receta import Receta
+from src.models.turno import Turno
+from src.exceptions.error import DatoInvalidoException
+
+# Historias que procesa cada tarea del pool; lotes grandes amortizan el envio entre procesos
+TAMANIO_LOTE = 500
+
+# Datos minimos de una historia para reconstruirla en otro proceso:
+# (nombre, dni, fecha_nacimiento, turnos, recetas) con
+# turnos = [(matricula, nombre_medico, especialidad, fecha_hora, duracion)] y
+# recetas = [(matricula, nombre_medico, medicamentos, fecha)]
+Paquete = tuple[str, str, str, list[tuple], list[tuple]]
+
+Progreso = Callable[[int, int], None]
+
+# Columnas de las exportaciones tabulares, en el orden en que se escriben
+COLUMNAS_TURNOS = ("dni", "matricula", "especialidad", "fecha_hora", "duracion")
+COLUMNAS_RECETAS = ("dni", "matricula", "fecha", "medicamentos")
+
+# Buffer de escritura de las exportaciones tabulares
+TAMANIO_BUFFER = 1 << 20
+
+# Conexion propia de cada proceso cuando las historias se leen desde SQLite
+_almacenamiento_del_proceso = None
+
+
+def ruta_historia(directorio: str, dni: str) -> str:
+
+    return os.path.join(directorio, f"historia_{dni}.txt")
+
+
+def empaquetar(paciente: Paciente, historia: HistoriaClinica) -> Paquete:
+
+    return (
+        paciente.obtener_nombre(), paciente.obtener_dni(), paciente.obtener_fecha_nacimiento(),
+        [(t.obtener_medico().obtener_matricula(), t.obtener_medico().obtener_nombre(), t.obtener_especialidad(),
+          t.obtener_fecha_hora(), t.obtener_duracion()) for t in historia.vista_turnos()],
+        [(r.obtener_medico().obtener_matricula(), r.obtener_medico().obtener_nombre(), r.obtener_medicamentos(),
+          r.obtener_fecha()) for r in historia.vista_recetas()],
+    )
+
+
+def reconstruir(paquete: Paquete, medicos: dict[str, Medico]) -> HistoriaClinica:
+
+    # Arma una historia independiente de la clinica original; los medicos se comparten por proceso
+    nombre, dni, fecha_nacimiento, turnos, recetas = paquete
+    paciente = Paciente(nombre, dni, fecha_nacimiento)
+    historia = HistoriaClinica(paciente, cache=CacheRenderizado(0))
+    for matricula, nombre_medico, especialidad, fecha_hora, duracion in turnos:
+        historia.agregar_turno(
+            Turno.restaurar(paciente, _medico(medicos, matricula, nombre_medico), fecha_hora, especialidad, duracion)
+        )
+    for matricula, nombre_medico, medicamentos, fecha in recetas:
+        historia.agregar_receta(Receta.restaurar(paciente, _medico(medicos, matricula, nombre_medico), medicamentos, fecha))
+    return historia
+
+
+def _medico(medicos: dict[str, Medico], matricula: str, nombre: str) -> Medico:
+
+    medico = medicos.get(matricula)
+    if medico is None:
+        medico = medicos[matricula] = Medico(nombre, matricula)
+    return medico
+
+
+def _escribir_paquetes(directorio: str, paquetes: Iterable[Paquete]) -> tuple[int, int, float]:
+
+    inicio = perf_counter()
+    medicos: dict[str, Medico] = {}
+    cantidad = 0
+    for paquete in paquetes:
+        historia = reconstruir(paquete, medicos)
+        with open(ruta_historia(directorio, paquete[1]), "w", encoding="utf-8", buffering=1 << 16) as archivo:
+            historia.escribir(archivo)
+        cantidad += 1
+    return os.getpid(), cantidad, perf_counter() - inicio
+
+
+#Tareas que corren en los procesos del pool
+
+def exportar_lote(directorio: str, paquetes: list[Paquete]) -> tuple[int, int, float]:
+
+    return _escribir_paquetes(directorio, paquetes)
+
+
+def _abrir_almacenamiento(ruta_db: str):
+
+    from src.persistencia.almacenamientoSQLite import AlmacenamientoSQLite
+
+    global _almacenamiento_del_proceso
+    _almacenamiento_del_proceso = AlmacenamientoSQLite(ruta_db, solo_lectura=True)
+
+
+def exportar_lote_db(directorio: str, dnis: list[str]) -> tuple[int, int, float]:
+
+    nombres: dict[str, str] = {}
+    return _escribir_paquetes(directorio, (_paquete_desde_db(_almacenamiento_del_proceso, dni, nombres)
+                                           for dni in dnis))
+
+
+def _paquete_desde_db(almacenamiento, dni: str, nombres: dict[str, str]) -> Paquete:
+
+    def nombre_medico(matricula: str) -> str:
+        if matricula not in nombres:
+            nombres[matricula] = almacenamiento.cargar_medico(matricula)[0]
+        return nombres[matricula]
+
+    nombre, dni, fecha_nacimiento = almacenamiento.cargar_paciente(dni)
+    return (
+        nombre, dni, fecha_nacimiento,
+        [(matricula, nombre_medico(matricula), especialidad, fecha_hora, duracion)
+         for _, matricula, especialidad, fecha_hora, duracion in almacenamiento.turnos_de_paciente(dni)],
+        [(matricula, nombre_medico(matricula), medicamentos, fecha)
+         for _, matricula, medicamentos, fecha in almacenamiento.recetas_de_paciente(dni)],
+    )
+
+
+#Coordinacion
+
+def _lotes(elementos: Iterable, tamanio: int) -> Iterator[list]:
+
+    iterador = iter(elementos)
+    while lote := list(islice(iterador, tamanio)):
+        yield lote
+
+
+def _repartir(tarea, directorio: str, lotes: Iterator[list], procesos: int | None,
+              progreso: Progreso | None, total: int, inicializador=None, argumentos=()) -> dict:
+
+    # Mantiene a lo sumo dos lotes por proceso en vuelo, asi la memoria del proceso principal no
+    # depende de la cantidad de pacientes
+    procesos = procesos or os.cpu_count() or 1
+    os.makedirs(directorio, exist_ok=True)
+    inicio = perf_counter()
+    exportadas = 0
+    por_proceso: dict[int, dict] = {}
+
+    with ProcessPoolExecutor(max_workers=procesos, initializer=inicializador, initargs=argumentos) as pool:
+        limite = 2 * procesos
+        pendientes = set()
+        for lote in lotes:
+            pendientes.add(pool.submit(tarea, directorio, lote))
+            if len(pendientes) >= limite:
+                terminadas, pendientes = wait(pendientes, return_when=FIRST_COMPLETED)
+                exportadas += _acumular(terminadas, por_proceso, progreso, exportadas, total)
+        while pendientes:
+            terminadas, pendientes = wait(pendientes, return_when=FIRST_COMPLETED)
+            exportadas += _acumular(terminadas, por_proceso, progreso, exportadas, total)
+
+    return {"historias": exportadas, "segundos": perf_counter() - inicio, "procesos": por_proceso}
+
+
+def _acumular(terminadas, por_proceso: dict, progreso: Progreso | None, exportadas: int, total: int) -> int:
+
+    nuevas = 0
+    for futuro in terminadas:
+        pid, cantidad, segundos = futuro.result()
+        proceso = por_proceso.setdefault(pid, {"lotes": 0, "historias": 0, "segundos": 0.0})
+        proceso["lotes"] += 1
+        proceso["historias"] += cantidad
+        proceso["segundos"] += segundos
+        nuevas += cantidad
+        if progreso is not None:
+            progreso(exportadas + nuevas, total)
+    return nuevas
+
+
+def exportar_historias(clinica: Clinica, directorio: str, procesos: int | None = None,
+                       tamanio_lote: int = TAMANIO_LOTE, progreso: Progreso | None = None) -> dict:
+
+    # El proceso principal solo empaqueta datos planos; el formateo y la escritura se reparten
+    pacientes = clinica.vista_pacientes()
+    paquetes = (empaquetar(paciente, clinica.obtener_historia_clinica(dni)) for dni, paciente in pacientes.items())
+    return _repartir(exportar_lote, directorio, _lotes(paquetes, tamanio_lote), procesos, progreso, len(pacientes))
+
+
+def exportar_historias_db(ruta_db: str, directorio: str, procesos: int | None = None,
+                          tamanio_lote: int = TAMANIO_LOTE, progreso: Progreso | None = None) -> dict:
+
+    # Cada proceso abre su propia conexion y lee las historias de sus DNIs; al principal solo
+    # le queda listar los DNIs
+    from src.persistencia.almacenamientoSQLite import AlmacenamientoSQLite
+
+    almacenamiento = AlmacenamientoSQLite(ruta_db, solo_lectura=True)
+    try:
+        dnis = almacenamiento.dnis()
+    finally:
+        almacenamiento.cerrar()
+    return _repartir(exportar_lote_db, directorio, _lotes(dnis, tamanio_lote), procesos, progreso, len(dnis),
+                     _abrir_almacenamiento, (ruta_db,))
+
+
+#Turnos y recetas
+
+def filas_turnos(turnos: Iterable[Turno]) -> Iterator[tuple[str, str, str, datetime, int]]:
+
+    for turno in turnos:
+        yield (turno.obtener_paciente().obtener_dni(), turno.obtener_medico().obtener_matricula(),
+               turno.obtener_especialidad(), turno.obtener_fecha_hora(), turno.obtener_duracion())
+
+
+def filas_recetas(recetas: Iterable[Receta]) -> Iterator[tuple[str, str, datetime, list[str]]]:
+
+    for receta in recetas:
+        yield (receta.obtener_paciente().obtener_dni(), receta.obtener_medico().obtener_matricula(),
+               receta.obtener_fecha(), receta.obtener_medicamentos())
+
+
+def escribir_filas(filas: Iterable[tuple], ruta: str, columnas: tuple[str, ...], formato: str | None = None) -> int:
+
+    # Escribe fila por fila con un buffer grande, asi la memoria no depende de la cantidad de filas.
+    # Las fechas van en ISO; en CSV las listas se unen con "|" como las especialidades al importar
+    formato = formato or ("jsonl" if ruta.endswith((".jsonl", ".json")) else "csv")
+    if formato not in ("csv", "jsonl"):
+        raise DatoInvalidoException(f"Formato de exportacion desconocido: {formato}")
+
+    cantidad = 0
+    with open(ruta, "w", newline="", encoding="utf-8", buffering=TAMANIO_BUFFER) as archivo:
+        if formato == "csv":
+            escritor = csv.writer(archivo)
+            escritor.writerow(columnas)
+            for fila in filas:
+                escritor.writerow([_valor_csv(valor) for valor in fila])
+                cantidad += 1
+        else:
+            codificar = json.JSONEncoder(ensure_ascii=False, default=datetime.isoformat).encode
+            for fila in filas:
+                archivo.write(codificar(dict(zip(columnas, fila))))
+                archivo.write("\n")
+                cantidad += 1
+    return cantidad
+
+
+def _valor_csv(valor):
+
+    if isinstance(valor, datetime):
+        return valor.isoformat()
+    if isinstance(valor, list):
+        return "|".join(valor)
+    return valor
+
+
+def exportar_turnos(clinica: Clinica, ruta: str, formato: str | None = None, dni: str | None = None,
+                    matricula: str | None = None, desde: datetime | None = None, hasta: datetime | None = None) -> int:
+
+    return escribir_filas(filas_turnos(clinica.recorrer_turnos(dni, matricula, None, desde, hasta)),
+                          ruta, COLUMNAS_TURNOS, formato)
+
+
+def exportar_recetas(clinica: Clinica, ruta: str, formato: str | None = None, dni: str | None = None,
+                     matricula: str | None = None, desde: datetime | None = None, hasta: datetime | None = None) -> int:
+
+    return escribir_filas(filas_recetas(clinica.recorrer_recetas(dni, matricula, desde, hasta)),
+                          ruta, COLUMNAS_RECETAS, formato)
+
+
+def exportar_turnos_db(ruta_db: str, ruta: str, formato: str | None = None, dni: str | None = None,
+                       matricula: str | None = None, desde: datetime | None = None,
+                       hasta: datetime | None = None) -> int:
+
+    # Lee directamente del cursor de SQLite sin armar turnos ni cargar la clinica
+    from src.persistencia.almacenamientoSQLite import AlmacenamientoSQLite
+
+    almacenamiento = AlmacenamientoSQLite(ruta_db, solo_lectura=True)
+    try:
+        return escribir_filas(almacenamiento.recorrer_turnos(dni, matricula, desde, hasta),
+                              ruta, COLUMNAS_TURNOS, formato)
+    finally:
+        almacenamiento.cerrar()
+
+
+def exportar_recetas_db(ruta_db: str, ruta: str, formato: str | None = None, dni: str | None = None,
+                        matricula: str | None = None, desde: datetime | None = None,
+                        hasta: datetime | None = None) -> int:
+
+    from src.persistencia.almacenamientoSQLite import AlmacenamientoSQLite
+
+    almacenamiento = AlmacenamientoSQLite(ruta_db, solo_lectura=True)
+    try:
+        filas = ((dni_receta, matricula_receta, fecha, medicamentos) for dni_receta, matricula_receta, medicamentos, fecha
+                 in almacenamiento.recorrer_recetas(dni, matricula, desde, hasta))
+        return escribir_filas(filas, ruta, COLUMNAS_RECETAS, formato)
+    finally:
+        almacenamiento.cerrar()
+
+
+def main():
+
+    from src.persistencia.diario import Diario
+
+    parser = argparse.ArgumentParser(description="Exporta historias clinicas, turnos o recetas")
+    parser.add_argument("tipo", choices=["historias", "turnos", "recetas"])
+    parser.add_argument("destino", help="Directorio para historia_<dni>.txt, o archivo CSV/JSONL para turnos y recetas")
+    origen = parser.add_mutually_exclusive_group(required=True)
+    origen.add_argument("--db", help="Archivo SQLite de la clinica")
+    origen.add_argument("--diario", help="Directorio del diario de la clinica")
+    parser.add_argument("--procesos", type=int, help="Procesos del pool para historias (por defecto, uno por nucleo)")
+    parser.add_argument("--lote", type=int, default=TAMANIO_LOTE, help="Historias por tarea")
+    parser.add_argument("--formato", choices=["csv", "jsonl"])
+    parser.add_argument("--dni", help="Solo los turnos o recetas de este paciente")
+    parser.add_argument("--matricula", help="Solo los turnos o recetas de este medico")
+    parser.add_argument("--desde", type=datetime.fromisoformat, help="Fecha ISO inicial, incluida")
+    parser.add_argument("--hasta", type=datetime.fromisoformat, help="Fecha ISO final, excluida")
+    args = parser.parse_args()
+    # Un origen mal escrito no debe terminar en una exportacion vacia
+    if args.db and not os.path.isfile(args.db):
+        parser.error(f"No existe la base de datos: {args.db}")
+    if args.diario and not os.path.isdir(args.diario):
+        parser.error(f"No existe el directorio del diario: {args.diario}")
+
+    clinica = None
+    if args.diario:
+        # Exportar solo lee: no se abre el diario para escritura
+        clinica = Diario.reproducir(args.diario, Clinica())
+
+    if args.tipo != "historias":
+        filtros = (args.formato, args.dni, args.matricula, args.desde, args.hasta)
+        inicio = perf_counter()
+        if args.tipo == "turnos":
+            cantidad = (exportar_turnos_db(args.db, args.destino, *filtros) if args.db
+                        else exportar_turnos(clinica, args.destino, *filtros))
+        else:
+            cantidad = (exportar_recetas_db(args.db, args.destino, *filtros) if args.db
+                        else exportar_recetas(clinica, args.destino, *filtros))
+        print(f"{cantidad} {args.tipo} {'exportadas' if args.tipo == 'recetas' else 'exportados'} en {perf_counter() - inicio:.1f} s")
+        return
+
+    def mostrar_progreso(exportadas: int, total: int):
+        print(f"{exportadas}/{total} historias exportadas", end="\r", flush=True)
+
+    if args.db:
+        reporte = exportar_historias_db(args.db, args.destino, args.procesos, args.lote, mostrar_progreso)
+    else:
+        reporte = exportar_historias(clinica, args.destino, args.procesos, args.lote, mostrar_progreso)
+
+    print(f"\n{reporte['historias']} historias en {reporte['segundos']:.1f} s")
+    for pid, proceso in sorted(reporte["procesos"].items()):
+        print(f"  proceso {pid}: {proceso['historias']} historias en {proceso['lotes']} lotes, "
+              f"{proceso['segundos']:.1f} s de trabajo")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+import argparse
+import csv
+import json
+import os
+from datetime import datetime
+from typing import Callable, Iterable, Iterator
+
+from src.models.clinica import Clinica
+from src.models.paciente import Paciente
+from src.models.medico import Medico
+from src.models.especialidad import Especialidad
+from src.exceptions.error import (
+    DatoInvalidoException,
+    EspecialidadInvalidaException,
+    MedicoDuplicadoException,
+    PacienteDuplicadoException
+)
+
+# Errores de una fila que se registran en el reporte sin cortar la importacion
+ERRORES_DE_FILA = (
+    DatoInvalidoException,
+    EspecialidadInvalidaException,
+    MedicoDuplicadoException,
+    PacienteDuplicadoException
+)
+
+Progreso = Callable[[int, int, int], None]
+
+
+def leer_filas(ruta: str, formato: str | None = None) -> Iterator[tuple[int, dict]]:
+
+    # Devuelve (numero de linea, fila) de un CSV con encabezado o de un archivo JSONL
+    formato = formato or ("jsonl" if ruta.endswith((".jsonl", ".json")) else "csv")
+    with open(ruta, newline="", encoding="utf-8") as archivo:
+        if formato == "csv":
+            lector = csv.DictReader(archivo)
+            for fila in lector:
+                yield lector.line_num, fila
+        elif formato == "jsonl":
+            for numero, linea in enumerate(archivo, 1):
+                if linea.strip():
+                    try:
+                        yield numero, json.loads(linea)
+                    except json.JSONDecodeError:
+                        yield numero, None
+        else:
+            raise DatoInvalidoException(f"Formato de importacion desconocido: {formato}")
+
+
+def parsear_especialidades(valor) -> list[Especialidad]:
+
+    # Acepta una lista JSON [{"tipo": ..., "dias": [...]}] o el texto "Tipo:dia|dia;Tipo:dia"
+    if not valor:
+        return []
+    if isinstance(valor, str):
+        especialidades = []
+        for parte in valor.split(";"):
+            if not parte.strip():
+                continue
+            tipo, separador, dias = parte.partition(":")
+            if not separador:
+                raise DatoInvalidoException(f"Especialidad sin dias: {parte.strip()}")
+            especialidades.append(Especialidad(tipo, dias.split("|")))
+        return especialidades
+    try:
+        especialidades = []
+        for item in valor:
+            tipo, dias = item["tipo"], item["dias"]
+            # Un JSON puede traer cualquier tipo; Especialidad espera textos
+            if not isinstance(tipo, str) or not isinstance(dias, list) or not all(isinstance(d, str) for d in dias):
+                raise DatoInvalidoException("El tipo debe ser un texto y los dias una lista de textos")
+            especialidades.append(Especialidad(tipo, dias))
+        return especialidades
+    except (KeyError, TypeError):
+        raise DatoInvalidoException("Cada especialidad debe tener tipo y dias")
+
+
+def _texto(fila: dict, campo: str) -> str:
+
+    valor = fila.get(campo)
+    return "" if valor is None else str(valor)
+
+
+def construir_pacientes(filas: Iterable[tuple[int, dict]]) -> Iterator[tuple[int, Paciente | Exception]]:
+
+    ahora = datetime.now()
+    for numero, fila in filas:
+        try:
+            if not isinstance(fila, dict):
+                raise DatoInvalidoException("Fila con formato invalido")
+            yield numero, Paciente(_texto(fila, "nombre"), _texto(fila, "dni"), _texto(fila, "fecha_nacimiento"), ahora)
+        except ERRORES_DE_FILA as e:
+            yield numero, e
+
+
+def construir_medicos(filas: Iterable[tuple[int, dict]]) -> Iterator[tuple[int, Medico | Exception]]:
+
+    for numero, fila in filas:
+        try:
+            if not isinstance(fila, dict):
+                raise DatoInvalidoException("Fila con formato invalido")
+            medico = Medico(_texto(fila, "nombre"), _texto(fila, "matricula"))
+            for especialidad in parsear_especialidades(fila.get("especialidades")):
+                medico.agregar_especialidad(especialidad)
+            yield numero, medico
+        except ERRORES_DE_FILA as e:
+            yield numero, e
+
+
+def registrar(objetos: Iterable[tuple[int, object]], agregar: Callable[[object], None],
+              progreso: Progreso | None = None, cada: int = 10_000, max_errores: int = 1_000) -> dict:
+
+    # Consume el pipeline fila por fila: la memoria no depende del tamanio del archivo,
+    # salvo por los primeros max_errores errores que se guardan en el reporte
+    procesadas = importadas = cantidad_errores = 0
+    errores: list[tuple[int, str]] = []
+
+    for numero, objeto in objetos:
+        procesadas += 1
+        if not isinstance(objeto, Exception):
+            try:
+                agregar(objeto)
+                importadas += 1
+            except ERRORES_DE_FILA as e:
+                objeto = e
+        if isinstance(objeto, Exception):
+            cantidad_errores += 1
+            if len(errores) < max_errores:
+                errores.append((numero, str(objeto)))
+        if progreso is not None and procesadas % cada == 0:
+            progreso(procesadas, importadas, cantidad_errores)
+
+    if progreso is not None and procesadas % cada != 0:
+        progreso(procesadas, importadas, cantidad_errores)
+    return {"procesadas": procesadas, "importadas": importadas,
+            "cantidad_errores": cantidad_errores, "errores": errores}
+
+
+def importar_pacientes(clinica: Clinica, ruta: str, formato: str | None = None,
+                       progreso: Progreso | None = None, cada: int = 10_000) -> dict:
+
+    return registrar(construir_pacientes(leer_filas(ruta, formato)), clinica.agregar_paciente, progreso, cada)
+
+
+def importar_medicos(clinica: Clinica, ruta: str, formato: str | None = None,
+                     progreso: Progreso | None = None, cada: int = 10_000) -> dict:
+
+    return registrar(construir_medicos(leer_filas(ruta, formato)), clinica.agregar_medico, progreso, cada)
+
+
+def main():
+
+    from src.persistencia.almacenamientoSQLite import AlmacenamientoSQLite
+    from src.persistencia.diario import Diario
+
+    parser = argparse.ArgumentParser(description="Importa pacientes o medicos desde CSV o JSONL")
+    parser.add_argument("tipo", choices=["pacientes", "medicos"])
+    parser.add_argument("archivo")
+    parser.add_argument("--formato", choices=["csv", "jsonl"])
+    destino = parser.add_mutually_exclusive_group(required=True)
+    destino.add_argument("--db", help="Archivo SQLite de la clinica")
+    destino.add_argument("--diario", help="Directorio del diario de la clinica")
+    args = parser.parse_args()
+
+    almacenamiento = AlmacenamientoSQLite(args.db) if args.db else None
+    diario = Diario(args.diario, tamanio_grupo=4096) if args.diario else None
+    clinica = Clinica(almacenamiento, diario)
+
+    def mostrar_progreso(procesadas: int, importadas: int, errores: int):
+        print(f"{procesadas} filas procesadas, {importadas} importadas, {errores} con errores")
+
+    importar = importar_pacientes if args.tipo == "pacientes" else importar_medicos
+    try:
+        reporte = importar(clinica, args.archivo, args.formato, mostrar_progreso)
+    finally:
+        for destino in (almacenamiento, diario):
+            if destino is not None:
+                destino.cerrar()
+
+    for numero, mensaje in reporte["errores"]:
+        print(f"{os.path.basename(args.archivo)}:{numero}: {mensaje}")
+
+
+if __name__ == "__main__":
+    main()
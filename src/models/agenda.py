@@ -0,0 +1,108 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from operator import itemgetter
+from typing import Any, Iterator
+
+from src.exceptions.error import TurnoOcupadoException
+
+
+class Agenda:
+
+    __slots__ = ('__inicios__', '__fines__', '__elementos__')
+
+    # Intervalos [inicio, fin) ordenados por inicio y sin superposicion entre si,
+    # por lo que los fines tambien quedan ordenados y ambos se pueden biseccionar.
+
+    def __init__(self):
+
+        self.__inicios__: list[datetime] = []
+        self.__fines__: list[datetime] = []
+        self.__elementos__: list[Any] = []
+
+    def hay_superposicion(self, inicio: datetime, fin: datetime) -> bool:
+
+        posicion = bisect_right(self.__inicios__, inicio)
+        if posicion > 0 and self.__fines__[posicion - 1] > inicio:
+            return True
+        return posicion < len(self.__inicios__) and self.__inicios__[posicion] < fin
+
+    def libre_desde(self, inicio: datetime) -> bool:
+
+        return not self.__fines__ or self.__fines__[-1] <= inicio
+
+    def agregar(self, inicio: datetime, fin: datetime, elemento: Any):
+
+        if fin <= inicio:
+            raise ValueError("El fin del intervalo debe ser posterior a su inicio")
+        if self.hay_superposicion(inicio, fin):
+            raise TurnoOcupadoException("El medico ya tiene un turno que se superpone con ese horario")
+
+        posicion = bisect_right(self.__inicios__, inicio)
+        self.__inicios__.insert(posicion, inicio)
+        self.__fines__.insert(posicion, fin)
+        self.__elementos__.insert(posicion, elemento)
+
+    def agregar_ordenados(self, intervalos: list[tuple[datetime, datetime, Any]]):
+
+        # Recibe intervalos ya validados, ordenados por inicio y sin superposicion con la agenda.
+        if not intervalos:
+            return
+        if self.__fines__ and intervalos[0][0] < self.__fines__[-1]:
+            intervalos = sorted(list(zip(self.__inicios__, self.__fines__, self.__elementos__)) + intervalos,
+                                key=itemgetter(0))
+            self.__inicios__, self.__fines__, self.__elementos__ = [], [], []
+        for inicio, fin, elemento in intervalos:
+            self.__inicios__.append(inicio)
+            self.__fines__.append(fin)
+            self.__elementos__.append(elemento)
+
+    def quitar(self, inicio: datetime, elemento: Any) -> bool:
+
+        # Los inicios no se repiten porque los intervalos no se superponen
+        posicion = bisect_left(self.__inicios__, inicio)
+        if posicion == len(self.__inicios__) or self.__elementos__[posicion] is not elemento:
+            return False
+        del self.__inicios__[posicion], self.__fines__[posicion], self.__elementos__[posicion]
+        return True
+
+    def descartar_hasta(self, corte: datetime) -> list[Any]:
+
+        # Quita y devuelve los elementos que terminan a mas tardar en corte; como los fines estan
+        # ordenados, son siempre un prefijo de la agenda
+        posicion = bisect_right(self.__fines__, corte)
+        descartados = self.__elementos__[:posicion]
+        del self.__inicios__[:posicion], self.__fines__[:posicion], self.__elementos__[:posicion]
+        return descartados
+
+    def entre(self, desde: datetime, hasta: datetime) -> Iterator[Any]:
+
+        posicion = bisect_right(self.__fines__, desde)
+        inicios = self.__inicios__
+        while posicion < len(inicios) and inicios[posicion] < hasta:
+            yield self.__elementos__[posicion]
+            posicion += 1
+
+    def inicios_libres(self, desde: datetime, hasta: datetime, paso: timedelta) -> Iterator[datetime]:
+
+        # Recorre la grilla desde, desde + paso, ... y genera los inicios cuyo intervalo de largo
+        # paso entra antes de hasta sin pisar ningun elemento. Al chocar salta directo al primer
+        # punto de la grilla posterior al fin del elemento, sin revisar los intermedios.
+        inicios, fines = self.__inicios__, self.__fines__
+        posicion = bisect_right(fines, desde)
+        inicio = desde
+        while inicio + paso <= hasta:
+            while posicion < len(fines) and fines[posicion] <= inicio:
+                posicion += 1
+            if posicion < len(inicios) and inicios[posicion] < inicio + paso:
+                inicio = desde + paso * -(-(fines[posicion] - desde) // paso)
+                continue
+            yield inicio
+            inicio += paso
+
+    def __len__(self) -> int:
+
+        return len(self.__elementos__)
+
+    def __iter__(self) -> Iterator[Any]:
+
+        return iter(self.__elementos__)
@@ -0,0 +1,172 @@
+import heapq
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator
+
+from src.models.columnasTurnos import EPOCA
+from src.models.especialidad import normalizar_texto
+from src.models.turno import Turno
+
+_MICROSEGUNDO = timedelta(microseconds=1)
+
+
+class SegmentoTurnos:
+
+    # Turnos ya terminados guardados en columnas array ordenadas por fecha_hora, con una tabla por
+    # medico, paciente y especialidad en lugar de una referencia por turno. Se arma una sola vez y no
+    # se modifica; los Turno se reconstruyen al leerlos. Las filas de cada paciente y medico quedan
+    # contiguas y en orden cronologico dentro de un array de posiciones, asi un rango de fechas se
+    # recorta con bisect.
+
+    __slots__ = ('__instantes__', '__duraciones__', '__medicos__', '__pacientes__', '__especialidades__',
+                 '__tabla_medicos__', '__tabla_pacientes__', '__tabla_especialidades__', '__claves_especialidades__',
+                 '__filas_por_paciente__', '__rangos_por_dni__', '__filas_por_medico__', '__rangos_por_matricula__',
+                 '__duracion_maxima__')
+
+    def __init__(self, turnos: Iterable[Turno]):
+
+        turnos = sorted(turnos, key=Turno.obtener_fecha_hora)
+        # Microsegundos desde EPOCA, para reconstruir la fecha_hora exacta
+        self.__instantes__ = array('q', [(fecha_hora - EPOCA) // _MICROSEGUNDO
+                                         for fecha_hora in map(Turno.obtener_fecha_hora, turnos)])
+        self.__duraciones__ = array('H', map(Turno.obtener_duracion, turnos))
+        self.__duracion_maxima__ = max(self.__duraciones__, default=0)
+
+        self.__tabla_medicos__, self.__medicos__ = _codificar(map(Turno.obtener_medico, turnos), 'I')
+        self.__tabla_pacientes__, self.__pacientes__ = _codificar(map(Turno.obtener_paciente, turnos), 'I')
+        self.__tabla_especialidades__, self.__especialidades__ = _codificar(map(Turno.obtener_especialidad, turnos), 'H')
+        self.__claves_especialidades__ = tuple(map(normalizar_texto, self.__tabla_especialidades__))
+
+        self.__filas_por_paciente__, self.__rangos_por_dni__ = _agrupar(
+            self.__pacientes__, [paciente.obtener_dni() for paciente in self.__tabla_pacientes__])
+        self.__filas_por_medico__, self.__rangos_por_matricula__ = _agrupar(
+            self.__medicos__, [medico.obtener_matricula() for medico in self.__tabla_medicos__])
+
+    def recorrer(self, dni: str | None = None, matricula: str | None = None, especialidad: str | None = None,
+                 desde: datetime | None = None, hasta: datetime | None = None) -> Iterator[Turno]:
+
+        # Mismos filtros que IndiceTurnos.recorrer, en orden cronologico. Parte de las filas del DNI o
+        # de la matricula, o de todas, y recorta el rango semiabierto desde <= fecha_hora < hasta
+        grupos = []
+        if dni is not None:
+            grupos.append(self._filas(self.__filas_por_paciente__, self.__rangos_por_dni__, dni))
+        if matricula is not None:
+            grupos.append(self._filas(self.__filas_por_medico__, self.__rangos_por_matricula__, matricula))
+        filas = min(grupos, key=len) if grupos else range(len(self.__instantes__))
+
+        instante = self.__instantes__.__getitem__
+        inicio = bisect_left(filas, _instante(desde), key=instante) if desde is not None else 0
+        fin = bisect_left(filas, _instante(hasta), key=instante) if hasta is not None else len(filas)
+        clave = normalizar_texto(especialidad) if especialidad is not None else None
+        for posicion in range(inicio, fin):
+            fila = filas[posicion]
+            if dni is not None and self.__tabla_pacientes__[self.__pacientes__[fila]].obtener_dni() != dni:
+                continue
+            if matricula is not None and self.__tabla_medicos__[self.__medicos__[fila]].obtener_matricula() != matricula:
+                continue
+            if clave is not None and self.__claves_especialidades__[self.__especialidades__[fila]] != clave:
+                continue
+            yield self._turno(fila)
+
+    def _filas(self, filas: array, rangos: dict[str, tuple[int, int]], clave: str) -> array:
+
+        inicio, fin = rangos.get(clave, (0, 0))
+        return filas[inicio:fin]
+
+    def _turno(self, fila: int) -> Turno:
+
+        return Turno.restaurar(self.__tabla_pacientes__[self.__pacientes__[fila]],
+                               self.__tabla_medicos__[self.__medicos__[fila]],
+                               EPOCA + self.__instantes__[fila] * _MICROSEGUNDO,
+                               self.__tabla_especialidades__[self.__especialidades__[fila]],
+                               self.__duraciones__[fila])
+
+    def obtener_duracion_maxima(self) -> int:
+
+        return self.__duracion_maxima__
+
+    def __len__(self) -> int:
+
+        return len(self.__instantes__)
+
+
+class ArchivoTurnos:
+
+    # Particion fria de los turnos: segmentos inmutables que se agregan al archivar. Para que las
+    # consultas no recorran muchos segmentos chicos, cada segmento nuevo absorbe a los anteriores
+    # que no son mas grandes que el, de modo que los tamanios decrecen y quedan O(log n) segmentos.
+
+    __slots__ = ('__segmentos__',)
+
+    def __init__(self):
+
+        self.__segmentos__: list[SegmentoTurnos] = []
+
+    def agregar(self, turnos: list[Turno]):
+
+        if not turnos:
+            return
+        while self.__segmentos__ and len(self.__segmentos__[-1]) <= len(turnos):
+            turnos = list(self.__segmentos__.pop().recorrer()) + turnos
+        self.__segmentos__.append(SegmentoTurnos(turnos))
+
+    def recorrer(self, dni: str | None = None, matricula: str | None = None, especialidad: str | None = None,
+                 desde: datetime | None = None, hasta: datetime | None = None) -> Iterator[Turno]:
+
+        recorridos = [segmento.recorrer(dni, matricula, especialidad, desde, hasta) for segmento in self.__segmentos__]
+        if len(recorridos) == 1:
+            return recorridos[0]
+        return heapq.merge(*recorridos, key=Turno.obtener_fecha_hora)
+
+    def entre(self, matricula: str, desde: datetime, hasta: datetime) -> list[Turno]:
+
+        # Turnos del medico que se superponen con [desde, hasta), como Agenda.entre
+        resultado = []
+        for segmento in self.__segmentos__:
+            inicio = desde - timedelta(minutes=segmento.obtener_duracion_maxima())
+            resultado.extend(turno for turno in segmento.recorrer(matricula=matricula, desde=inicio, hasta=hasta)
+                             if turno.obtener_fin() > desde)
+        resultado.sort(key=Turno.obtener_fecha_hora)
+        return resultado
+
+    def turnos_de_paciente(self, dni: str) -> list[Turno]:
+
+        return list(self.recorrer(dni=dni))
+
+    def obtener_segmentos(self) -> tuple[SegmentoTurnos, ...]:
+
+        return tuple(self.__segmentos__)
+
+    def __len__(self) -> int:
+
+        return sum(len(segmento) for segmento in self.__segmentos__)
+
+
+def _codificar(valores: Iterable, tipo: str) -> tuple[tuple, array]:
+
+    # Reemplaza cada valor por su posicion en una tabla de valores distintos
+    ids: dict = {}
+    codigos = array(tipo, [ids.setdefault(valor, len(ids)) for valor in valores])
+    return tuple(ids), codigos
+
+
+def _agrupar(codigos: array, claves: list[str]) -> tuple[array, dict[str, tuple[int, int]]]:
+
+    # Ordena las filas por codigo conservando el orden cronologico dentro de cada uno (sorted es
+    # estable) y guarda el tramo [inicio, fin) de cada clave
+    filas = array('I', sorted(range(len(codigos)), key=codigos.__getitem__))
+    cantidades = Counter(codigos)
+    rangos = {}
+    inicio = 0
+    for codigo, clave in enumerate(claves):
+        rangos[clave] = (inicio, inicio + cantidades[codigo])
+        inicio += cantidades[codigo]
+    return filas, rangos
+
+
+def _instante(fecha_hora: datetime) -> int:
+
+    return (fecha_hora - EPOCA) // _MICROSEGUNDO
+
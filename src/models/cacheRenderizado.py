@@ -0,0 +1,121 @@
+import threading
+import weakref
+from collections import OrderedDict
+
+from src.exceptions.error import DatoInvalidoException
+
+# Lineas renderizadas que se conservan en total entre todas las historias
+CAPACIDAD_POR_DEFECTO = 200_000
+
+
+class CacheRenderizado:
+
+    # Guarda el texto ya formateado de cada turno y receta por historia, con desalojo LRU entre
+    # historias. Cada entrada es [lineas_turnos, lineas_recetas, cantidad, referencia]: los dicts van
+    # del numero de registro a su linea y solo tienen los ya renderizados. Una entrada nueva no tiene
+    # referencia y queda fuera del cache hasta que guarda su primera linea, para no ocupar lugar con
+    # historias vacias. El cache lo comparten todas las clinicas y sus hilos: las entradas se buscan
+    # por id de la historia con una referencia debil, asi que no la mantienen viva, y se leen y
+    # modifican bajo un candado
+
+    __slots__ = ('__capacidad__', '__entradas__', '__total__', '__bloqueo__', '__muertas__')
+
+    def __init__(self, capacidad: int = CAPACIDAD_POR_DEFECTO):
+
+        if isinstance(capacidad, bool) or not isinstance(capacidad, int) or capacidad < 0:
+            raise DatoInvalidoException("La capacidad del cache debe ser un entero no negativo")
+
+        self.__capacidad__ = capacidad
+        self.__entradas__: OrderedDict[int, list] = OrderedDict()
+        self.__total__ = 0
+        self.__bloqueo__ = threading.Lock()
+        # Ids de historias ya recolectadas; el callback de la referencia debil solo los anota porque
+        # puede correr en cualquier hilo y en medio de otra operacion sobre el cache
+        self.__muertas__: list[int] = []
+
+    def obtener(self, historia) -> list:
+
+        clave = id(historia)
+        with self.__bloqueo__:
+            self._purgar()
+            entrada = self.__entradas__.get(clave)
+            if entrada is None or entrada[3]() is not historia:
+                return [{}, {}, 0, None]
+            self.__entradas__.move_to_end(clave)
+            return entrada
+
+    def contar(self, historia, entrada: list, nuevas: int):
+
+        if nuevas == 0:
+            return
+        clave = id(historia)
+        muertas = self.__muertas__
+        with self.__bloqueo__:
+            self._purgar()
+            if entrada[3] is None:
+                entrada[3] = weakref.ref(historia, lambda _: muertas.append(clave))
+                self._quitar(clave)
+                self.__entradas__[clave] = entrada
+            elif self.__entradas__.get(clave) is not entrada:
+                # Una entrada desalojada o invalidada mientras se renderizaba ya no se conserva
+                return
+            entrada[2] += nuevas
+            self.__total__ += nuevas
+            while self.__total__ > self.__capacidad__ and self.__entradas__:
+                _, desalojada = self.__entradas__.popitem(last=False)
+                self.__total__ -= desalojada[2]
+
+    def invalidar(self, historia):
+
+        clave = id(historia)
+        with self.__bloqueo__:
+            entrada = self.__entradas__.get(clave)
+            if entrada is not None and entrada[3]() is historia:
+                self._quitar(clave)
+
+    def _quitar(self, clave: int):
+
+        entrada = self.__entradas__.pop(clave, None)
+        if entrada is not None:
+            self.__total__ -= entrada[2]
+
+    def _purgar(self):
+
+        # Una historia nueva puede reusar el id de una recolectada: solo se quitan entradas muertas
+        while self.__muertas__:
+            clave = self.__muertas__.pop()
+            entrada = self.__entradas__.get(clave)
+            if entrada is not None and entrada[3]() is None:
+                self._quitar(clave)
+
+    def limpiar(self):
+
+        with self.__bloqueo__:
+            self.__entradas__.clear()
+            self.__muertas__.clear()
+            self.__total__ = 0
+
+    def obtener_capacidad(self) -> int:
+
+        return self.__capacidad__
+
+    def obtener_total_lineas(self) -> int:
+
+        with self.__bloqueo__:
+            self._purgar()
+            return self.__total__
+
+    def __contains__(self, historia) -> bool:
+
+        with self.__bloqueo__:
+            entrada = self.__entradas__.get(id(historia))
+            return entrada is not None and entrada[3]() is historia
+
+    def __len__(self) -> int:
+
+        with self.__bloqueo__:
+            self._purgar()
+            return len(self.__entradas__)
+
+
+CACHE_HISTORIAS = CacheRenderizado()
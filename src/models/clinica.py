@@ -1,10 +1,22 @@
-from datetime import datetime
+import heapq
+from collections.abc import Mapping
+from datetime import datetime, time, timedelta
+from itertools import chain, islice, repeat
+from operator import itemgetter
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Iterator
 
 from src.models.paciente import Paciente
 from src.models.medico import Medico
-from src.models.turno import Turno
+from src.models.especialidad import Especialidad, DIAS_SEMANA, INDICE_DIAS, normalizar_texto
+from src.models.turno import Turno, DURACION_MAXIMA, DURACION_POR_DEFECTO, separar_id_turno, validar_duracion
+from src.models.indiceTurnos import IndiceTurnos
+from src.models.archivoTurnos import ArchivoTurnos
+from src.models.columnasTurnos import ColumnasTurnos
+from src.models.contadoresOcupacion import ContadoresOcupacion
 from src.models.historiaClinica import HistoriaClinica
 from src.models.receta import Receta
+from src.models.vistas import VistaEncadenada, paginar, validar_pagina
 
 from src.exceptions.error import (
     DatoInvalidoException,
@@ -13,109 +25,527 @@ from src.exceptions.error import (
     MedicoNoEncontradoException,
     PacienteNoEncontradoException,
     MedicoDuplicadoException,
-    PacienteDuplicadoException
+    PacienteDuplicadoException,
+    TurnoNoEncontradoException
 )
 
+if TYPE_CHECKING:
+    from src.persistencia.almacenamientoSQLite import AlmacenamientoSQLite
+    from src.persistencia.diario import Diario
+
+# Ventana de busqueda de turnos libres cuando no se indica otra
+HORA_APERTURA = time(8, 0)
+HORA_CIERRE = time(18, 0)
+HORIZONTE_BUSQUEDA_DIAS = 30
+
+# Error de las filas validas de un lote que no se registro por errores en otras filas
+LOTE_RECHAZADO = "Lote rechazado: no se registro por errores en otras filas"
+
+# Inicio a partir del cual un turno de la duracion maxima ya no termina en una fecha valida
+_ULTIMO_INICIO = datetime.max - timedelta(minutes=DURACION_MAXIMA)
+
 class Clinica:
     
-    def __init__(self):
+    def __init__(self, almacenamiento: "AlmacenamientoSQLite | None" = None, diario: "Diario | None" = None):
+
+        # Reproducir el diario con SQLite conectado volveria a escribir cada operacion en la base
+        if almacenamiento is not None and diario is not None:
+            raise DatoInvalidoException("La clinica usa SQLite o un diario, no ambos")
 
         self.__pacientes__: dict[str, Paciente] = {}
         self.__medicos__: dict[str, Medico] = {}
-        self.__turnos__: list[Turno] = []
+        # dict como conjunto ordenado: conserva el orden de alta y quita un turno cancelado en O(1)
+        self.__turnos__: dict[Turno, None] = {}
+        self.__indice_turnos__ = IndiceTurnos()
+        # Particion fria: turnos terminados que archivar_turnos saco de las estructuras de arriba
+        self.__archivo_turnos__ = ArchivoTurnos()
+        self.__columnas_turnos__ = ColumnasTurnos()
+        self.__contadores_ocupacion__ = ContadoresOcupacion()
         self.__historias_clinicas__: dict[str, HistoriaClinica] = {}
+        # (clave de especialidad, dia de la semana) -> matriculas, con un dict como conjunto ordenado
+        self.__medicos_por_especialidad__: dict[tuple[str, int], dict[str, None]] = {}
+
+        # Con almacenamiento, los diccionarios actuan como cache y las entidades se cargan al usarlas
+        self.__almacenamiento__ = almacenamiento
+        self.__todo_cargado__ = almacenamiento is None
+        self.__medicos_cargados__ = almacenamiento is None
+
+        # Destinos que reciben cada mutacion. El diario se agrega despues de reproducirlo
+        # para no volver a registrar las operaciones restauradas.
+        self.__destinos__: list = [almacenamiento] if almacenamiento is not None else []
+        if diario is not None:
+            diario.restaurar(self)
+            self.__destinos__.append(diario)
     
     # Registro y acceso
 
     def agregar_paciente(self, paciente: Paciente):
 
         dni = paciente.obtener_dni()
-        if dni in self.__pacientes__:
+        if self._buscar_paciente(dni) is not None:
             raise PacienteDuplicadoException(f"Ya existe un paciente con DNI {dni}")
         
         self.__pacientes__[dni] = paciente
         
         self.__historias_clinicas__[dni] = HistoriaClinica(paciente)
+
+        for destino in self.__destinos__:
+            destino.guardar_paciente(paciente)
     
     def agregar_medico(self, medico: Medico):
 
         matricula = medico.obtener_matricula()
-        if matricula in self.__medicos__:
+        if self._buscar_medico(matricula) is not None:
             raise MedicoDuplicadoException(f"Ya existe un medico con matricula {matricula}")
         
         self.__medicos__[matricula] = medico
+        medico.agregar_oyente(self._al_agregar_especialidad)
+        for especialidad in medico.vista_especialidades():
+            self._indexar_especialidad(matricula, especialidad)
+
+        for destino in self.__destinos__:
+            destino.guardar_medico(medico)
+    
+    def obtener_pacientes(self, offset: int = 0, limit: int | None = None) -> list[Paciente]:
+
+        if self.__todo_cargado__:
+            return paginar(self.__pacientes__.values(), offset, limit)
+        validar_pagina(offset, limit)
+        return [self._buscar_paciente(dni) for dni in self.__almacenamiento__.dnis(offset, limit)]
+    
+    def obtener_medicos(self, offset: int = 0, limit: int | None = None) -> list[Medico]:
+
+        if self.__todo_cargado__:
+            return paginar(self.__medicos__.values(), offset, limit)
+        validar_pagina(offset, limit)
+        return [self._buscar_medico(matricula) for matricula in self.__almacenamiento__.matriculas(offset, limit)]
+    
+    def vista_pacientes(self) -> Mapping[str, Paciente]:
+
+        self._cargar_todo()
+        return MappingProxyType(self.__pacientes__)
     
-    def obtener_pacientes(self) -> list[Paciente]:
+    def vista_medicos(self) -> Mapping[str, Medico]:
 
-        return list(self.__pacientes__.values())
+        self._cargar_todo()
+        return MappingProxyType(self.__medicos__)
     
-    def obtener_medicos(self) -> list[Medico]:
+    def obtener_paciente_por_dni(self, dni: str) -> Paciente:
 
-        return list(self.__medicos__.values())
+        self.validar_existencia_paciente(dni)
+        return self.__pacientes__[dni]
     
     def obtener_medico_por_matricula(self, matricula: str) -> Medico:
 
-        if matricula not in self.__medicos__:
-            raise MedicoNoEncontradoException(f"No se encontro medico con matricula {matricula}")
+        self.validar_existencia_medico(matricula)
         return self.__medicos__[matricula]
+
+    def agregar_especialidad(self, matricula: str, especialidad: Especialidad) -> Medico:
+
+        # Para medicos ya registrados; el oyente indexa la especialidad y la envia a los destinos
+        medico = self.obtener_medico_por_matricula(matricula)
+        medico.agregar_especialidad(especialidad)
+        return medico
     
     #Turno
 
-    def agendar_turno(self, dni: str, matricula: str, especialidad: str, fecha_hora: datetime):
+    def agendar_turno(self, dni: str, matricula: str, especialidad: str, fecha_hora: datetime,
+                      duracion: int = DURACION_POR_DEFECTO):
         self.validar_existencia_paciente(dni)
         self.validar_existencia_medico(matricula)
         self.validar_turno_no_duplicado(matricula, fecha_hora)
         
         paciente = self.__pacientes__[dni]
         medico = self.__medicos__[matricula]
-        dia_semana = self.obtener_dia_semana_en_espanol(fecha_hora)
-
-        self.validar_especialidad_en_dia(medico, especialidad, dia_semana)
-        
-        turno = Turno(paciente, medico, fecha_hora, especialidad)
-        self.__turnos__.append(turno)
+        self.validar_especialidad_en_fecha(medico, especialidad, fecha_hora)
         
-        historia_clinica = self.__historias_clinicas__[dni]
-        historia_clinica.agregar_turno(turno)
+        turno = Turno(paciente, medico, fecha_hora, especialidad, duracion)
+        self.validar_agenda_libre(medico, fecha_hora, duracion)
+        self._registrar_turno(turno)
+    
+    def cancelar_turno(self, id_turno: str) -> Turno:
+
+        turno = self._obtener_turno(*separar_id_turno(id_turno))
+        self._quitar_turno(turno)
+        return turno
+
+    def reprogramar_turno(self, id_turno: str, fecha_hora: datetime, duracion: int | None = None) -> Turno:
+
+        # Mismo paciente, medico y especialidad en otro horario. El turno original sale de la agenda
+        # mientras se valida el nuevo, para que el nuevo horario pueda pisar al que reemplaza
+        turno = self._obtener_turno(*separar_id_turno(id_turno))
+        medico = turno.obtener_medico()
+        nuevo = Turno(turno.obtener_paciente(), medico, fecha_hora, turno.obtener_especialidad(),
+                      duracion if duracion is not None else turno.obtener_duracion())
+        self.validar_especialidad_en_fecha(medico, nuevo.obtener_especialidad(), fecha_hora)
+        medico.quitar_turno(turno)
+        try:
+            if fecha_hora != turno.obtener_fecha_hora():
+                self.validar_turno_no_duplicado(medico.obtener_matricula(), fecha_hora)
+            self.validar_agenda_libre(medico, fecha_hora, nuevo.obtener_duracion())
+        finally:
+            medico.agregar_turno(turno)
+
+        self._quitar_turno(turno)
+        self._registrar_turno(nuevo)
+        return nuevo
+
+    def obtener_turno(self, id_turno: str) -> Turno:
+
+        return self._obtener_turno(*separar_id_turno(id_turno))
+
+    def agendar_turnos_lote(self, filas) -> list[dict]:
+
+        # Valida todas las filas (dni, matricula, especialidad, fecha_hora[, duracion]) en una
+        # sola pasada y solo registra los turnos si ninguna fila tiene errores. "ok" indica si la
+        # fila quedo registrada: si el lote se rechaza, las filas validas informan ese motivo.
+        errores: dict[int, str] = {}
+        validos: list[Turno] = []
+        por_medico: dict[str, list[tuple[datetime, datetime, int]]] = {}
+        cantidad = 0
+        ahora = datetime.now()
+
+        for indice, fila in enumerate(filas):
+            cantidad += 1
+            try:
+                turno = self._validar_fila_lote(fila, ahora)
+            except (DatoInvalidoException, PacienteNoEncontradoException, MedicoNoEncontradoException,
+                    MedicoNoDisponibleException, TurnoOcupadoException) as e:
+                errores[indice] = str(e)
+                continue
+            validos.append(turno)
+            por_medico.setdefault(turno.obtener_medico().obtener_matricula(), []).append(
+                (turno.obtener_fecha_hora(), turno.obtener_fin(), indice)
+            )
+
+        # Superposiciones con la agenda existente y dentro del lote, ordenando una vez por medico
+        for matricula, intervalos in por_medico.items():
+            intervalos.sort(key=itemgetter(0))
+            medico = self.__medicos__[matricula]
+            revisar_agenda = not medico.esta_libre_desde(intervalos[0][0])
+            fin_anterior = None
+            for inicio, fin, indice in intervalos:
+                if revisar_agenda and not medico.esta_libre(inicio, fin):
+                    errores[indice] = "El medico ya tiene un turno que se superpone con ese horario"
+                elif fin_anterior is not None and inicio < fin_anterior:
+                    errores[indice] = "El turno se superpone con otro turno del mismo lote"
+                else:
+                    fin_anterior = fin
+
+        if not errores:
+            self._registrar_turnos_validados(validos)
+            return [{"fila": indice, "ok": True, "error": None} for indice in range(cantidad)]
+
+        return [
+            {"fila": indice, "ok": False, "error": errores.get(indice, LOTE_RECHAZADO)}
+            for indice in range(cantidad)
+        ]
     
-    def obtener_turnos(self) -> list[Turno]:
-        return self.__turnos__.copy()
+    def obtener_turnos(self, dni: str | None = None, matricula: str | None = None, especialidad: str | None = None,
+                       desde: datetime | None = None, hasta: datetime | None = None,
+                       offset: int = 0, limit: int | None = None) -> list[Turno]:
+
+        if dni is None and matricula is None and especialidad is None and desde is None and hasta is None:
+            return self.vista_turnos().pagina(offset, limit)
+        if not self.__todo_cargado__:
+            # Los turnos de un medico se cargan completos junto con el, asi que alcanza con
+            # cargar los medicos que tienen algun turno dentro de los filtros
+            for matricula_con_turnos in self.__almacenamiento__.matriculas_con_turnos(dni, matricula, desde, hasta):
+                self._buscar_medico(matricula_con_turnos)
+        turnos = self.__indice_turnos__.buscar(dni, matricula, especialidad, desde, hasta)
+        if self.__archivo_turnos__:
+            turnos = heapq.merge(self.__archivo_turnos__.recorrer(dni, matricula, especialidad, desde, hasta), turnos,
+                                 key=Turno.obtener_fecha_hora)
+        return paginar(turnos, offset, limit)
+    
+    def recorrer_turnos(self, dni: str | None = None, matricula: str | None = None, especialidad: str | None = None,
+                        desde: datetime | None = None, hasta: datetime | None = None) -> Iterator[Turno]:
+
+        # Como obtener_turnos, ordenados por fecha, pero entregados de a uno sin copiar la lista
+        self._cargar_todo()
+        turnos = self.__indice_turnos__.recorrer(dni, matricula, especialidad, desde, hasta)
+        if not self.__archivo_turnos__:
+            return turnos
+        return heapq.merge(self.__archivo_turnos__.recorrer(dni, matricula, especialidad, desde, hasta), turnos,
+                           key=Turno.obtener_fecha_hora)
+
+    def vista_turnos(self) -> VistaEncadenada:
+
+        # Los archivados primero, leidos del archivo, y despues las claves del dict de turnos activos
+        self._cargar_todo()
+        return VistaEncadenada((self.__archivo_turnos__.__len__, self.__archivo_turnos__.recorrer),
+                               (self.__turnos__.__len__, self.__turnos__.__iter__))
+
+    def obtener_columnas_turnos(self) -> ColumnasTurnos:
+
+        # Copia columnar de todos los turnos para analitica (utilizacion, conteos y tendencias)
+        self._cargar_todo()
+        return self.__columnas_turnos__
+
+    def obtener_contadores_ocupacion(self) -> ContadoresOcupacion:
+
+        # Totales por dia, hora, medico y especialidad que se mantienen al agendar, para tableros
+        self._cargar_todo()
+        return self.__contadores_ocupacion__
+
+    def verificar_contadores_ocupacion(self) -> list[str]:
+
+        # Compara los contadores con un recalculo sobre todos los turnos; vacia si coinciden
+        self._cargar_todo()
+        return self.__contadores_ocupacion__.verificar(chain(self.__archivo_turnos__.recorrer(), self.__turnos__))
+
+    def archivar_turnos(self, corte: datetime | None = None) -> int:
+
+        # Mueve los turnos que terminan a mas tardar en corte (por defecto ahora) a un segmento
+        # compacto del archivo. Como no se agendan turnos en el pasado, las validaciones al agendar
+        # solo miran los turnos activos. Las columnas y los contadores conservan todos los turnos.
+        # Con almacenamiento solo se archivan los medicos ya cargados; los demas se archivan en una
+        # pasada posterior a su carga. El archivo vive solo en memoria: al reiniciar, los turnos
+        # archivados vuelven a cargarse como activos hasta el proximo archivado
+        ahora = datetime.now()
+        corte = corte if corte is not None else ahora
+        if corte > ahora:
+            raise DatoInvalidoException("Solo se pueden archivar turnos ya terminados")
+
+        archivados: list[Turno] = []
+        for medico in self.__medicos__.values():
+            archivados.extend(medico.archivar_turnos(corte))
+        if not archivados:
+            return 0
+        self.__archivo_turnos__.agregar(archivados)
+
+        por_paciente: dict[str, list[Turno]] = {}
+        for turno in archivados:
+            del self.__turnos__[turno]
+            self.__indice_turnos__.quitar(turno)
+            por_paciente.setdefault(turno.obtener_paciente().obtener_dni(), []).append(turno)
+        for dni, turnos in por_paciente.items():
+            # Una historia que todavia no se cargo cuenta sus archivados al cargarse
+            historia = self.__historias_clinicas__.get(dni)
+            if historia is not None:
+                historia.archivar_turnos(turnos, self.__archivo_turnos__)
+        return len(archivados)
+
+    def obtener_archivo_turnos(self) -> ArchivoTurnos:
+
+        return self.__archivo_turnos__
+
+    def obtener_turnos_medico_entre(self, matricula: str, desde: datetime, hasta: datetime) -> list[Turno]:
+
+        self.validar_existencia_medico(matricula)
+        turnos = self.__medicos__[matricula].obtener_turnos_entre(desde, hasta)
+        if not self.__archivo_turnos__:
+            return turnos
+        return self.__archivo_turnos__.entre(matricula, desde, hasta) + turnos
+
+    def buscar_turnos_disponibles(self, especialidad: str, cantidad: int = 1, desde: datetime | None = None,
+                                  duracion: int = DURACION_POR_DEFECTO,
+                                  hora_inicio: time = HORA_APERTURA, hora_fin: time = HORA_CIERRE,
+                                  horizonte_dias: int = HORIZONTE_BUSQUEDA_DIAS) -> list[tuple[datetime, str]]:
+
+        if cantidad <= 0:
+            raise DatoInvalidoException("La cantidad de turnos a buscar debe ser positiva")
+        validar_duracion(duracion)
+        if hora_inicio >= hora_fin:
+            raise DatoInvalidoException("La hora de inicio debe ser anterior a la hora de fin")
+        if horizonte_dias <= 0:
+            raise DatoInvalidoException("El horizonte de busqueda debe ser positivo")
+
+        desde = desde if desde is not None else datetime.now()
+        paso = timedelta(minutes=duracion)
+
+        # Cada medico aporta un generador ordenado de (inicio, matricula); el merge sobre un heap
+        # solo avanza los generadores necesarios para obtener los primeros cantidad horarios
+        medicos = self._medicos_con_especialidad(especialidad, range(len(DIAS_SEMANA)))
+        return self._horarios_libres(medicos, especialidad, cantidad, desde, paso, hora_inicio, hora_fin,
+                                     horizonte_dias)
+
+    def _horarios_libres(self, medicos: dict[str, Medico], especialidad: str, cantidad: int, desde: datetime,
+                         paso: timedelta, hora_inicio: time, hora_fin: time,
+                         horizonte_dias: int) -> list[tuple[datetime, str]]:
+
+        generadores = [
+            zip(medico.horarios_libres(especialidad, desde, paso, hora_inicio, hora_fin, horizonte_dias),
+                repeat(matricula))
+            for matricula, medico in medicos.items()
+        ]
+        return list(islice(heapq.merge(*generadores), cantidad))
+
+    def obtener_medicos_por_especialidad(self, especialidad: str, dia_semana: str | None = None) -> list[Medico]:
+
+        if dia_semana is None:
+            return list(self._medicos_con_especialidad(especialidad, range(len(DIAS_SEMANA))).values())
+        indice = INDICE_DIAS.get(normalizar_texto(dia_semana))
+        if indice is None:
+            raise DatoInvalidoException(f"Dia de la semana invalido: {dia_semana}")
+        return list(self._medicos_con_especialidad(especialidad, (indice,)).values())
+
+    def _medicos_con_especialidad(self, especialidad: str, dias) -> dict[str, Medico]:
+
+        # Une las entradas del indice invertido de los dias pedidos sin repetir matriculas
+        self._cargar_medicos()
+        clave = normalizar_texto(especialidad)
+        resultado: dict[str, Medico] = {}
+        for dia in dias:
+            for matricula in self.__medicos_por_especialidad__.get((clave, dia), ()):
+                if matricula not in resultado:
+                    resultado[matricula] = self.__medicos__[matricula]
+        return resultado
+
+    def _indexar_especialidad(self, matricula: str, especialidad: Especialidad):
+
+        clave = especialidad.obtener_clave()
+        mascara = especialidad.obtener_mascara()
+        for dia in range(len(DIAS_SEMANA)):
+            if mascara >> dia & 1:
+                self.__medicos_por_especialidad__.setdefault((clave, dia), {})[matricula] = None
+
+    def _validar_fila_lote(self, fila, ahora: datetime) -> Turno:
+
+        # Las validaciones de Turno.__init__ con la hora tomada una vez por lote. Duplicados y
+        # superposiciones se revisan despues sobre todo el lote, ordenado por medico
+        try:
+            dni, matricula, especialidad, fecha_hora, *resto = fila
+        except (TypeError, ValueError):
+            raise DatoInvalidoException("Cada fila debe tener dni, matricula, especialidad y fecha_hora")
+        duracion = resto[0] if resto else DURACION_POR_DEFECTO
+
+        paciente = self._buscar_paciente(dni)
+        if paciente is None:
+            raise PacienteNoEncontradoException(f"No se encontro paciente con DNI {dni}")
+        medico = self._buscar_medico(matricula)
+        if medico is None:
+            raise MedicoNoEncontradoException(f"No se encontro medico con matricula {matricula}")
+        if not isinstance(fecha_hora, datetime):
+            raise DatoInvalidoException("Debe proporcionar una fecha y hora valida")
+        if fecha_hora < ahora:
+            raise DatoInvalidoException("La fecha y hora del turno debe ser a futuro")
+        if not isinstance(especialidad, str) or not especialidad.strip():
+            raise DatoInvalidoException("Debe especificar una especialidad")
+        validar_duracion(duracion)
+        if fecha_hora > _ULTIMO_INICIO and fecha_hora > datetime.max - timedelta(minutes=duracion):
+            raise DatoInvalidoException("El turno debe terminar en una fecha valida")
+
+        self.validar_especialidad_en_fecha(medico, especialidad, fecha_hora)
+
+        return Turno.restaurar(paciente, medico, fecha_hora, especialidad.strip(), duracion)
+
+    def _registrar_turno(self, turno: Turno):
+
+        self._indexar_turno(turno)
+        self._obtener_historia(turno.obtener_paciente().obtener_dni()).agregar_turno(turno)
+        for destino in self.__destinos__:
+            destino.guardar_turno(turno)
+
+    def _indexar_turno(self, turno: Turno):
+
+        # Los turnos restaurados no pasan por Turno.__init__; se valida lo que las columnas no aceptan
+        # antes de tocar ninguna estructura. La agenda rechaza superposiciones sin modificarse
+        validar_duracion(turno.obtener_duracion())
+        turno.obtener_medico().agregar_turno(turno)
+        self._indexar_en_compartidas(turno)
+
+    def _indexar_en_compartidas(self, turno: Turno):
+
+        # Estructuras de todos los medicos; la agenda de cada medico se actualiza aparte
+        self.__turnos__[turno] = None
+        self.__indice_turnos__.agregar(turno)
+        self.__columnas_turnos__.agregar(turno)
+        self.__contadores_ocupacion__.agregar(turno)
+
+    def _obtener_turno(self, matricula: str, fecha_hora: datetime) -> Turno:
+
+        # Solo turnos activos: los archivados ya terminaron y no se cancelan ni se mueven
+        turno = self.__indice_turnos__.obtener(matricula, fecha_hora) if self._buscar_medico(matricula) else None
+        if turno is None:
+            raise TurnoNoEncontradoException(f"No se encontro el turno del medico {matricula} el {fecha_hora}")
+        return turno
+
+    def _quitar_turno(self, turno: Turno):
+
+        self._desindexar_turno(turno)
+        historia = self.__historias_clinicas__.get(turno.obtener_paciente().obtener_dni())
+        if historia is not None:
+            historia.quitar_turno(turno)
+        for destino in self.__destinos__:
+            destino.guardar_cancelacion(turno)
+
+    def _desindexar_turno(self, turno: Turno):
+
+        turno.obtener_medico().quitar_turno(turno)
+        self._desindexar_de_compartidas(turno)
+
+    def _desindexar_de_compartidas(self, turno: Turno):
+
+        del self.__turnos__[turno]
+        self.__indice_turnos__.quitar(turno)
+        self.__columnas_turnos__.quitar(turno)
+        self.__contadores_ocupacion__.quitar(turno)
+
+    def _registrar_turnos_lote(self, turnos: list[Turno]):
+
+        for turno in turnos:
+            validar_duracion(turno.obtener_duracion())
+        self._registrar_turnos_validados(turnos)
+
+    def _registrar_turnos_validados(self, turnos: list[Turno]):
+
+        # Las estructuras compartidas se llenan de a un lote; solo las historias y los destinos
+        # reciben los turnos de a uno
+        por_medico: dict[str, list[Turno]] = {}
+        for turno in turnos:
+            por_medico.setdefault(turno.obtener_medico().obtener_matricula(), []).append(turno)
+            self._obtener_historia(turno.obtener_paciente().obtener_dni()).agregar_turno(turno)
+            for destino in self.__destinos__:
+                destino.guardar_turno(turno)
+        self.__indice_turnos__.agregar_lote(turnos)
+        self.__columnas_turnos__.agregar_lote(turnos)
+        self.__contadores_ocupacion__.agregar_lote(turnos)
+        for turnos_medico in por_medico.values():
+            turnos_medico.sort(key=Turno.obtener_fecha_hora)
+            turnos_medico[0].obtener_medico().agregar_turnos_ordenados(turnos_medico)
+        self.__turnos__.update(dict.fromkeys(turnos))
 
     #Validar y utilidades
 
     def validar_turno_no_duplicado(self, matricula: str, fecha_hora: datetime):
 
-        for turno in self.__turnos__:
-            if (turno.obtener_medico().obtener_matricula() == matricula and 
-                turno.obtener_fecha_hora() == fecha_hora):
-                raise TurnoOcupadoException(f"El medico ya tiene un turno agendado en esa fecha y hora")
+        if self.__indice_turnos__.contiene(matricula, fecha_hora):
+            raise TurnoOcupadoException(f"El medico ya tiene un turno agendado en esa fecha y hora")
+    
+    def validar_agenda_libre(self, medico: Medico, fecha_hora: datetime, duracion: int):
+
+        if not medico.esta_libre(fecha_hora, fecha_hora + timedelta(minutes=duracion)):
+            raise TurnoOcupadoException("El medico ya tiene un turno que se superpone con ese horario")
     
     def validar_existencia_paciente(self, dni: str):
 
-        if dni not in self.__pacientes__:
+        if self._buscar_paciente(dni) is None:
             raise PacienteNoEncontradoException(f"No se encontro paciente con DNI {dni}")
     
     def validar_existencia_medico(self, matricula: str):
 
-        if matricula not in self.__medicos__:
+        if self._buscar_medico(matricula) is None:
             raise MedicoNoEncontradoException(f"No se encontro medico con matricula {matricula}")
     
     def validar_especialidad_en_dia(self, medico: Medico, especialidad_solicitada: str, dia_semana: str):
 
-        especialidades = medico.obtener_especialidades()
-        for especialidad in especialidades:
-            if (especialidad.obtener_especialidad().lower() == especialidad_solicitada.lower() and
-                especialidad.verificar_dia(dia_semana)):
-                return
-        
-        raise MedicoNoDisponibleException(
-            f"El medico no atiende {especialidad_solicitada} el dia {dia_semana}"
-        )
+        indice = INDICE_DIAS.get(normalizar_texto(dia_semana))
+        if indice is None or not medico.atiende(especialidad_solicitada, indice):
+            raise MedicoNoDisponibleException(
+                f"El medico no atiende {especialidad_solicitada} el dia {dia_semana}"
+            )
+    
+    def validar_especialidad_en_fecha(self, medico: Medico, especialidad_solicitada: str, fecha_hora: datetime):
+
+        if not medico.atiende(especialidad_solicitada, fecha_hora.weekday()):
+            raise MedicoNoDisponibleException(
+                f"El medico no atiende {especialidad_solicitada} el dia {DIAS_SEMANA[fecha_hora.weekday()]}"
+            )
     
     def obtener_dia_semana_en_espanol(self, fecha_hora: datetime) -> str:
-        dias = ['lunes', 'martes', 'miercoles', 'jueves', 'viernes', 'sabado', 'domingo']
 
-        return dias[fecha_hora.weekday()]
+        return DIAS_SEMANA[fecha_hora.weekday()]
     
     def obtener_especialidad_disponible(self, medico: Medico, dia_semana: str) -> str:
 
@@ -134,13 +564,130 @@ class Clinica:
         medico = self.__medicos__[matricula]
         
         receta = Receta(paciente, medico, medicamentos)
-        
-        historia_clinica = self.__historias_clinicas__[dni]
-        historia_clinica.agregar_receta(receta)
+        self._registrar_receta(receta)
+
+    def _registrar_receta(self, receta: Receta):
+
+        self._obtener_historia(receta.obtener_paciente().obtener_dni()).agregar_receta(receta)
+        for destino in self.__destinos__:
+            destino.guardar_receta(receta)
+
+    def recorrer_recetas(self, dni: str | None = None, matricula: str | None = None,
+                         desde: datetime | None = None, hasta: datetime | None = None) -> Iterator[Receta]:
+
+        # Recetas de cada historia en orden de emision, paciente por paciente
+        self._cargar_todo()
+        if dni is not None:
+            historia = self.__historias_clinicas__.get(dni)
+            historias = [historia] if historia is not None else []
+        else:
+            historias = list(self.__historias_clinicas__.values())
+        return (
+            receta for historia in historias for receta in historia.vista_recetas()
+            if (matricula is None or receta.obtener_medico().obtener_matricula() == matricula)
+            and (desde is None or receta.obtener_fecha() >= desde)
+            and (hasta is None or receta.obtener_fecha() < hasta)
+        )
 
     def obtener_historia_clinica(self, dni: str) -> HistoriaClinica:
 
         self.validar_existencia_paciente(dni)
-        return self.__historias_clinicas__[dni]
+        return self._obtener_historia(dni)
+
+    #Almacenamiento y carga diferida
+
+    def confirmar(self):
+
+        for destino in self.__destinos__:
+            destino.confirmar()
+
+    def _al_agregar_especialidad(self, medico: Medico, especialidad: Especialidad):
+
+        self._indexar_especialidad(medico.obtener_matricula(), especialidad)
+        for destino in self.__destinos__:
+            destino.guardar_especialidad(medico, especialidad)
+
+    def _buscar_paciente(self, dni: str) -> Paciente | None:
+
+        paciente = self.__pacientes__.get(dni)
+        if paciente is not None or self.__todo_cargado__:
+            return paciente
+
+        fila = self.__almacenamiento__.cargar_paciente(dni)
+        if fila is None:
+            return None
+        paciente = self.__pacientes__[dni] = Paciente(*fila)
+        return paciente
+
+    def _buscar_medico(self, matricula: str) -> Medico | None:
+
+        medico = self.__medicos__.get(matricula)
+        if medico is not None or self.__todo_cargado__:
+            return medico
+
+        fila = self.__almacenamiento__.cargar_medico(matricula)
+        if fila is None:
+            return None
+        nombre, matricula, especialidades = fila
+        medico = Medico(nombre, matricula)
+        for tipo, dias in especialidades:
+            medico.agregar_especialidad(Especialidad(tipo, dias))
+        self.__medicos__[matricula] = medico
+        medico.agregar_oyente(self._al_agregar_especialidad)
+        for especialidad in medico.vista_especialidades():
+            self._indexar_especialidad(matricula, especialidad)
+
+        # La agenda del medico se carga completa para poder validar superposiciones
+        for dni, _, especialidad, fecha_hora, duracion in self.__almacenamiento__.turnos_de_medico(matricula):
+            turno = Turno.restaurar(self._buscar_paciente(dni), medico, fecha_hora, especialidad, duracion)
+            self._indexar_turno(turno)
+            historia = self.__historias_clinicas__.get(dni)
+            if historia is not None:
+                historia.agregar_turno(turno)
+        return medico
+
+    def _obtener_historia(self, dni: str) -> HistoriaClinica:
+
+        historia = self.__historias_clinicas__.get(dni)
+        if historia is not None:
+            return historia
+
+        # Se arma antes de publicarla para que la carga de los medicos no le agregue turnos repetidos
+        historia = HistoriaClinica(self.__pacientes__[dni])
+        archivados = 0
+        for _, matricula, _, fecha_hora, _ in self.__almacenamiento__.turnos_de_paciente(dni):
+            self._buscar_medico(matricula)
+            turno = self.__indice_turnos__.obtener(matricula, fecha_hora)
+            if turno is None:
+                # Ya paso al archivo junto con la agenda de su medico
+                archivados += 1
+            else:
+                historia.agregar_turno(turno)
+        if archivados:
+            historia.agregar_archivados(archivados, self.__archivo_turnos__)
+        for _, matricula, medicamentos, fecha in self.__almacenamiento__.recetas_de_paciente(dni):
+            historia.agregar_receta(
+                Receta.restaurar(self.__pacientes__[dni], self._buscar_medico(matricula), medicamentos, fecha)
+            )
+        self.__historias_clinicas__[dni] = historia
+        return historia
+
+    def _cargar_medicos(self):
+
+        if self.__medicos_cargados__:
+            return
+        for matricula in self.__almacenamiento__.matriculas():
+            self._buscar_medico(matricula)
+        self.__medicos_cargados__ = True
+
+    def _cargar_todo(self):
+
+        if self.__todo_cargado__:
+            return
+        self._cargar_medicos()
+        for dni in self.__almacenamiento__.dnis():
+            self._buscar_paciente(dni)
+            self._obtener_historia(dni)
+        self.__todo_cargado__ = True
 
     
\ No newline at end of file
@@ -0,0 +1,320 @@
+import threading
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, time, timedelta
+from types import MappingProxyType
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Iterator
+
+from src.models.clinica import Clinica
+from src.models.paciente import Paciente
+from src.models.medico import Medico
+from src.models.especialidad import Especialidad
+from src.models.historiaClinica import HistoriaClinica
+from src.models.turno import Turno, DURACION_POR_DEFECTO, separar_id_turno
+from src.models.columnasTurnos import ColumnasTurnos
+from src.models.contadoresOcupacion import ContadoresOcupacion
+from src.models.receta import Receta
+from src.models.vistas import VistaSecuencia
+from src.exceptions.error import DatoInvalidoException
+
+if TYPE_CHECKING:
+    from src.persistencia.almacenamientoSQLite import AlmacenamientoSQLite
+    from src.persistencia.diario import Diario
+
+# Candados por tipo de clave; mas franjas reducen las colisiones entre claves no relacionadas
+FRANJAS_POR_DEFECTO = 64
+
+
+class _Sincronizado:
+
+    # Envuelve un objeto para que cada llamada a sus metodos corra bajo un candado. Se usa con los
+    # destinos, que acumulan filas pendientes en listas compartidas, y con las estructuras que la
+    # clinica entrega para leer mientras otros hilos agendan
+
+    __slots__ = ('__destino__', '__bloqueo__')
+
+    def __init__(self, destino, bloqueo):
+
+        self.__destino__ = destino
+        self.__bloqueo__ = bloqueo
+
+    def __getattr__(self, nombre: str):
+
+        metodo = getattr(self.__destino__, nombre)
+        if not callable(metodo):
+            return metodo
+
+        def sincronizado(*args, **kwargs):
+            with self.__bloqueo__:
+                return metodo(*args, **kwargs)
+        return sincronizado
+
+    def __len__(self) -> int:
+
+        with self.__bloqueo__:
+            return len(self.__destino__)
+
+
+class _HistoriaSincronizada(_Sincronizado):
+
+    # Historia bajo el candado de franja de su paciente. Las vistas y el renderizado se entregan
+    # copiados, porque recorrerlos despues de soltar el candado ya no estaria protegido
+
+    __slots__ = ()
+
+    def vista_turnos(self) -> VistaSecuencia:
+
+        with self.__bloqueo__:
+            return VistaSecuencia(list(self.__destino__.vista_turnos()))
+
+    def vista_recetas(self) -> VistaSecuencia:
+
+        with self.__bloqueo__:
+            return VistaSecuencia(list(self.__destino__.vista_recetas()))
+
+    def renderizar(self, *args, **kwargs) -> Iterator[str]:
+
+        with self.__bloqueo__:
+            return iter(list(self.__destino__.renderizar(*args, **kwargs)))
+
+    def __str__(self) -> str:
+
+        with self.__bloqueo__:
+            return str(self.__destino__)
+
+
+class ClinicaConcurrente(Clinica):
+
+    # Clinica segura entre hilos. Cada operacion toma a lo sumo un candado de franja de medicos y
+    # luego uno de franja de pacientes, siempre en ese orden, asi que reservas de medicos y
+    # pacientes distintos no se esperan entre si. El chequeo de turno duplicado o superpuesto y el
+    # registro ocurren bajo el candado del medico, sin ventana entre validar y agregar; la agenda
+    # del medico se modifica solo bajo ese candado.
+    # Las estructuras compartidas por todos (lista e indice de turnos, columnas, contadores, indice
+    # de especialidades, pacientes y medicos registrados, carga diferida) usan un candado global que
+    # se toma solo por tramos cortos y siempre al final. Las lecturas toman el mismo candado que las
+    # escrituras y devuelven copias o envoltorios sincronizados, nunca la estructura compartida.
+
+    def __init__(self, almacenamiento: "AlmacenamientoSQLite | None" = None, diario: "Diario | None" = None,
+                 franjas: int = FRANJAS_POR_DEFECTO):
+
+        if isinstance(franjas, bool) or not isinstance(franjas, int) or franjas <= 0:
+            raise DatoInvalidoException("La cantidad de franjas debe ser un entero positivo")
+
+        self.__franjas_medicos__ = [threading.Lock() for _ in range(franjas)]
+        self.__franjas_pacientes__ = [threading.Lock() for _ in range(franjas)]
+        self.__bloqueo_global__ = threading.RLock()
+        super().__init__(almacenamiento, diario)
+
+        bloqueo_destinos = threading.Lock()
+        self.__destinos__ = [_Sincronizado(destino, bloqueo_destinos) for destino in self.__destinos__]
+
+    def _franja_medico(self, matricula: str) -> threading.Lock:
+
+        return self.__franjas_medicos__[hash(matricula) % len(self.__franjas_medicos__)]
+
+    def _franja_paciente(self, dni: str) -> threading.Lock:
+
+        return self.__franjas_pacientes__[hash(dni) % len(self.__franjas_pacientes__)]
+
+    @contextmanager
+    def _bloquear_todo(self) -> Iterator[None]:
+
+        # Respeta el mismo orden que las operaciones individuales: medicos, pacientes y global
+        with ExitStack() as pila:
+            for bloqueo in self.__franjas_medicos__ + self.__franjas_pacientes__:
+                pila.enter_context(bloqueo)
+            pila.enter_context(self.__bloqueo_global__)
+            yield
+
+    #Operaciones publicas
+
+    def agregar_paciente(self, paciente: Paciente):
+
+        with self._franja_paciente(paciente.obtener_dni()), self.__bloqueo_global__:
+            super().agregar_paciente(paciente)
+
+    def agregar_medico(self, medico: Medico):
+
+        with self._franja_medico(medico.obtener_matricula()), self.__bloqueo_global__:
+            super().agregar_medico(medico)
+
+    def obtener_pacientes(self, offset: int = 0, limit: int | None = None) -> list[Paciente]:
+
+        with self.__bloqueo_global__:
+            return super().obtener_pacientes(offset, limit)
+
+    def obtener_medicos(self, offset: int = 0, limit: int | None = None) -> list[Medico]:
+
+        with self.__bloqueo_global__:
+            return super().obtener_medicos(offset, limit)
+
+    def vista_pacientes(self) -> Mapping[str, Paciente]:
+
+        with self.__bloqueo_global__:
+            return MappingProxyType(dict(super().vista_pacientes()))
+
+    def vista_medicos(self) -> Mapping[str, Medico]:
+
+        with self.__bloqueo_global__:
+            return MappingProxyType(dict(super().vista_medicos()))
+
+    def agregar_especialidad(self, matricula: str, especialidad: Especialidad) -> Medico:
+
+        # Las especialidades del medico se leen al validar sus reservas, bajo este mismo candado
+        with self._franja_medico(matricula):
+            return super().agregar_especialidad(matricula, especialidad)
+
+    def agendar_turno(self, dni: str, matricula: str, especialidad: str, fecha_hora: datetime,
+                      duracion: int = DURACION_POR_DEFECTO):
+
+        with self._franja_medico(matricula), self._franja_paciente(dni):
+            super().agendar_turno(dni, matricula, especialidad, fecha_hora, duracion)
+
+    def cancelar_turno(self, id_turno: str) -> Turno:
+
+        # El paciente se conoce recien al encontrar el turno, ya bajo el candado del medico
+        matricula, fecha_hora = separar_id_turno(id_turno)
+        with self._franja_medico(matricula):
+            dni = self._obtener_turno(matricula, fecha_hora).obtener_paciente().obtener_dni()
+            with self._franja_paciente(dni):
+                return super().cancelar_turno(id_turno)
+
+    def reprogramar_turno(self, id_turno: str, fecha_hora: datetime, duracion: int | None = None) -> Turno:
+
+        matricula, original = separar_id_turno(id_turno)
+        with self._franja_medico(matricula):
+            dni = self._obtener_turno(matricula, original).obtener_paciente().obtener_dni()
+            with self._franja_paciente(dni):
+                return super().reprogramar_turno(id_turno, fecha_hora, duracion)
+
+    def agendar_turnos_lote(self, filas) -> list[dict]:
+
+        with self._bloquear_todo():
+            return super().agendar_turnos_lote(filas)
+
+    def obtener_turnos(self, *args, **kwargs) -> list[Turno]:
+
+        with self.__bloqueo_global__:
+            return super().obtener_turnos(*args, **kwargs)
+
+    def recorrer_turnos(self, *args, **kwargs) -> Iterator[Turno]:
+
+        with self.__bloqueo_global__:
+            return iter(list(super().recorrer_turnos(*args, **kwargs)))
+
+    def vista_turnos(self) -> VistaSecuencia:
+
+        with self.__bloqueo_global__:
+            return VistaSecuencia(list(super().vista_turnos()))
+
+    def obtener_columnas_turnos(self) -> ColumnasTurnos:
+
+        with self.__bloqueo_global__:
+            return _Sincronizado(super().obtener_columnas_turnos(), self.__bloqueo_global__)
+
+    def obtener_contadores_ocupacion(self) -> ContadoresOcupacion:
+
+        with self.__bloqueo_global__:
+            return _Sincronizado(super().obtener_contadores_ocupacion(), self.__bloqueo_global__)
+
+    def obtener_turnos_medico_entre(self, matricula: str, desde: datetime, hasta: datetime) -> list[Turno]:
+
+        with self._franja_medico(matricula):
+            return super().obtener_turnos_medico_entre(matricula, desde, hasta)
+
+    def archivar_turnos(self, corte: datetime | None = None) -> int:
+
+        # Reemplaza el indice y recorta las agendas de todos los medicos
+        with self._bloquear_todo():
+            return super().archivar_turnos(corte)
+
+    def verificar_contadores_ocupacion(self) -> list[str]:
+
+        with self.__bloqueo_global__:
+            return super().verificar_contadores_ocupacion()
+
+    def emitir_receta(self, dni: str, matricula: str, medicamentos: list[str]):
+
+        with self._franja_paciente(dni):
+            super().emitir_receta(dni, matricula, medicamentos)
+
+    def recorrer_recetas(self, *args, **kwargs) -> Iterator[Receta]:
+
+        with self.__bloqueo_global__:
+            return iter(list(super().recorrer_recetas(*args, **kwargs)))
+
+    def obtener_historia_clinica(self, dni: str) -> HistoriaClinica:
+
+        bloqueo = self._franja_paciente(dni)
+        with bloqueo:
+            return _HistoriaSincronizada(super().obtener_historia_clinica(dni), bloqueo)
+
+    #Estructuras compartidas
+
+    def _indexar_en_compartidas(self, turno: Turno):
+
+        with self.__bloqueo_global__:
+            super()._indexar_en_compartidas(turno)
+
+    def _desindexar_de_compartidas(self, turno: Turno):
+
+        with self.__bloqueo_global__:
+            super()._desindexar_de_compartidas(turno)
+
+    def _horarios_libres(self, medicos: dict[str, Medico], especialidad: str, cantidad: int, desde: datetime,
+                         paso: timedelta, hora_inicio: time, hora_fin: time,
+                         horizonte_dias: int) -> list[tuple[datetime, str]]:
+
+        # Recorre las agendas de los candidatos bajo sus franjas, sin repetir y en el orden de
+        # _bloquear_todo para no cruzarse con el
+        franjas = self.__franjas_medicos__
+        with ExitStack() as pila:
+            for posicion in sorted({hash(matricula) % len(franjas) for matricula in medicos}):
+                pila.enter_context(franjas[posicion])
+            return super()._horarios_libres(medicos, especialidad, cantidad, desde, paso, hora_inicio, hora_fin,
+                                            horizonte_dias)
+
+    def _indexar_especialidad(self, matricula: str, especialidad: Especialidad):
+
+        with self.__bloqueo_global__:
+            super()._indexar_especialidad(matricula, especialidad)
+
+    def _medicos_con_especialidad(self, especialidad: str, dias) -> dict[str, Medico]:
+
+        with self.__bloqueo_global__:
+            return super()._medicos_con_especialidad(especialidad, dias)
+
+    def _buscar_paciente(self, dni: str) -> Paciente | None:
+
+        if self.__todo_cargado__:
+            return self.__pacientes__.get(dni)
+        with self.__bloqueo_global__:
+            return super()._buscar_paciente(dni)
+
+    def _buscar_medico(self, matricula: str) -> Medico | None:
+
+        # Con almacenamiento la hidratacion publica al medico antes de cargar su agenda, asi que
+        # la consulta completa queda bajo el candado global
+        if self.__todo_cargado__:
+            return self.__medicos__.get(matricula)
+        with self.__bloqueo_global__:
+            return super()._buscar_medico(matricula)
+
+    def _obtener_historia(self, dni: str) -> HistoriaClinica:
+
+        historia = self.__historias_clinicas__.get(dni)
+        if historia is not None:
+            return historia
+        with self.__bloqueo_global__:
+            return super()._obtener_historia(dni)
+
+    def _cargar_medicos(self):
+
+        with self.__bloqueo_global__:
+            super()._cargar_medicos()
+
+    def _cargar_todo(self):
+
+        with self.__bloqueo_global__:
+            super()._cargar_todo()
@@ -0,0 +1,310 @@
+from array import array
+from collections import Counter
+from datetime import datetime
+from itertools import compress
+from operator import and_
+from typing import Iterable
+
+from src.models.especialidad import DIAS_SEMANA, normalizar_texto
+from src.models.turno import DURACION_MAXIMA, Turno
+
+HORAS_SEMANA = 7 * 24
+_DIA_Y_HORA = [(DIAS_SEMANA[hora_semana // 24], hora_semana % 24) for hora_semana in range(HORAS_SEMANA)]
+
+# Filas borradas a partir de las cuales se compactan las columnas, si ademas son la mitad del total
+COMPACTAR_DESDE = 1024
+
+# Minuto 0 de las columnas de tiempo
+EPOCA = datetime(1970, 1, 1)
+_MINUTOS_EPOCA = EPOCA.toordinal() * 1440
+
+
+def minuto_epoca(fecha_hora: datetime) -> int:
+
+    return fecha_hora.toordinal() * 1440 + fecha_hora.hour * 60 + fecha_hora.minute - _MINUTOS_EPOCA
+
+
+class ColumnasTurnos:
+
+    # Copia columnar de los turnos: una columna array por atributo y un id entero por matricula, DNI y
+    # especialidad. Las consultas filtran con compress o con las filas de cada medico y agrupan con
+    # Counter sobre una columna, de modo que el recorrido por fila corre en C y no toca ningun Turno.
+    # Las columnas derivadas (hora de la semana, ocupacion y mes) se calculan una sola vez al
+    # agregar, asi cada agrupacion cuenta enteros en lugar de armar tuplas. Quitar un turno marca su
+    # fila como borrada en __vivas__ (que las consultas filtran) y al acumular muchas se compacta.
+
+    __slots__ = ('__minutos__', '__horas_semana__', '__ocupaciones__', '__meses__', '__medicos__',
+                 '__pacientes__', '__especialidades__', '__duraciones__', '__filas_por_medico__',
+                 '__filas_por_especialidad__', '__vivas__', '__borradas__', '__filas_por_clave__',
+                 '__ids_medicos__', '__ids_pacientes__', '__ids_especialidades__', '__ids_por_nombre__', '__matriculas__', '__dnis__',
+                 '__nombres_especialidades__')
+
+    def __init__(self):
+
+        self.__minutos__ = array('q')
+        self.__horas_semana__ = array('B')
+        # Medico, hora de inicio, minuto dentro de esa hora y duracion en un solo entero (ver utilizacion_semanal)
+        self.__ocupaciones__ = array('q')
+        self.__meses__ = array('H')
+        self.__medicos__ = array('I')
+        self.__pacientes__ = array('I')
+        self.__especialidades__ = array('H')
+        self.__duraciones__ = array('H')
+        self.__filas_por_medico__: dict[int, array] = {}
+        self.__filas_por_especialidad__: dict[int, array] = {}
+        # 1 por fila vigente y 0 por fila quitada; (minuto, id de medico) -> fila vigente
+        self.__vivas__ = bytearray()
+        self.__borradas__ = 0
+        self.__filas_por_clave__: dict[int, int] = {}
+
+        self.__ids_medicos__: dict[str, int] = {}
+        self.__ids_pacientes__: dict[str, int] = {}
+        self.__ids_especialidades__: dict[str, int] = {}
+        # Nombre tal como llega -> id, para no normalizar el texto en cada turno
+        self.__ids_por_nombre__: dict[str, int] = {}
+        self.__matriculas__: list[str] = []
+        self.__dnis__: list[str] = []
+        self.__nombres_especialidades__: list[str] = []
+
+    def agregar(self, turno: Turno):
+
+        self.agregar_fila(turno.obtener_paciente().obtener_dni(), turno.obtener_medico().obtener_matricula(),
+                          turno.obtener_especialidad(), turno.obtener_fecha_hora(), turno.obtener_duracion())
+
+    def agregar_fila(self, dni: str, matricula: str, especialidad: str, fecha_hora: datetime, duracion: int):
+
+        medico = self.__ids_medicos__.get(matricula)
+        if medico is None:
+            medico = self._id(self.__ids_medicos__, self.__matriculas__, matricula, matricula)
+        paciente = self.__ids_pacientes__.get(dni)
+        if paciente is None:
+            paciente = self._id(self.__ids_pacientes__, self.__dnis__, dni, dni)
+        id_especialidad = self.__ids_por_nombre__.get(especialidad)
+        if id_especialidad is None:
+            id_especialidad = self.__ids_por_nombre__[especialidad] = self._id(
+                self.__ids_especialidades__, self.__nombres_especialidades__, normalizar_texto(especialidad),
+                especialidad)
+        hora_semana = fecha_hora.weekday() * 24 + fecha_hora.hour
+        minuto = minuto_epoca(fecha_hora)
+        fila = len(self.__medicos__)
+
+        self.__medicos__.append(medico)
+        self.__pacientes__.append(paciente)
+        self.__especialidades__.append(id_especialidad)
+        self.__duraciones__.append(duracion)
+        self.__horas_semana__.append(hora_semana)
+        self.__ocupaciones__.append(((medico * HORAS_SEMANA + hora_semana) * 60 + fecha_hora.minute)
+                                    * (DURACION_MAXIMA + 1) + duracion)
+        self.__meses__.append((fecha_hora.year - EPOCA.year) * 12 + fecha_hora.month - 1)
+        self.__minutos__.append(minuto)
+        self.__vivas__.append(1)
+
+        # La fila se publica en los grupos recien cuando todas las columnas la tienen
+        self._agrupar(self.__filas_por_medico__, medico, fila)
+        self._agrupar(self.__filas_por_especialidad__, id_especialidad, fila)
+        self.__filas_por_clave__[minuto << 32 | medico] = fila
+
+    def agregar_lote(self, turnos: list[Turno]):
+
+        # Como agregar con cada turno, pero cada columna crece con un solo extend y los ids se
+        # resuelven una vez por matricula, DNI y especialidad distintos del lote
+        fechas = list(map(Turno.obtener_fecha_hora, turnos))
+        duraciones = list(map(Turno.obtener_duracion, turnos))
+        medicos = self._ids_lote(self.__ids_medicos__, self.__matriculas__,
+                                 [turno.obtener_medico().obtener_matricula() for turno in turnos])
+        pacientes = self._ids_lote(self.__ids_pacientes__, self.__dnis__,
+                                   [turno.obtener_paciente().obtener_dni() for turno in turnos])
+        nombres = list(map(Turno.obtener_especialidad, turnos))
+        for nombre in dict.fromkeys(nombres):
+            if nombre not in self.__ids_por_nombre__:
+                self.__ids_por_nombre__[nombre] = self._id(self.__ids_especialidades__, self.__nombres_especialidades__,
+                                                           normalizar_texto(nombre), nombre)
+        especialidades = list(map(self.__ids_por_nombre__.__getitem__, nombres))
+        horas_semana = [fecha.weekday() * 24 + fecha.hour for fecha in fechas]
+        minutos = [fecha.toordinal() * 1440 + fecha.hour * 60 + fecha.minute - _MINUTOS_EPOCA for fecha in fechas]
+        inicio = len(self.__medicos__)
+
+        self.__medicos__.extend(medicos)
+        self.__pacientes__.extend(pacientes)
+        self.__especialidades__.extend(especialidades)
+        self.__duraciones__.extend(duraciones)
+        self.__horas_semana__.extend(horas_semana)
+        self.__ocupaciones__.extend([((medico * HORAS_SEMANA + hora_semana) * 60 + fecha.minute)
+                                     * (DURACION_MAXIMA + 1) + duracion
+                                     for medico, hora_semana, fecha, duracion
+                                     in zip(medicos, horas_semana, fechas, duraciones)])
+        self.__meses__.extend([(fecha.year - EPOCA.year) * 12 + fecha.month - 1 for fecha in fechas])
+        self.__minutos__.extend(minutos)
+        self.__vivas__.extend(b"\x01" * len(turnos))
+
+        filas = range(inicio, inicio + len(turnos))
+        for grupos, identificadores in ((self.__filas_por_medico__, medicos),
+                                        (self.__filas_por_especialidad__, especialidades)):
+            for identificador, fila in zip(identificadores, filas):
+                grupo = grupos.get(identificador)
+                if grupo is None:
+                    grupo = grupos[identificador] = array('I')
+                grupo.append(fila)
+        self.__filas_por_clave__.update(zip([minuto << 32 | medico for minuto, medico in zip(minutos, medicos)], filas))
+
+    def quitar(self, turno: Turno):
+
+        self.quitar_fila(turno.obtener_medico().obtener_matricula(), turno.obtener_fecha_hora())
+
+    def quitar_fila(self, matricula: str, fecha_hora: datetime):
+
+        # Un medico no puede tener dos turnos que empiecen en el mismo minuto sin superponerse
+        fila = self.__filas_por_clave__.pop(minuto_epoca(fecha_hora) << 32 | self.__ids_medicos__[matricula])
+        self.__vivas__[fila] = 0
+        self.__borradas__ += 1
+        if self.__borradas__ >= COMPACTAR_DESDE and self.__borradas__ * 2 >= len(self.__vivas__):
+            self._compactar()
+
+    def _compactar(self):
+
+        # Reescribe cada columna sin las filas borradas y rearma los grupos con las posiciones nuevas
+        vivas = self.__vivas__
+        self.__minutos__ = array('q', compress(self.__minutos__, vivas))
+        self.__horas_semana__ = array('B', compress(self.__horas_semana__, vivas))
+        self.__ocupaciones__ = array('q', compress(self.__ocupaciones__, vivas))
+        self.__meses__ = array('H', compress(self.__meses__, vivas))
+        self.__medicos__ = array('I', compress(self.__medicos__, vivas))
+        self.__pacientes__ = array('I', compress(self.__pacientes__, vivas))
+        self.__especialidades__ = array('H', compress(self.__especialidades__, vivas))
+        self.__duraciones__ = array('H', compress(self.__duraciones__, vivas))
+        self.__vivas__ = bytearray(b"\x01") * len(self.__minutos__)
+        self.__borradas__ = 0
+
+        self.__filas_por_medico__ = {}
+        self.__filas_por_especialidad__ = {}
+        for fila, (medico, especialidad) in enumerate(zip(self.__medicos__, self.__especialidades__)):
+            self._agrupar(self.__filas_por_medico__, medico, fila)
+            self._agrupar(self.__filas_por_especialidad__, especialidad, fila)
+        self.__filas_por_clave__ = {minuto << 32 | medico: fila
+                                    for fila, (minuto, medico) in enumerate(zip(self.__minutos__, self.__medicos__))}
+
+    def _id(self, ids: dict[str, int], valores: list[str], clave: str, valor: str) -> int:
+
+        identificador = ids.get(clave)
+        if identificador is None:
+            identificador = ids[clave] = len(valores)
+            valores.append(valor)
+        return identificador
+
+    def _ids_lote(self, ids: dict[str, int], valores: list[str], claves: list[str]) -> list[int]:
+
+        # Asigna ids a las claves nuevas en orden de aparicion, como lo haria agregar una por una
+        for clave in dict.fromkeys(claves):
+            if clave not in ids:
+                self._id(ids, valores, clave, clave)
+        return list(map(ids.__getitem__, claves))
+
+    def _agrupar(self, grupos: dict[int, array], identificador: int, fila: int):
+
+        filas = grupos.get(identificador)
+        if filas is None:
+            filas = grupos[identificador] = array('I')
+        filas.append(fila)
+
+    #Consultas
+
+    def utilizacion_semanal(self, matricula: str | None = None, desde: datetime | None = None,
+                            hasta: datetime | None = None) -> dict[tuple[str, str, int], int]:
+
+        # Minutos reservados por (matricula, dia de la semana, hora). Cada turno reparte su duracion
+        # entre las horas que ocupa: uno de 90 minutos a las 10:30 suma 30 a las 10 y 60 a las 11.
+        # Se cuentan las filas por su columna de ocupacion, que tiene pocos valores distintos, y el
+        # reparto se hace una vez por valor
+        seleccion = self._seleccion(matricula=matricula, desde=desde, hasta=hasta)
+        grupos = Counter(self._columna(self.__ocupaciones__, seleccion))
+
+        # Minutos por medico * HORAS_SEMANA + hora de la semana
+        minutos: dict[int, int] = {}
+        for ocupacion, cantidad in grupos.items():
+            clave, duracion = divmod(ocupacion, DURACION_MAXIMA + 1)
+            clave, inicio = divmod(clave, 60)
+            if inicio + duracion <= 60:
+                minutos[clave] = minutos.get(clave, 0) + duracion * cantidad
+                continue
+            medico, hora_semana = divmod(clave, HORAS_SEMANA)
+            while duracion > 0:
+                tramo = min(duracion, 60 - inicio)
+                clave = medico * HORAS_SEMANA + hora_semana
+                minutos[clave] = minutos.get(clave, 0) + tramo * cantidad
+                duracion -= tramo
+                inicio = 0
+                # Pasada la medianoche del domingo sigue el lunes de la semana tipo
+                hora_semana = (hora_semana + 1) % HORAS_SEMANA
+
+        resultado = {}
+        for clave, valor in minutos.items():
+            medico, hora_semana = divmod(clave, HORAS_SEMANA)
+            resultado[(self.__matriculas__[medico], *_DIA_Y_HORA[hora_semana])] = valor
+        return resultado
+
+    def cantidad_por_especialidad(self, matricula: str | None = None, desde: datetime | None = None,
+                                  hasta: datetime | None = None) -> dict[str, int]:
+
+        seleccion = self._seleccion(matricula=matricula, desde=desde, hasta=hasta)
+        grupos = Counter(self._columna(self.__especialidades__, seleccion))
+        return {self.__nombres_especialidades__[especialidad]: cantidad
+                for especialidad, cantidad in sorted(grupos.items(), key=lambda grupo: -grupo[1])}
+
+    def tendencia_mensual(self, especialidad: str | None = None,
+                          matricula: str | None = None) -> dict[tuple[int, int], int]:
+
+        # Cantidad de turnos por (anio, mes), en orden cronologico
+        seleccion = self._seleccion(matricula=matricula, especialidad=especialidad)
+        grupos = Counter(self._columna(self.__meses__, seleccion))
+        return {(EPOCA.year + mes // 12, mes % 12 + 1): grupos[mes] for mes in sorted(grupos)}
+
+    def _seleccion(self, matricula: str | None = None, especialidad: str | None = None,
+                   desde: datetime | None = None, hasta: datetime | None = None) -> array | bytes | None:
+
+        # Con matricula o especialidad parte de las filas del grupo mas chico (array de posiciones) y
+        # filtra el resto sobre ellas; si no, arma una mascara de un byte 0/1 por turno. None si no hay
+        # filtros. El rango de fechas es semiabierto: desde <= fecha_hora < hasta
+        grupos: list[array] = []
+        condiciones: list[tuple[array, object]] = []
+        if matricula is not None:
+            medico = self.__ids_medicos__.get(matricula)
+            grupos.append(self.__filas_por_medico__.get(medico, array('I')))
+            condiciones.append((self.__medicos__, medico.__eq__))
+        if especialidad is not None:
+            identificador = self.__ids_especialidades__.get(normalizar_texto(especialidad))
+            grupos.append(self.__filas_por_especialidad__.get(identificador, array('I')))
+            condiciones.append((self.__especialidades__, identificador.__eq__))
+        if desde is not None:
+            condiciones.append((self.__minutos__, minuto_epoca(desde).__le__))
+        if hasta is not None:
+            condiciones.append((self.__minutos__, minuto_epoca(hasta).__gt__))
+        if self.__borradas__:
+            condiciones.append((self.__vivas__, bool))
+
+        if grupos:
+            # Las filas del grupo elegido ya cumplen su propia condicion, que es la de la misma posicion
+            posicion = min(range(len(grupos)), key=lambda i: len(grupos[i]))
+            filas = grupos[posicion]
+            for columna, condicion in condiciones[:posicion] + condiciones[posicion + 1:]:
+                if filas:
+                    filas = array('I', compress(filas, map(condicion, map(columna.__getitem__, filas))))
+            return filas
+        if not condiciones:
+            return None
+        mascara = None
+        for columna, condicion in condiciones:
+            cumple = map(condicion, columna)
+            mascara = bytes(cumple) if mascara is None else bytes(map(and_, mascara, cumple))
+        return mascara
+
+    def _columna(self, columna: array, seleccion: array | bytes | None) -> Iterable[int]:
+
+        if seleccion is None:
+            return columna
+        if isinstance(seleccion, bytes):
+            return compress(columna, seleccion)
+        return map(columna.__getitem__, seleccion)
+
+    def __len__(self) -> int:
+
+        return len(self.__minutos__) - self.__borradas__
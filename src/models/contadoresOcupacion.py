@@ -0,0 +1,153 @@
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Iterable
+
+from src.models.especialidad import normalizar_texto
+from src.models.turno import Turno
+
+
+class ContadoresOcupacion:
+
+    # Totales de turnos por dia, hora, medico y especialidad que se actualizan con cada turno que se
+    # agrega o se quita, para que los tableros los lean sin recorrer la agenda. Cada dia guarda
+    # [turnos, {clave de especialidad: turnos}, turnos por hora (24), lunes de su semana] para que un
+    # turno actualice una sola entrada por dia. Las entradas que vuelven a cero se borran, asi un
+    # recalculo completo produce exactamente los mismos contadores.
+
+    __slots__ = ('__dias__', '__por_medico__', '__minutos_semana__', '__claves__', '__nombres__')
+
+    def __init__(self):
+
+        self.__dias__: dict[date, list] = {}
+        self.__por_medico__: dict[tuple[str, date], int] = {}
+        # Minutos reservados por medico en la semana que empieza en cada lunes
+        self.__minutos_semana__: dict[tuple[str, date], int] = {}
+        # Especialidad tal como llega -> clave normalizada, y clave -> primer nombre visto
+        self.__claves__: dict[str, str] = {}
+        self.__nombres__: dict[str, str] = {}
+
+    def agregar(self, turno: Turno):
+
+        self._sumar(turno, 1)
+
+    def agregar_lote(self, turnos: list[Turno]):
+
+        # Como agregar con cada turno, pero cuenta primero el lote y toca cada entrada una sola vez
+        fechas = list(map(Turno.obtener_fecha_hora, turnos))
+        dias = [fecha.date() for fecha in fechas]
+        matriculas = [turno.obtener_medico().obtener_matricula() for turno in turnos]
+        nombres = list(map(Turno.obtener_especialidad, turnos))
+        for nombre in dict.fromkeys(nombres):
+            if nombre not in self.__claves__:
+                clave = self.__claves__[nombre] = normalizar_texto(nombre)
+                self.__nombres__.setdefault(clave, nombre)
+
+        for (dia, hora, nombre), cantidad in Counter(zip(dias, [fecha.hour for fecha in fechas], nombres)).items():
+            entrada = self.__dias__.get(dia)
+            if entrada is None:
+                entrada = self.__dias__[dia] = [0, {}, [0] * 24, dia - timedelta(days=dia.weekday())]
+            entrada[2][hora] += cantidad
+            _sumar_en(entrada[1], self.__claves__[nombre], cantidad)
+            entrada[0] += cantidad
+        for (matricula, dia, duracion), cantidad in Counter(
+                zip(matriculas, dias, map(Turno.obtener_duracion, turnos))).items():
+            _sumar_en(self.__por_medico__, (matricula, dia), cantidad)
+            _sumar_en(self.__minutos_semana__, (matricula, self.__dias__[dia][3]), cantidad * duracion)
+
+    def quitar(self, turno: Turno):
+
+        self._sumar(turno, -1)
+
+    def _sumar(self, turno: Turno, signo: int):
+
+        fecha_hora = turno.obtener_fecha_hora()
+        dia = fecha_hora.date()
+        especialidad = turno.obtener_especialidad()
+        clave = self.__claves__.get(especialidad)
+        if clave is None:
+            clave = self.__claves__[especialidad] = normalizar_texto(especialidad)
+            self.__nombres__.setdefault(clave, especialidad)
+
+        entrada = self.__dias__.get(dia)
+        if entrada is None:
+            entrada = self.__dias__[dia] = [0, {}, [0] * 24, dia - timedelta(days=dia.weekday())]
+        entrada[2][fecha_hora.hour] += signo
+        _sumar_en(entrada[1], clave, signo)
+        entrada[0] += signo
+        if not entrada[0]:
+            del self.__dias__[dia]
+
+        matricula = turno.obtener_medico().obtener_matricula()
+        _sumar_en(self.__por_medico__, (matricula, dia), signo)
+        _sumar_en(self.__minutos_semana__, (matricula, entrada[3]), signo * turno.obtener_duracion())
+
+    #Lecturas
+
+    def turnos_del_dia(self, dia: date, especialidad: str | None = None) -> int:
+
+        entrada = self.__dias__.get(_dia(dia))
+        if entrada is None:
+            return 0
+        if especialidad is None:
+            return entrada[0]
+        return entrada[1].get(normalizar_texto(especialidad), 0)
+
+    def turnos_por_especialidad(self, dia: date) -> dict[str, int]:
+
+        entrada = self.__dias__.get(_dia(dia))
+        if entrada is None:
+            return {}
+        # dict() copia en un solo paso, asi otro hilo puede agendar mientras se arma el resultado
+        return {self.__nombres__[clave]: cantidad for clave, cantidad in dict(entrada[1]).items()}
+
+    def turnos_por_hora(self, dia: date) -> dict[int, int]:
+
+        entrada = self.__dias__.get(_dia(dia))
+        if entrada is None:
+            return {}
+        return {hora: cantidad for hora, cantidad in enumerate(entrada[2]) if cantidad}
+
+    def turnos_del_medico(self, matricula: str, dia: date) -> int:
+
+        return self.__por_medico__.get((matricula, _dia(dia)), 0)
+
+    def carga_semanal(self, matricula: str, dia: date) -> int:
+
+        # Minutos reservados por el medico en la semana (lunes a domingo) que contiene dia
+        dia = _dia(dia)
+        return self.__minutos_semana__.get((matricula, dia - timedelta(days=dia.weekday())), 0)
+
+    #Verificacion
+
+    def verificar(self, turnos: Iterable[Turno]) -> list[str]:
+
+        # Recalcula todo desde cero y describe cada contador que no coincide
+        esperado = ContadoresOcupacion()
+        for turno in turnos:
+            esperado.agregar(turno)
+
+        problemas = []
+        for nombre, propio, recalculado in (
+            ("por dia", self.__dias__, esperado.__dias__),
+            ("por medico y dia", self.__por_medico__, esperado.__por_medico__),
+            ("minutos por medico y semana", self.__minutos_semana__, esperado.__minutos_semana__),
+        ):
+            for clave in propio.keys() | recalculado.keys():
+                if propio.get(clave) != recalculado.get(clave):
+                    problemas.append(f"Contador {nombre} {clave}: {propio.get(clave)} en lugar de "
+                                     f"{recalculado.get(clave)}")
+        return problemas
+
+
+def _sumar_en(contador: dict, clave, cantidad: int):
+
+    valor = contador.get(clave, 0) + cantidad
+    if valor:
+        contador[clave] = valor
+    else:
+        del contador[clave]
+
+
+def _dia(valor: date) -> date:
+
+    return valor.date() if isinstance(valor, datetime) else valor
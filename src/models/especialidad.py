@@ -1,7 +1,31 @@
+import sys
+from functools import lru_cache
+
 from src.exceptions.error import DatoInvalidoException
 
+DIAS_SEMANA = ('lunes', 'martes', 'miercoles', 'jueves', 'viernes', 'sabado', 'domingo')
+
+# Posicion de cada dia en el mismo orden que datetime.weekday()
+INDICE_DIAS = {dia: indice for indice, dia in enumerate(DIAS_SEMANA)}
+
+_SIN_TILDES = str.maketrans({
+    'á': 'a', 'é': 'e', 'í': 'i',
+    'ó': 'o', 'ú': 'u',
+    'Á': 'a', 'É': 'e', 'Í': 'i',
+    'Ó': 'o', 'Ú': 'u'
+})
+
+
+@lru_cache(maxsize=1024)
+def normalizar_texto(texto: str) -> str:
+
+    return texto.strip().translate(_SIN_TILDES).lower()
+
+
 class Especialidad:
 
+    __slots__ = ('__tipo__', '__clave__', '__dias__', '__mascara__')
+
     def __init__(self, tipo: str, dias: list[str]):
 
         if not tipo or not tipo.strip():
@@ -9,36 +33,50 @@ class Especialidad:
         if not dias or len(dias) == 0:
             raise DatoInvalidoException("Debe especificar al menos un dia de atencion")
         
-        dias_validos = {'lunes', 'martes', 'miercoles', 'jueves', 'viernes', 'sabado', 'domingo'}
         dias_normalizados = []
+        mascara = 0
         
         for dia in dias:
-            dia_normalizado = self._normalizar_dia(dia.strip().lower())
-            if dia_normalizado not in dias_validos:
-                raise DatoInvalidoException(f"Dia invalido: {dia}. Dias validos: {', '.join(dias_validos)}")
+            dia_normalizado = self._normalizar_dia(dia)
+            if dia_normalizado not in INDICE_DIAS:
+                raise DatoInvalidoException(f"Dia invalido: {dia}. Dias validos: {', '.join(DIAS_SEMANA)}")
             if dia_normalizado not in dias_normalizados:
                 dias_normalizados.append(dia_normalizado)
+                mascara |= 1 << INDICE_DIAS[dia_normalizado]
         
-        self.__tipo__ = tipo.strip()
+        self.__tipo__ = sys.intern(tipo.strip())
+        self.__clave__ = sys.intern(normalizar_texto(tipo))
         self.__dias__ = dias_normalizados
+        self.__mascara__ = mascara
     
     def _normalizar_dia(self, dia: str) -> str:
-        reemplazos = {
-            'á': 'a', 'é': 'e', 'í': 'i',
-            'ó': 'o', 'ú': 'u',
-            'Á': 'a', 'É': 'e', 'Í': 'i',
-            'Ó': 'o', 'Ú': 'u'
-        }
-        dia_sin_tildes = ''.join(reemplazos.get(c, c) for c in dia)
-        return dia_sin_tildes.lower()
+
+        return normalizar_texto(dia)
 
     def obtener_especialidad(self) -> str:
 
         return self.__tipo__
     
+    def obtener_dias(self) -> list[str]:
+
+        return self.__dias__.copy()
+    
+    def obtener_clave(self) -> str:
+
+        return self.__clave__
+    
+    def obtener_mascara(self) -> int:
+
+        return self.__mascara__
+    
     def verificar_dia(self, dia: str) -> bool:
 
-        return self._normalizar_dia(dia.strip().lower()) in self.__dias__
+        indice = INDICE_DIAS.get(self._normalizar_dia(dia))
+        return indice is not None and self.atiende_en(indice)
+    
+    def atiende_en(self, dia_semana: int) -> bool:
+
+        return bool(self.__mascara__ >> dia_semana & 1)
     
     def __str__(self) -> str:
         dias_str = ", ".join(self.__dias__)
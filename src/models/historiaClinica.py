@@ -1,26 +1,49 @@
+from collections import deque
+from datetime import datetime
+from itertools import islice
+from typing import Iterator, TextIO
+
+from src.models.archivoTurnos import ArchivoTurnos
+from src.models.cacheRenderizado import CACHE_HISTORIAS, CacheRenderizado
 from src.models.paciente import Paciente
 from src.models.turno import Turno
 from src.models.receta import Receta
+from src.models.vistas import VistaEncadenada, VistaSecuencia, paginar
 
 from src.exceptions.error import (
     DatoInvalidoException
 )
 class HistoriaClinica:
 
-    def __init__(self, paciente: Paciente):
+    __slots__ = ('__paciente__', '__turnos__', '__recetas__', '__cache__', '__archivo__', '__archivados__',
+                 '__weakref__')
+
+    def __init__(self, paciente: Paciente, cache: CacheRenderizado | None = None):
         
         if not isinstance(paciente, Paciente):
             raise DatoInvalidoException("Debe proporcionar un paciente valido")
         
         self.__paciente__ = paciente
+        # Lista solo de agregado: un lector concurrente a lo sumo ve una lista atrasada. Quitar
+        # (cancelar, archivar) es el camino poco frecuente y borra por posicion
         self.__turnos__: list[Turno] = []
         self.__recetas__: list[Receta] = []
+        self.__cache__ = cache if cache is not None else CACHE_HISTORIAS
+        # Los turnos archivados se leen del archivo frio y van antes que los de __turnos__
+        self.__archivo__: ArchivoTurnos | None = None
+        self.__archivados__ = 0
     
     def agregar_turno(self, turno: Turno):
 
         if not isinstance(turno, Turno):
             raise DatoInvalidoException("Debe proporcionar un turno valido")
         self.__turnos__.append(turno)
+
+    def quitar_turno(self, turno: Turno):
+
+        self.__turnos__.remove(turno)
+        # Las lineas en cache son por posicion y las siguientes se corren un lugar
+        self.__cache__.invalidar(self)
     
     def agregar_receta(self, receta: Receta):
 
@@ -28,30 +51,124 @@ class HistoriaClinica:
             raise DatoInvalidoException("Debe proporcionar una receta valida")
         self.__recetas__.append(receta)
     
-    def obtener_turnos(self) -> list[Turno]:
+    def archivar_turnos(self, archivados: list[Turno], archivo: ArchivoTurnos):
+
+        # Llamado por la clinica despues de mover al archivo estos turnos de la historia
+        quitados = {id(turno) for turno in archivados}
+        self.__turnos__[:] = [turno for turno in self.__turnos__ if id(turno) not in quitados]
+        self.agregar_archivados(len(archivados), archivo)
+
+    def agregar_archivados(self, cantidad: int, archivo: ArchivoTurnos):
+
+        # Turnos del paciente que ya estan en el archivo y se muestran antes que los activos
+        self.__archivados__ += cantidad
+        self.__archivo__ = archivo
+        # La numeracion cambia porque los archivados pasan adelante
+        self.__cache__.invalidar(self)
+
+    def _recorrer_archivados(self) -> Iterator[Turno]:
 
-        return self.__turnos__.copy()
+        if not self.__archivados__:
+            return iter(())
+        return self.__archivo__.recorrer(dni=self.__paciente__.obtener_dni())
+
+    def _cantidad_archivados(self) -> int:
+
+        return self.__archivados__
+    
+    def obtener_turnos(self, offset: int = 0, limit: int | None = None) -> list[Turno]:
+
+        if not self.__archivados__:
+            return paginar(self.__turnos__, offset, limit)
+        return self.vista_turnos().pagina(offset, limit)
     
-    def obtener_recetas(self) -> list[Receta]:
+    def obtener_recetas(self, offset: int = 0, limit: int | None = None) -> list[Receta]:
 
-        return self.__recetas__.copy()
+        return paginar(self.__recetas__, offset, limit)
     
+    def vista_turnos(self) -> VistaEncadenada:
+
+        # Los archivados se reconstruyen desde el archivo al recorrerlos; los activos son la lista
+        return VistaEncadenada((self._cantidad_archivados, self._recorrer_archivados),
+                               (self.__turnos__.__len__, self.__turnos__.__iter__))
+    
+    def vista_recetas(self) -> VistaSecuencia:
+
+        return VistaSecuencia(self.__recetas__)
+    
+    def renderizar(self, primeros: int | None = None, ultimos: int | None = None,
+                   desde: datetime | None = None, hasta: datetime | None = None) -> Iterator[str]:
+
+        # Valida antes de devolver el generador para que los errores no se difieran a la primera linea.
+        # Los filtros se aplican por separado a turnos y recetas
+        if primeros is not None and ultimos is not None:
+            raise DatoInvalidoException("No se puede pedir a la vez los primeros y los ultimos registros")
+        for cantidad in (primeros, ultimos):
+            if cantidad is not None and cantidad < 0:
+                raise DatoInvalidoException("La cantidad de registros no puede ser negativa")
+        return self._generar(primeros, ultimos, desde, hasta)
+
+    def _generar(self, primeros: int | None, ultimos: int | None,
+                 desde: datetime | None, hasta: datetime | None) -> Iterator[str]:
+
+        entrada = self.__cache__.obtener(self)
+        yield f"=== Historia Clinica de {self.__paciente__} ===\n\n"
+        yield from self._renderizar_seccion("TURNOS", "turnos", "No hay turnos registrados.",
+                                            self.vista_turnos(), Turno.obtener_fecha_hora, entrada, 0,
+                                            primeros, ultimos, desde, hasta)
+        yield "\n"
+        yield from self._renderizar_seccion("RECETAS", "recetas", "No hay recetas registradas.",
+                                            self.__recetas__, Receta.obtener_fecha, entrada, 1,
+                                            primeros, ultimos, desde, hasta)
+
+    def escribir(self, salida: TextIO, primeros: int | None = None, ultimos: int | None = None,
+                 desde: datetime | None = None, hasta: datetime | None = None):
+
+        for linea in self.renderizar(primeros, ultimos, desde, hasta):
+            salida.write(linea)
+
+    def _renderizar_seccion(self, titulo: str, nombre: str, vacio: str, elementos: list, obtener_fecha,
+                            entrada: list, posicion: int, primeros: int | None, ultimos: int | None,
+                            desde: datetime | None, hasta: datetime | None) -> Iterator[str]:
+
+        yield f"{titulo} ({len(elementos)}):\n"
+        if not elementos:
+            yield vacio + "\n"
+            return
+
+        # La numeracion conserva la posicion original de cada registro aunque se pagine
+        seleccion = enumerate(elementos, 1)
+        if desde is not None or hasta is not None:
+            seleccion = ((i, elemento) for i, elemento in seleccion
+                         if (desde is None or obtener_fecha(elemento) >= desde)
+                         and (hasta is None or obtener_fecha(elemento) < hasta))
+            if ultimos is not None:
+                seleccion = deque(seleccion, maxlen=ultimos)
+        elif ultimos is not None:
+            inicio = max(0, len(elementos) - ultimos)
+            # Un slice de la vista saltea los turnos archivados sin reconstruirlos
+            seleccion = enumerate(elementos[inicio:], inicio + 1)
+        if primeros is not None:
+            seleccion = islice(seleccion, primeros)
+
+        # Solo se formatean los registros que no estan en cache. Las lineas se guardan por numero,
+        # asi una pagina ocupa solo lo que muestra y todo lo guardado cuenta contra la capacidad
+        lineas = entrada[posicion]
+        nuevas = 0
+        vacia = True
+        try:
+            for i, elemento in seleccion:
+                vacia = False
+                linea = lineas.get(i)
+                if linea is None:
+                    linea = lineas[i] = f"{i}. {elemento}\n"
+                    nuevas += 1
+                yield linea
+        finally:
+            self.__cache__.contar(self, entrada, nuevas)
+        if vacia:
+            yield f"No hay {nombre} en el rango solicitado.\n"
+
     def __str__(self) -> str:
 
-        resultado = f"=== Historia Clinica de {self.__paciente__} ===\n\n"
-        
-        resultado += f"TURNOS ({len(self.__turnos__)}):\n"
-        if self.__turnos__:
-            for i, turno in enumerate(self.__turnos__, 1):
-                resultado += f"{i}. {turno}\n"
-        else:
-            resultado += "No hay turnos registrados.\n"
-        
-        resultado += f"\nRECETAS ({len(self.__recetas__)}):\n"
-        if self.__recetas__:
-            for i, receta in enumerate(self.__recetas__, 1):
-                resultado += f"{i}. {receta}\n"
-        else:
-            resultado += "No hay recetas registradas.\n"
-        
-        return resultado
+        return "".join(self.renderizar())
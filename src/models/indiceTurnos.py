@@ -0,0 +1,182 @@
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, datetime
+from typing import Iterable, Iterator
+
+from src.models.especialidad import normalizar_texto
+from src.models.turno import Turno
+
+
+class IndiceTurnos:
+
+    # Los grupos por matricula, especialidad y dia pueden ser grandes y son dicts usados como
+    # conjunto ordenado, para quitar un turno en O(1) sin perder el orden de insercion. Los de un
+    # paciente son chicos y son listas, que ocupan menos; quitar de ellas recorre el grupo en C
+
+    def __init__(self):
+
+        self.__por_clave__: dict[tuple[str, datetime], Turno] = {}
+        self.__por_dni__: dict[str, list[Turno]] = {}
+        self.__por_matricula__: dict[str, dict[Turno, None]] = {}
+        self.__por_especialidad__: dict[str, dict[Turno, None]] = {}
+        self.__por_fecha__: dict[date, dict[Turno, None]] = {}
+        self.__fechas__: list[date] = []
+
+    def agregar(self, turno: Turno):
+
+        matricula = turno.obtener_medico().obtener_matricula()
+        fecha_hora = turno.obtener_fecha_hora()
+        dia = fecha_hora.date()
+
+        self.__por_clave__[(matricula, fecha_hora)] = turno
+        self.__por_dni__.setdefault(turno.obtener_paciente().obtener_dni(), []).append(turno)
+        self.__por_matricula__.setdefault(matricula, {})[turno] = None
+        self.__por_especialidad__.setdefault(normalizar_texto(turno.obtener_especialidad()), {})[turno] = None
+
+        turnos_del_dia = self.__por_fecha__.get(dia)
+        if turnos_del_dia is None:
+            turnos_del_dia = self.__por_fecha__[dia] = {}
+            insort(self.__fechas__, dia)
+        turnos_del_dia[turno] = None
+
+    def agregar_lote(self, turnos: list[Turno]):
+
+        # Como agregar con cada turno: crea primero los grupos que faltan, normaliza cada
+        # especialidad distinta una sola vez y ordena los dias nuevos juntos
+        matriculas = [turno.obtener_medico().obtener_matricula() for turno in turnos]
+        dnis = [turno.obtener_paciente().obtener_dni() for turno in turnos]
+        fechas = list(map(Turno.obtener_fecha_hora, turnos))
+        dias = [fecha.date() for fecha in fechas]
+        nombres = list(map(Turno.obtener_especialidad, turnos))
+        claves = {nombre: normalizar_texto(nombre) for nombre in dict.fromkeys(nombres)}
+        especialidades = list(map(claves.__getitem__, nombres))
+
+        self.__por_clave__.update(zip(zip(matriculas, fechas), turnos))
+        _crear_grupos(self.__por_dni__, dnis, list)
+        for dni, turno in zip(dnis, turnos):
+            self.__por_dni__[dni].append(turno)
+        _crear_grupos(self.__por_matricula__, matriculas, dict)
+        _crear_grupos(self.__por_especialidad__, especialidades, dict)
+        dias_nuevos = _crear_grupos(self.__por_fecha__, dias, dict)
+        for grupos, valores in ((self.__por_matricula__, matriculas), (self.__por_especialidad__, especialidades),
+                                (self.__por_fecha__, dias)):
+            for valor, turno in zip(valores, turnos):
+                grupos[valor][turno] = None
+        if dias_nuevos:
+            self.__fechas__.extend(dias_nuevos)
+            self.__fechas__.sort()
+
+    def quitar(self, turno: Turno):
+
+        matricula = turno.obtener_medico().obtener_matricula()
+        fecha_hora = turno.obtener_fecha_hora()
+        del self.__por_clave__[(matricula, fecha_hora)]
+        _quitar_de_grupo(self.__por_dni__, turno.obtener_paciente().obtener_dni(), turno)
+        _quitar_de_grupo(self.__por_matricula__, matricula, turno)
+        _quitar_de_grupo(self.__por_especialidad__, normalizar_texto(turno.obtener_especialidad()), turno)
+        dia = fecha_hora.date()
+        if _quitar_de_grupo(self.__por_fecha__, dia, turno):
+            del self.__fechas__[bisect_left(self.__fechas__, dia)]
+
+    def contiene(self, matricula: str, fecha_hora: datetime) -> bool:
+
+        return (matricula, fecha_hora) in self.__por_clave__
+
+    def obtener(self, matricula: str, fecha_hora: datetime) -> Turno | None:
+
+        return self.__por_clave__.get((matricula, fecha_hora))
+
+    def buscar(self, dni: str | None = None, matricula: str | None = None, especialidad: str | None = None,
+               desde: datetime | None = None, hasta: datetime | None = None) -> list[Turno]:
+
+        # Parte del indice mas chico entre los filtros pedidos y verifica el resto sobre ese subconjunto.
+        # El rango de fechas es semiabierto: desde <= fecha_hora < hasta.
+        clave_especialidad = normalizar_texto(especialidad) if especialidad is not None else None
+        candidatos = []
+        if dni is not None:
+            candidatos.append(self.__por_dni__.get(dni, []))
+        if matricula is not None:
+            candidatos.append(self.__por_matricula__.get(matricula, {}))
+        if clave_especialidad is not None:
+            candidatos.append(self.__por_especialidad__.get(clave_especialidad, {}))
+        if desde is not None or hasta is not None:
+            candidatos.append(self._por_rango(desde, hasta))
+
+        if not candidatos:
+            base = list(self.__por_clave__.values())
+        else:
+            base = min(candidatos, key=len)
+
+        resultado = list(self._filtrar(base, dni, matricula, clave_especialidad, desde, hasta))
+        resultado.sort(key=Turno.obtener_fecha_hora)
+        return resultado
+
+    def recorrer(self, dni: str | None = None, matricula: str | None = None, especialidad: str | None = None,
+                 desde: datetime | None = None, hasta: datetime | None = None) -> Iterator[Turno]:
+
+        # Mismos filtros y orden que buscar, sin armar el resultado completo: con DNI o matricula
+        # ordena solo ese grupo; si no, avanza dia por dia y ordena un dia a la vez
+        clave_especialidad = normalizar_texto(especialidad) if especialidad is not None else None
+        grupos = []
+        if dni is not None:
+            grupos.append(self.__por_dni__.get(dni, []))
+        if matricula is not None:
+            grupos.append(self.__por_matricula__.get(matricula, {}))
+        if grupos:
+            base = sorted(min(grupos, key=len), key=Turno.obtener_fecha_hora)
+            yield from self._filtrar(base, dni, matricula, clave_especialidad, desde, hasta)
+            return
+
+        inicio = bisect_left(self.__fechas__, desde.date()) if desde is not None else 0
+        fin = bisect_right(self.__fechas__, hasta.date()) if hasta is not None else len(self.__fechas__)
+        for dia in self.__fechas__[inicio:fin]:
+            base = sorted(self.__por_fecha__[dia], key=Turno.obtener_fecha_hora)
+            yield from self._filtrar(base, dni, matricula, clave_especialidad, desde, hasta)
+
+    def _filtrar(self, base: Iterable[Turno], dni: str | None, matricula: str | None, clave_especialidad: str | None,
+                 desde: datetime | None, hasta: datetime | None) -> Iterator[Turno]:
+
+        return (
+            turno for turno in base
+            if (dni is None or turno.obtener_paciente().obtener_dni() == dni)
+            and (matricula is None or turno.obtener_medico().obtener_matricula() == matricula)
+            and (clave_especialidad is None or normalizar_texto(turno.obtener_especialidad()) == clave_especialidad)
+            and (desde is None or turno.obtener_fecha_hora() >= desde)
+            and (hasta is None or turno.obtener_fecha_hora() < hasta)
+        )
+
+    def _por_rango(self, desde: datetime | None, hasta: datetime | None) -> list[Turno]:
+
+        inicio = bisect_left(self.__fechas__, desde.date()) if desde is not None else 0
+        fin = bisect_right(self.__fechas__, hasta.date()) if hasta is not None else len(self.__fechas__)
+
+        turnos = []
+        for dia in self.__fechas__[inicio:fin]:
+            turnos.extend(self.__por_fecha__[dia])
+        return turnos
+
+    def __len__(self) -> int:
+
+        return len(self.__por_clave__)
+
+
+def _quitar_de_grupo(grupos: dict, clave, turno: Turno) -> bool:
+
+    # Devuelve True si el grupo quedo vacio y se borro
+    grupo = grupos[clave]
+    if isinstance(grupo, list):
+        grupo.remove(turno)
+    else:
+        del grupo[turno]
+    if grupo:
+        return False
+    del grupos[clave]
+    return True
+
+
+def _crear_grupos(grupos: dict, claves: list, crear) -> list:
+
+    # Crea un grupo vacio por cada clave nueva y devuelve esas claves en orden de aparicion
+    nuevas = [clave for clave in dict.fromkeys(claves) if clave not in grupos]
+    for clave in nuevas:
+        grupos[clave] = crear()
+    return nuevas
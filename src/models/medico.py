@@ -1,10 +1,23 @@
-from src.models.especialidad import Especialidad
+import sys
+from datetime import datetime, time, timedelta
+from typing import TYPE_CHECKING, Callable, Iterator
+
+from src.models.agenda import Agenda
+from src.models.especialidad import Especialidad, normalizar_texto
+from src.models.vistas import VistaSecuencia
 from src.exceptions.error import (
     DatoInvalidoException,
     EspecialidadInvalidaException
 )
+
+if TYPE_CHECKING:
+    from src.models.turno import Turno
+
 class Medico:
 
+    __slots__ = ('__nombre__', '__matricula__', '__especialidades__', '__disponibilidad__',
+                 '__agenda__', '__oyentes__')
+
     def __init__(self, nombre: str, matricula: str):
 
         if not nombre or not nombre.strip():
@@ -13,21 +26,36 @@ class Medico:
             raise DatoInvalidoException("La matricula del medico no puede estar vacia")
         
         self.__nombre__ = nombre.strip()
-        self.__matricula__ = matricula.strip()
+        self.__matricula__ = sys.intern(matricula.strip())
         self.__especialidades__: list[Especialidad] = []
+        self.__disponibilidad__: dict[str, int] = {}
+        self.__agenda__ = Agenda()
+        self.__oyentes__: list[Callable[["Medico", Especialidad], None]] = []
     
     def agregar_especialidad(self, especialidad: Especialidad):
 
-        for esp in self.__especialidades__:
-            if esp.obtener_especialidad().lower() == especialidad.obtener_especialidad().lower():
-                raise EspecialidadInvalidaException(f"El medico ya tiene la especialidad {especialidad.obtener_especialidad()}")
+        clave = especialidad.obtener_clave()
+        if clave in self.__disponibilidad__:
+            raise EspecialidadInvalidaException(f"El medico ya tiene la especialidad {especialidad.obtener_especialidad()}")
         
         self.__especialidades__.append(especialidad)
+        self.__disponibilidad__[clave] = especialidad.obtener_mascara()
+        for oyente in self.__oyentes__:
+            oyente(self, especialidad)
+    
+    def agregar_oyente(self, oyente: Callable[["Medico", Especialidad], None]):
+
+        # Permite a la clinica enterarse de especialidades agregadas despues del registro
+        self.__oyentes__.append(oyente)
     
     def obtener_matricula(self) -> str:
 
         return self.__matricula__
     
+    def obtener_nombre(self) -> str:
+
+        return self.__nombre__
+    
     def obtener_especialidad_para_dia(self, dia: str) -> str | None:
 
         for especialidad in self.__especialidades__:
@@ -35,10 +63,66 @@ class Medico:
                 return especialidad.obtener_especialidad()
         return None
     
+    def atiende(self, especialidad: str, dia_semana: int) -> bool:
+
+        return bool(self.__disponibilidad__.get(normalizar_texto(especialidad), 0) >> dia_semana & 1)
+    
     def obtener_especialidades(self) -> list[Especialidad]:
 
         return self.__especialidades__.copy()
     
+    def vista_especialidades(self) -> VistaSecuencia:
+
+        return VistaSecuencia(self.__especialidades__)
+    
+    def esta_libre(self, inicio: datetime, fin: datetime) -> bool:
+
+        return not self.__agenda__.hay_superposicion(inicio, fin)
+    
+    def esta_libre_desde(self, inicio: datetime) -> bool:
+
+        return self.__agenda__.libre_desde(inicio)
+    
+    def agregar_turno(self, turno: "Turno"):
+
+        self.__agenda__.agregar(turno.obtener_fecha_hora(), turno.obtener_fin(), turno)
+    
+    def agregar_turnos_ordenados(self, turnos: list["Turno"]):
+
+        self.__agenda__.agregar_ordenados(
+            [(turno.obtener_fecha_hora(), turno.obtener_fin(), turno) for turno in turnos]
+        )
+    
+    def quitar_turno(self, turno: "Turno") -> bool:
+
+        return self.__agenda__.quitar(turno.obtener_fecha_hora(), turno)
+    
+    def archivar_turnos(self, corte: datetime) -> list["Turno"]:
+
+        return self.__agenda__.descartar_hasta(corte)
+    
+    def obtener_turnos_entre(self, desde: datetime, hasta: datetime) -> list["Turno"]:
+
+        return list(self.__agenda__.entre(desde, hasta))
+    
+    def horarios_libres(self, especialidad: str, desde: datetime, duracion: timedelta,
+                        hora_inicio: time, hora_fin: time, dias: int) -> Iterator[datetime]:
+
+        # Inicios libres en orden cronologico durante los proximos dias en que atiende la especialidad.
+        # La grilla de cada dia arranca en hora_inicio y avanza de a duracion
+        mascara = self.__disponibilidad__.get(normalizar_texto(especialidad), 0)
+        if not mascara:
+            return
+        primer_dia = desde.date()
+        for desplazamiento in range(dias):
+            dia = primer_dia + timedelta(days=desplazamiento)
+            if not mascara >> dia.weekday() & 1:
+                continue
+            inicio = datetime.combine(dia, hora_inicio)
+            if inicio < desde:
+                inicio += duracion * -(-(desde - inicio) // duracion)
+            yield from self.__agenda__.inicios_libres(inicio, datetime.combine(dia, hora_fin), duracion)
+    
     def __str__(self) -> str:
 
         especialidades_str = ", ".join([str(esp) for esp in self.__especialidades__])
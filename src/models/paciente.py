@@ -1,11 +1,35 @@
-from datetime import datetime
+from datetime import date, datetime
+from functools import lru_cache
 from src.exceptions.error import (
     DatoInvalidoException
 )
+
+
+@lru_cache(maxsize=65536)
+def parsear_fecha_nacimiento(texto: str) -> date:
+
+    # Camino rapido para el caso habitual dd/mm/aaaa; cualquier otra forma que acepte
+    # strptime (por ejemplo 5/1/1988) pasa por el camino lento con el mismo resultado
+    if len(texto) == 10 and texto.isascii() and texto[2] == '/' and texto[5] == '/':
+        dia, mes, anio = texto[:2], texto[3:5], texto[6:]
+        if dia.isdecimal() and mes.isdecimal() and anio.isdecimal():
+            try:
+                return date(int(anio), int(mes), int(dia))
+            except ValueError:
+                raise DatoInvalidoException("La fecha de nacimiento debe tener el formato dd/mm/aaaa")
+    try:
+        return datetime.strptime(texto, "%d/%m/%Y").date()
+    except ValueError:
+        raise DatoInvalidoException("La fecha de nacimiento debe tener el formato dd/mm/aaaa")
+
+
 class Paciente:
 
-    def __init__(self, nombre: str, dni: str, fecha_nacimiento: str):
+    __slots__ = ('__nombre__', '__dni__', '__fecha_nacimiento__')
+
+    def __init__(self, nombre: str, dni: str, fecha_nacimiento: str, ahora: datetime | None = None):
 
+        # En cargas masivas se puede pasar un mismo "ahora" para todo el lote
         if not nombre or not nombre.strip():
             raise DatoInvalidoException("El nombre del paciente no puede estar vacio")
         if not dni or not dni.strip():
@@ -13,23 +37,19 @@ class Paciente:
         if not fecha_nacimiento or not fecha_nacimiento.strip():
             raise DatoInvalidoException("La fecha de nacimiento no puede estar vacia")
 
-         
-        try:
-            fecha_nac_dt = datetime.strptime(fecha_nacimiento.strip(), "%d/%m/%Y")
-        except ValueError:
-            raise DatoInvalidoException("La fecha de nacimiento debe tener el formato dd/mm/aaaa")
-
+        fecha_limpia = fecha_nacimiento.strip()
+        fecha_nac = parsear_fecha_nacimiento(fecha_limpia)
 
-        if fecha_nac_dt > datetime.now():
+        if fecha_nac > (ahora or datetime.now()).date():
             raise DatoInvalidoException("La fecha de nacimiento no puede ser en el futuro")
         
         nombre_limpio = nombre.strip()
         if len(nombre_limpio) > 50:
             raise DatoInvalidoException("El nombre del paciente no puede tener mas de 50 caracteres")
 
-        for char in nombre_limpio:
-            if not (char.isalpha() or char.isspace()):
-                raise DatoInvalidoException("El nombre del paciente solo puede contener letras y espacios")
+        # Sin los espacios, el resto del nombre tiene que ser solo letras
+        if not "".join(nombre_limpio.split()).isalpha():
+            raise DatoInvalidoException("El nombre del paciente solo puede contener letras y espacios")
             
         dni_limpio = dni.strip()
         if len(dni_limpio) != 8:
@@ -38,17 +58,22 @@ class Paciente:
         if not dni_limpio.isdigit():
             raise DatoInvalidoException("El DNI solo puede contener numeros")
          
-        self.__nombre__= nombre_limpio
+        self.__nombre__ = nombre_limpio
         self.__dni__ = dni_limpio
-        self.__fecha_nacimiento__ = fecha_nacimiento.strip()
-        self.__nombre__= nombre.strip()
-        self.__dni__ = dni.strip()
-        self.__fecha_nacimiento__ = fecha_nacimiento.strip()
+        self.__fecha_nacimiento__ = fecha_limpia
     
     def obtener_dni(self) -> str:
 
         return self.__dni__
     
+    def obtener_nombre(self) -> str:
+
+        return self.__nombre__
+    
+    def obtener_fecha_nacimiento(self) -> str:
+
+        return self.__fecha_nacimiento__
+    
     def __str__(self) -> str:
 
         return f"Nombre del Paciente: {self.__nombre__} (DNI: {self.__dni__}, Nacimiento: {self.__fecha_nacimiento__})"
@@ -7,6 +7,8 @@ from src.exceptions.error import (
 )
 class Receta:
 
+    __slots__ = ('__paciente', '__medico', '__medicamentos', '__fecha')
+
     def __init__(self, paciente: Paciente, medico: Medico, medicamentos: list[str]):
 
         if not isinstance(paciente, Paciente):
@@ -25,6 +27,17 @@ class Receta:
         self.__medicamentos = medicamentos_validos
         self.__fecha = datetime.now()
     
+    @classmethod
+    def restaurar(cls, paciente: Paciente, medico: Medico, medicamentos: list[str], fecha: datetime) -> "Receta":
+
+        # Reconstruye una receta ya emitida conservando su fecha original
+        receta = cls.__new__(cls)
+        receta.__paciente = paciente
+        receta.__medico = medico
+        receta.__medicamentos = medicamentos
+        receta.__fecha = fecha
+        return receta
+    
     def obtener_paciente(self) -> Paciente:
 
         return self.__paciente
@@ -33,6 +46,10 @@ class Receta:
 
         return self.__medico
     
+    def obtener_medicamentos(self) -> list[str]:
+
+        return self.__medicamentos.copy()
+    
     def obtener_fecha(self) -> datetime:
 
         return self.__fecha
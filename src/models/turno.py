@@ -1,11 +1,48 @@
+import sys
+
 from src.models.paciente import Paciente
 from src.models.medico import Medico
 from src.exceptions.error import DatoInvalidoException
-from datetime import datetime
+from datetime import datetime, timedelta
+
+# Duracion en minutos de un turno cuando no se especifica otra
+DURACION_POR_DEFECTO = 30
+
+# Duracion maxima en minutos (un dia); entra en las columnas array('H') de ColumnasTurnos y SegmentoTurnos
+DURACION_MAXIMA = 24 * 60
+
+# Separa matricula y fecha_hora ISO en el id de un turno, que es unico por medico y horario
+SEPARADOR_ID = "@"
+
+
+def validar_duracion(duracion: int):
+
+    if not isinstance(duracion, int) or isinstance(duracion, bool) or not 0 < duracion <= DURACION_MAXIMA:
+        raise DatoInvalidoException(f"La duracion del turno debe ser un numero de minutos entre 1 y {DURACION_MAXIMA}")
+
+
+def id_turno(matricula: str, fecha_hora: datetime) -> str:
+
+    return f"{matricula}{SEPARADOR_ID}{fecha_hora.isoformat()}"
+
+
+def separar_id_turno(id_turno: str) -> tuple[str, datetime]:
+
+    matricula, _, fecha_hora = id_turno.rpartition(SEPARADOR_ID)
+    try:
+        if matricula:
+            return matricula, datetime.fromisoformat(fecha_hora)
+    except ValueError:
+        pass
+    raise DatoInvalidoException(f"Id de turno invalido: {id_turno}")
+
 
 class Turno:
 
-    def __init__(self, paciente: Paciente, medico: Medico, fecha_hora: datetime, especialidad: str):
+    __slots__ = ('__paciente__', '__medico__', '__fecha_hora__', '__especialidad__', '__duracion__')
+
+    def __init__(self, paciente: Paciente, medico: Medico, fecha_hora: datetime, especialidad: str,
+                 duracion: int = DURACION_POR_DEFECTO):
 
         if not isinstance(paciente, Paciente):
             raise DatoInvalidoException("Debe proporcionar un paciente valido")
@@ -17,11 +54,32 @@ class Turno:
             raise DatoInvalidoException("La fecha y hora del turno debe ser a futuro")
         if not especialidad or not especialidad.strip():
             raise DatoInvalidoException("Debe especificar una especialidad")
+        validar_duracion(duracion)
+        if fecha_hora > datetime.max - timedelta(minutes=duracion):
+            raise DatoInvalidoException("El turno debe terminar en una fecha valida")
         
         self.__paciente__ = paciente
         self.__medico__ = medico
         self.__fecha_hora__ = fecha_hora
-        self.__especialidad__ = especialidad.strip()
+        self.__especialidad__ = sys.intern(especialidad.strip())
+        self.__duracion__ = duracion
+    
+    @classmethod
+    def restaurar(cls, paciente: Paciente, medico: Medico, fecha_hora: datetime, especialidad: str,
+                  duracion: int) -> "Turno":
+
+        # Reconstruye un turno ya validado al momento de agendarlo, aunque su fecha haya pasado
+        turno = cls.__new__(cls)
+        turno.__paciente__ = paciente
+        turno.__medico__ = medico
+        turno.__fecha_hora__ = fecha_hora
+        turno.__especialidad__ = sys.intern(especialidad)
+        turno.__duracion__ = duracion
+        return turno
+    
+    def obtener_id(self) -> str:
+
+        return id_turno(self.__medico__.obtener_matricula(), self.__fecha_hora__)
     
     def obtener_medico(self) -> Medico:
 
@@ -31,6 +89,14 @@ class Turno:
 
         return self.__fecha_hora__
     
+    def obtener_duracion(self) -> int:
+
+        return self.__duracion__
+    
+    def obtener_fin(self) -> datetime:
+
+        return self.__fecha_hora__ + timedelta(minutes=self.__duracion__)
+    
     def obtener_paciente(self) -> Paciente:
 
         return self.__paciente__
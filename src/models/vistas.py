@@ -0,0 +1,118 @@
+from collections.abc import Sequence
+from itertools import chain, islice
+from typing import Callable, Iterable, Iterator, TypeVar
+
+from src.exceptions.error import DatoInvalidoException
+
+T = TypeVar("T")
+
+
+def validar_pagina(offset: int, limit: int | None):
+
+    if offset < 0:
+        raise DatoInvalidoException("El offset no puede ser negativo")
+    if limit is not None and limit < 0:
+        raise DatoInvalidoException("El limit no puede ser negativo")
+
+
+def paginar(elementos: Iterable[T], offset: int = 0, limit: int | None = None) -> list[T]:
+
+    validar_pagina(offset, limit)
+    if isinstance(elementos, (list, VistaSecuencia, VistaEncadenada)):
+        return elementos[offset:None if limit is None else offset + limit]
+    return list(islice(elementos, offset, None if limit is None else offset + limit))
+
+
+class VistaSecuencia(Sequence):
+
+    # Vista de solo lectura sobre una lista interna: no copia y refleja los cambios posteriores
+
+    def __init__(self, datos: list[T]):
+
+        self.__datos__ = datos
+
+    def __getitem__(self, indice):
+
+        # Un slice devuelve una lista nueva solo con los elementos de la pagina
+        return self.__datos__[indice]
+
+    def __len__(self) -> int:
+
+        return len(self.__datos__)
+
+    def __iter__(self) -> Iterator[T]:
+
+        return iter(self.__datos__)
+
+    def __reversed__(self) -> Iterator[T]:
+
+        return reversed(self.__datos__)
+
+    def __contains__(self, elemento) -> bool:
+
+        return elemento in self.__datos__
+
+    def pagina(self, offset: int = 0, limit: int | None = None) -> list[T]:
+
+        return paginar(self.__datos__, offset, limit)
+
+    def __repr__(self) -> str:
+
+        return f"VistaSecuencia({len(self.__datos__)} elementos)"
+
+
+class VistaEncadenada(Sequence):
+
+    # Vista de solo lectura sobre varias colecciones seguidas, p. ej. los turnos archivados y un dict
+    # de turnos activos. Cada parte se da como (funcion de largo, funcion que la recorre), asi la
+    # vista no copia y refleja los cambios posteriores. El acceso por posicion saltea las partes
+    # enteras que quedan antes y recorre solo la parte donde cae.
+
+    def __init__(self, *partes: tuple[Callable[[], int], Callable[[], Iterable[T]]]):
+
+        self.__partes__ = partes
+
+    def __getitem__(self, indice):
+
+        largo = len(self)
+        if isinstance(indice, slice):
+            inicio, fin, paso = indice.indices(largo)
+            if paso < 0:
+                return list(self)[indice]
+            return list(islice(self._recorrer_desde(inicio), 0, max(0, fin - inicio), paso))
+        if indice < 0:
+            indice += largo
+        if not 0 <= indice < largo:
+            raise IndexError("Indice fuera de rango")
+        return next(self._recorrer_desde(indice))
+
+    def _recorrer_desde(self, inicio: int) -> Iterator[T]:
+
+        for posicion, (largo, recorrer) in enumerate(self.__partes__):
+            cantidad = largo()
+            if inicio < cantidad:
+                resto = (recorrer() for _, recorrer in self.__partes__[posicion + 1:])
+                return chain(islice(recorrer(), inicio, None), chain.from_iterable(resto))
+            inicio -= cantidad
+        return iter(())
+
+    def __len__(self) -> int:
+
+        return sum(largo() for largo, _ in self.__partes__)
+
+    def __iter__(self) -> Iterator[T]:
+
+        return chain.from_iterable(recorrer() for _, recorrer in self.__partes__)
+
+    def __reversed__(self) -> Iterator[T]:
+
+        # Las partes solo se recorren hacia adelante
+        return reversed(list(self))
+
+    def pagina(self, offset: int = 0, limit: int | None = None) -> list[T]:
+
+        return paginar(self, offset, limit)
+
+    def __repr__(self) -> str:
+
+        return f"VistaEncadenada({len(self)} elementos)"
@@ -0,0 +1,277 @@
+import json
+import os
+import sqlite3
+from datetime import datetime
+from typing import Iterator
+from urllib.request import pathname2url
+
+from src.models.paciente import Paciente
+from src.models.medico import Medico
+from src.models.especialidad import Especialidad
+from src.models.turno import Turno
+from src.models.receta import Receta
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS pacientes (
+    dni TEXT PRIMARY KEY,
+    nombre TEXT NOT NULL,
+    fecha_nacimiento TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS medicos (
+    matricula TEXT PRIMARY KEY,
+    nombre TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS especialidades (
+    id INTEGER PRIMARY KEY,
+    matricula TEXT NOT NULL,
+    tipo TEXT NOT NULL,
+    dias TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS turnos (
+    id INTEGER PRIMARY KEY,
+    dni TEXT NOT NULL,
+    matricula TEXT NOT NULL,
+    especialidad TEXT NOT NULL,
+    fecha_hora TEXT NOT NULL,
+    duracion INTEGER NOT NULL,
+    UNIQUE (matricula, fecha_hora)
+);
+CREATE TABLE IF NOT EXISTS recetas (
+    id INTEGER PRIMARY KEY,
+    dni TEXT NOT NULL,
+    matricula TEXT NOT NULL,
+    medicamentos TEXT NOT NULL,
+    fecha TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_especialidades_matricula ON especialidades (matricula);
+CREATE INDEX IF NOT EXISTS idx_turnos_dni ON turnos (dni);
+CREATE INDEX IF NOT EXISTS idx_turnos_fecha_hora ON turnos (fecha_hora);
+CREATE INDEX IF NOT EXISTS idx_recetas_dni ON recetas (dni);
+"""
+
+INSERTAR = {
+    "pacientes": "INSERT INTO pacientes (dni, nombre, fecha_nacimiento) VALUES (?, ?, ?)",
+    "medicos": "INSERT INTO medicos (matricula, nombre) VALUES (?, ?)",
+    "especialidades": "INSERT INTO especialidades (matricula, tipo, dias) VALUES (?, ?, ?)",
+    "turnos": "INSERT INTO turnos (dni, matricula, especialidad, fecha_hora, duracion) VALUES (?, ?, ?, ?, ?)",
+    "recetas": "INSERT INTO recetas (dni, matricula, medicamentos, fecha) VALUES (?, ?, ?, ?)",
+}
+
+BORRAR_TURNO = "DELETE FROM turnos WHERE matricula = ? AND fecha_hora = ?"
+
+
+class AlmacenamientoSQLite:
+
+    # Las escrituras se acumulan y se insertan en lotes (executemany dentro de una transaccion).
+    # Toda lectura confirma antes lo pendiente para ver un estado consistente, salvo las busquedas de
+    # un paciente o medico por clave, que solo confirman si esa clave esta pendiente: la clinica busca
+    # cada alta nueva para rechazar duplicados y no debe cerrar un lote por alta. Las cancelaciones se
+    # borran antes que los inserts del mismo lote, asi un turno reprogramado puede ocupar el horario
+    # que libero otro.
+
+    def __init__(self, ruta: str = ":memory:", tamanio_lote: int = 1000, solo_lectura: bool = False):
+
+        if solo_lectura:
+            # Para quien solo lee (exportar): no crea el archivo, el esquema ni cambia el modo del journal
+            if not os.path.isfile(ruta):
+                raise FileNotFoundError(f"No existe la base de datos: {ruta}")
+            self.__conexion__ = sqlite3.connect(f"file:{pathname2url(os.path.abspath(ruta))}?mode=ro",
+                                                uri=True, check_same_thread=False)
+        else:
+            self.__conexion__ = sqlite3.connect(ruta, check_same_thread=False)
+            self.__conexion__.execute("PRAGMA journal_mode=WAL")
+            self.__conexion__.execute("PRAGMA synchronous=NORMAL")
+            self.__conexion__.executescript(ESQUEMA)
+        self.__tamanio_lote__ = tamanio_lote
+        self.__pendientes__: dict[str, list[tuple]] = {tabla: [] for tabla in INSERTAR}
+        self.__cancelaciones__: list[tuple[str, str]] = []
+        # DNIs y matriculas con filas sin confirmar
+        self.__claves_pendientes__: dict[str, set[str]] = {"pacientes": set(), "medicos": set()}
+        self.__cantidad_pendiente__ = 0
+
+    # Escritura
+
+    def guardar_paciente(self, paciente: Paciente):
+
+        self.__claves_pendientes__["pacientes"].add(paciente.obtener_dni())
+        self._encolar("pacientes", (paciente.obtener_dni(), paciente.obtener_nombre(),
+                                    paciente.obtener_fecha_nacimiento()))
+
+    def guardar_medico(self, medico: Medico):
+
+        self.__claves_pendientes__["medicos"].add(medico.obtener_matricula())
+        self._encolar("medicos", (medico.obtener_matricula(), medico.obtener_nombre()))
+        for especialidad in medico.vista_especialidades():
+            self.guardar_especialidad(medico, especialidad)
+
+    def guardar_especialidad(self, medico: Medico, especialidad: Especialidad):
+
+        self.__claves_pendientes__["medicos"].add(medico.obtener_matricula())
+        self._encolar("especialidades", (medico.obtener_matricula(), especialidad.obtener_especialidad(),
+                                         ",".join(especialidad.obtener_dias())))
+
+    def guardar_turno(self, turno: Turno):
+
+        self._encolar("turnos", (turno.obtener_paciente().obtener_dni(), turno.obtener_medico().obtener_matricula(),
+                                 turno.obtener_especialidad(), turno.obtener_fecha_hora().isoformat(),
+                                 turno.obtener_duracion()))
+
+    def guardar_cancelacion(self, turno: Turno):
+
+        # Si el turno todavia espera su insert, se confirma primero para que el borrado lo encuentre
+        if self.__pendientes__["turnos"]:
+            self.confirmar()
+        self.__cancelaciones__.append((turno.obtener_medico().obtener_matricula(),
+                                       turno.obtener_fecha_hora().isoformat()))
+        self.__cantidad_pendiente__ += 1
+        if self.__cantidad_pendiente__ >= self.__tamanio_lote__:
+            self.confirmar()
+
+    def guardar_receta(self, receta: Receta):
+
+        self._encolar("recetas", (receta.obtener_paciente().obtener_dni(), receta.obtener_medico().obtener_matricula(),
+                                  json.dumps(receta.obtener_medicamentos()), receta.obtener_fecha().isoformat()))
+
+    def confirmar(self):
+
+        if not self.__cantidad_pendiente__:
+            return
+        with self.__conexion__:
+            if self.__cancelaciones__:
+                self.__conexion__.executemany(BORRAR_TURNO, self.__cancelaciones__)
+            for tabla, filas in self.__pendientes__.items():
+                if filas:
+                    self.__conexion__.executemany(INSERTAR[tabla], filas)
+        # Se vacia recien despues del commit: si la transaccion falla, todo queda para el proximo intento
+        self.__cancelaciones__.clear()
+        for filas in self.__pendientes__.values():
+            filas.clear()
+        self.__cantidad_pendiente__ = 0
+        for claves in self.__claves_pendientes__.values():
+            claves.clear()
+
+    def cerrar(self):
+
+        self.confirmar()
+        self.__conexion__.close()
+
+    def _encolar(self, tabla: str, fila: tuple):
+
+        self.__pendientes__[tabla].append(fila)
+        self.__cantidad_pendiente__ += 1
+        if self.__cantidad_pendiente__ >= self.__tamanio_lote__:
+            self.confirmar()
+
+    # Lectura
+
+    def cargar_paciente(self, dni: str) -> tuple[str, str, str] | None:
+
+        return self._uno("SELECT nombre, dni, fecha_nacimiento FROM pacientes WHERE dni = ?", (dni,),
+                         dni in self.__claves_pendientes__["pacientes"])
+
+    def cargar_medico(self, matricula: str) -> tuple[str, str, list[tuple[str, list[str]]]] | None:
+
+        pendiente = matricula in self.__claves_pendientes__["medicos"]
+        fila = self._uno("SELECT nombre, matricula FROM medicos WHERE matricula = ?", (matricula,), pendiente)
+        if fila is None:
+            return None
+        especialidades = [
+            (tipo, dias.split(","))
+            for tipo, dias in self._todos("SELECT tipo, dias FROM especialidades WHERE matricula = ? ORDER BY id",
+                                          (matricula,), pendiente)
+        ]
+        return fila[0], fila[1], especialidades
+
+    def turnos_de_medico(self, matricula: str) -> Iterator[tuple[str, str, str, datetime, int]]:
+
+        return self._turnos("WHERE matricula = ?", (matricula,))
+
+    def turnos_de_paciente(self, dni: str) -> Iterator[tuple[str, str, str, datetime, int]]:
+
+        return self._turnos("WHERE dni = ?", (dni,))
+
+    def recetas_de_paciente(self, dni: str) -> Iterator[tuple[str, str, list[str], datetime]]:
+
+        for dni_receta, matricula, medicamentos, fecha in self._todos(
+                "SELECT dni, matricula, medicamentos, fecha FROM recetas WHERE dni = ? ORDER BY id", (dni,)):
+            yield dni_receta, matricula, json.loads(medicamentos), datetime.fromisoformat(fecha)
+
+    def matriculas_con_turnos(self, dni: str | None = None, matricula: str | None = None,
+                              desde: datetime | None = None, hasta: datetime | None = None) -> list[str]:
+
+        donde, parametros = self._condiciones(dni, matricula, "fecha_hora", desde, hasta)
+        return [fila[0] for fila in self._todos(f"SELECT DISTINCT matricula FROM turnos {donde}", parametros)]
+
+    def recorrer_turnos(self, dni: str | None = None, matricula: str | None = None, desde: datetime | None = None,
+                        hasta: datetime | None = None) -> Iterator[tuple[str, str, str, datetime, int]]:
+
+        # Recorre el cursor sin traer todas las filas; el orden por fecha_hora lo resuelven los indices
+        donde, parametros = self._condiciones(dni, matricula, "fecha_hora", desde, hasta)
+        for dni_turno, matricula_turno, especialidad, fecha_hora, duracion in self._recorrer(
+                f"SELECT dni, matricula, especialidad, fecha_hora, duracion FROM turnos {donde} ORDER BY fecha_hora",
+                parametros):
+            yield dni_turno, matricula_turno, especialidad, datetime.fromisoformat(fecha_hora), duracion
+
+    def recorrer_recetas(self, dni: str | None = None, matricula: str | None = None, desde: datetime | None = None,
+                         hasta: datetime | None = None) -> Iterator[tuple[str, str, list[str], datetime]]:
+
+        donde, parametros = self._condiciones(dni, matricula, "fecha", desde, hasta)
+        for dni_receta, matricula_receta, medicamentos, fecha in self._recorrer(
+                f"SELECT dni, matricula, medicamentos, fecha FROM recetas {donde} ORDER BY id", parametros):
+            yield dni_receta, matricula_receta, json.loads(medicamentos), datetime.fromisoformat(fecha)
+
+    def dnis(self, offset: int = 0, limit: int | None = None) -> list[str]:
+
+        return self._claves("SELECT dni FROM pacientes ORDER BY rowid LIMIT ? OFFSET ?", offset, limit)
+
+    def matriculas(self, offset: int = 0, limit: int | None = None) -> list[str]:
+
+        return self._claves("SELECT matricula FROM medicos ORDER BY rowid LIMIT ? OFFSET ?", offset, limit)
+
+    def _turnos(self, donde: str, parametros: tuple) -> Iterator[tuple[str, str, str, datetime, int]]:
+
+        for dni, matricula, especialidad, fecha_hora, duracion in self._todos(
+                f"SELECT dni, matricula, especialidad, fecha_hora, duracion FROM turnos {donde} ORDER BY id",
+                parametros):
+            yield dni, matricula, especialidad, datetime.fromisoformat(fecha_hora), duracion
+
+    def _condiciones(self, dni: str | None, matricula: str | None, columna_fecha: str,
+                     desde: datetime | None, hasta: datetime | None) -> tuple[str, tuple]:
+
+        # Rango de fechas semiabierto; las fechas ISO se comparan bien como texto
+        condiciones, parametros = [], []
+        if dni is not None:
+            condiciones.append("dni = ?")
+            parametros.append(dni)
+        if matricula is not None:
+            condiciones.append("matricula = ?")
+            parametros.append(matricula)
+        if desde is not None:
+            condiciones.append(f"{columna_fecha} >= ?")
+            parametros.append(desde.isoformat())
+        if hasta is not None:
+            condiciones.append(f"{columna_fecha} < ?")
+            parametros.append(hasta.isoformat())
+        donde = f"WHERE {' AND '.join(condiciones)}" if condiciones else ""
+        return donde, tuple(parametros)
+
+    def _claves(self, consulta: str, offset: int, limit: int | None) -> list[str]:
+
+        return [fila[0] for fila in self._todos(consulta, (-1 if limit is None else limit, offset))]
+
+    def _uno(self, consulta: str, parametros: tuple, confirmar_antes: bool = True) -> tuple | None:
+
+        if confirmar_antes:
+            self.confirmar()
+        return self.__conexion__.execute(consulta, parametros).fetchone()
+
+    def _todos(self, consulta: str, parametros: tuple, confirmar_antes: bool = True) -> list[tuple]:
+
+        if confirmar_antes:
+            self.confirmar()
+        return self.__conexion__.execute(consulta, parametros).fetchall()
+
+    def _recorrer(self, consulta: str, parametros: tuple) -> Iterator[tuple]:
+
+        self.confirmar()
+        yield from self.__conexion__.execute(consulta, parametros)
@@ -0,0 +1,291 @@
+import json
+import os
+import threading
+from datetime import datetime
+from typing import TYPE_CHECKING, Iterator
+
+from src.models.paciente import Paciente
+from src.models.medico import Medico
+from src.models.especialidad import Especialidad
+from src.models.turno import Turno
+from src.models.receta import Receta
+
+if TYPE_CHECKING:
+    from src.models.clinica import Clinica
+
+ARCHIVO_SNAPSHOT = "snapshot.jsonl"
+PREFIJO_SEGMENTO = "diario-"
+
+# Orden en el que se reproducen las operaciones de un snapshot. Las cancelaciones no llegan al
+# snapshot: al compactar quitan la linea del turno que cancelan
+ORDEN_OPERACIONES = ("paciente", "medico", "especialidad", "turno", "receta")
+
+
+class Diario:
+
+    # Cada mutacion de la clinica se agrega como una linea JSON al segmento actual. Las lineas se
+    # escriben y sincronizan en grupos (group commit). Compactar cierra el segmento actual y, a
+    # partir de los archivos ya cerrados, arma un snapshot nuevo; al reiniciar se carga el snapshot
+    # y solo se reproducen los segmentos posteriores.
+
+    def __init__(self, directorio: str, tamanio_grupo: int = 256, intervalo_compactacion: float | None = None):
+
+        os.makedirs(directorio, exist_ok=True)
+        self.__directorio__ = directorio
+        self.__tamanio_grupo__ = tamanio_grupo
+        self.__pendientes__: list[str] = []
+        self.__bloqueo__ = threading.Lock()
+        self.__bloqueo_compactacion__ = threading.Lock()
+        self.__detener__ = threading.Event()
+        self.__hilo_periodico__: threading.Thread | None = None
+
+        segmentos = self._segmentos()
+        self.__segmento__ = (segmentos[-1] if segmentos else self._cubierto_por_snapshot()) + 1
+        self.__archivo__ = open(self._ruta_segmento(self.__segmento__), "a", encoding="utf-8")
+
+        if intervalo_compactacion is not None:
+            self.__hilo_periodico__ = threading.Thread(
+                target=self._compactar_periodicamente, args=(intervalo_compactacion,), daemon=True
+            )
+            self.__hilo_periodico__.start()
+
+    # Escritura
+
+    def guardar_paciente(self, paciente: Paciente):
+
+        self._registrar(["paciente", paciente.obtener_nombre(), paciente.obtener_dni(),
+                         paciente.obtener_fecha_nacimiento()])
+
+    def guardar_medico(self, medico: Medico):
+
+        self._registrar(["medico", medico.obtener_nombre(), medico.obtener_matricula()])
+        for especialidad in medico.vista_especialidades():
+            self.guardar_especialidad(medico, especialidad)
+
+    def guardar_especialidad(self, medico: Medico, especialidad: Especialidad):
+
+        self._registrar(["especialidad", medico.obtener_matricula(), especialidad.obtener_especialidad(),
+                         especialidad.obtener_dias()])
+
+    def guardar_turno(self, turno: Turno):
+
+        self._registrar(["turno", turno.obtener_paciente().obtener_dni(), turno.obtener_medico().obtener_matricula(),
+                         turno.obtener_especialidad(), turno.obtener_fecha_hora().isoformat(),
+                         turno.obtener_duracion()])
+
+    def guardar_cancelacion(self, turno: Turno):
+
+        self._registrar(["cancelacion", turno.obtener_medico().obtener_matricula(),
+                         turno.obtener_fecha_hora().isoformat()])
+
+    def guardar_receta(self, receta: Receta):
+
+        self._registrar(["receta", receta.obtener_paciente().obtener_dni(), receta.obtener_medico().obtener_matricula(),
+                         receta.obtener_medicamentos(), receta.obtener_fecha().isoformat()])
+
+    def confirmar(self):
+
+        with self.__bloqueo__:
+            self._escribir_pendientes()
+
+    def cerrar(self):
+
+        self.__detener__.set()
+        if self.__hilo_periodico__ is not None:
+            self.__hilo_periodico__.join()
+        with self.__bloqueo__:
+            self._escribir_pendientes()
+            self.__archivo__.close()
+
+    def _registrar(self, operacion: list):
+
+        linea = json.dumps(operacion, ensure_ascii=False, separators=(",", ":"))
+        with self.__bloqueo__:
+            self.__pendientes__.append(linea)
+            if len(self.__pendientes__) >= self.__tamanio_grupo__:
+                self._escribir_pendientes()
+
+    def _escribir_pendientes(self):
+
+        if not self.__pendientes__:
+            return
+        self.__archivo__.write("\n".join(self.__pendientes__) + "\n")
+        self.__archivo__.flush()
+        os.fsync(self.__archivo__.fileno())
+        self.__pendientes__.clear()
+
+    # Compactacion
+
+    def compactar(self, en_segundo_plano: bool = False) -> threading.Thread | None:
+
+        with self.__bloqueo__:
+            self._escribir_pendientes()
+            self.__archivo__.close()
+            hasta = self.__segmento__
+            self.__segmento__ += 1
+            self.__archivo__ = open(self._ruta_segmento(self.__segmento__), "a", encoding="utf-8")
+
+        if not en_segundo_plano:
+            self._escribir_snapshot(hasta)
+            return None
+        hilo = threading.Thread(target=self._escribir_snapshot, args=(hasta,), daemon=True)
+        hilo.start()
+        return hilo
+
+    def _compactar_periodicamente(self, intervalo: float):
+
+        while not self.__detener__.wait(intervalo):
+            self.compactar()
+
+    def _escribir_snapshot(self, hasta: int):
+
+        # Solo lee archivos ya cerrados, por lo que no compite con las escrituras en curso
+        with self.__bloqueo_compactacion__:
+            desde = self._cubierto_por_snapshot()
+            if hasta <= desde:
+                return
+            por_operacion: dict[str, list[str]] = {operacion: [] for operacion in ORDEN_OPERACIONES}
+            # Turnos por (matricula, fecha_hora), para que una cancelacion borre la linea de su turno
+            turnos: dict[tuple[str, str], str] = {}
+            for linea in self._lineas_snapshot():
+                self._compactar_linea(linea, json.loads(linea), por_operacion, turnos)
+            for segmento in self._segmentos():
+                if desde < segmento <= hasta:
+                    for linea, operacion in self._lineas_segmento(segmento):
+                        self._compactar_linea(linea, operacion, por_operacion, turnos)
+            por_operacion["turno"] = list(turnos.values())
+
+            ruta = os.path.join(self.__directorio__, ARCHIVO_SNAPSHOT)
+            temporal = ruta + ".tmp"
+            with open(temporal, "w", encoding="utf-8") as archivo:
+                archivo.write(json.dumps({"hasta_segmento": hasta}) + "\n")
+                for operacion in ORDEN_OPERACIONES:
+                    for linea in por_operacion[operacion]:
+                        archivo.write(linea + "\n")
+                archivo.flush()
+                os.fsync(archivo.fileno())
+            os.replace(temporal, ruta)
+
+            for segmento in self._segmentos():
+                if segmento <= hasta:
+                    os.remove(self._ruta_segmento(segmento))
+
+    def _compactar_linea(self, linea: str, operacion: list, por_operacion: dict[str, list[str]],
+                         turnos: dict[tuple[str, str], str]):
+
+        if operacion[0] == "turno":
+            turnos[operacion[2], operacion[4]] = linea
+        elif operacion[0] == "cancelacion":
+            turnos.pop((operacion[1], operacion[2]), None)
+        else:
+            por_operacion[operacion[0]].append(linea)
+
+    # Restauracion
+
+    @classmethod
+    def reproducir(cls, directorio: str, clinica: "Clinica") -> "Clinica":
+
+        # Carga el snapshot y los segmentos sin abrir un segmento para escribir, para quien solo
+        # lee el estado y no debe dejar archivos nuevos en el directorio
+        if not os.path.isdir(directorio):
+            raise FileNotFoundError(f"No existe el directorio del diario: {directorio}")
+        lector = cls.__new__(cls)
+        lector.__directorio__ = directorio
+        lector.restaurar(clinica)
+        return clinica
+
+    def restaurar(self, clinica: "Clinica"):
+
+        # El snapshot se carga agrupando los turnos para insertarlos ordenados en cada agenda
+        turnos: list[Turno] = []
+        for linea in self._lineas_snapshot():
+            operacion = json.loads(linea)
+            if operacion[0] == "turno":
+                turnos.append(self._crear_turno(clinica, operacion))
+            else:
+                if turnos:
+                    clinica._registrar_turnos_lote(turnos)
+                    turnos = []
+                self._aplicar(clinica, operacion)
+        if turnos:
+            clinica._registrar_turnos_lote(turnos)
+
+        cubierto = self._cubierto_por_snapshot()
+        for segmento in self._segmentos():
+            if segmento > cubierto:
+                for _, operacion in self._lineas_segmento(segmento):
+                    self._aplicar(clinica, operacion)
+
+    def _aplicar(self, clinica: "Clinica", operacion: list):
+
+        tipo = operacion[0]
+        if tipo == "paciente":
+            clinica.agregar_paciente(Paciente(operacion[1], operacion[2], operacion[3]))
+        elif tipo == "medico":
+            clinica.agregar_medico(Medico(operacion[1], operacion[2]))
+        elif tipo == "especialidad":
+            clinica.agregar_especialidad(operacion[1], Especialidad(operacion[2], operacion[3]))
+        elif tipo == "turno":
+            clinica._registrar_turno(self._crear_turno(clinica, operacion))
+        elif tipo == "cancelacion":
+            clinica._quitar_turno(clinica._obtener_turno(operacion[1], datetime.fromisoformat(operacion[2])))
+        elif tipo == "receta":
+            _, dni, matricula, medicamentos, fecha = operacion
+            clinica._registrar_receta(Receta.restaurar(
+                clinica.obtener_paciente_por_dni(dni),
+                clinica.obtener_medico_por_matricula(matricula), medicamentos, datetime.fromisoformat(fecha)
+            ))
+
+    def _crear_turno(self, clinica: "Clinica", operacion: list) -> Turno:
+
+        _, dni, matricula, especialidad, fecha_hora, duracion = operacion
+        return Turno.restaurar(
+            clinica.obtener_paciente_por_dni(dni),
+            clinica.obtener_medico_por_matricula(matricula),
+            datetime.fromisoformat(fecha_hora), especialidad, duracion
+        )
+
+    # Archivos
+
+    def _ruta_segmento(self, segmento: int) -> str:
+
+        return os.path.join(self.__directorio__, f"{PREFIJO_SEGMENTO}{segmento:08d}.jsonl")
+
+    def _segmentos(self) -> list[int]:
+
+        return sorted(
+            int(nombre[len(PREFIJO_SEGMENTO):-len(".jsonl")])
+            for nombre in os.listdir(self.__directorio__)
+            if nombre.startswith(PREFIJO_SEGMENTO) and nombre.endswith(".jsonl")
+        )
+
+    def _cubierto_por_snapshot(self) -> int:
+
+        ruta = os.path.join(self.__directorio__, ARCHIVO_SNAPSHOT)
+        if not os.path.exists(ruta):
+            return 0
+        with open(ruta, encoding="utf-8") as archivo:
+            return json.loads(archivo.readline())["hasta_segmento"]
+
+    def _lineas_snapshot(self) -> Iterator[str]:
+
+        ruta = os.path.join(self.__directorio__, ARCHIVO_SNAPSHOT)
+        if not os.path.exists(ruta):
+            return
+        with open(ruta, encoding="utf-8") as archivo:
+            archivo.readline()
+            for linea in archivo:
+                yield linea.rstrip("\n")
+
+    def _lineas_segmento(self, segmento: int) -> Iterator[tuple[str, list]]:
+
+        with open(self._ruta_segmento(segmento), encoding="utf-8") as archivo:
+            for linea in archivo:
+                linea = linea.rstrip("\n")
+                if not linea:
+                    continue
+                try:
+                    yield linea, json.loads(linea)
+                except json.JSONDecodeError:
+                    # Ultima linea truncada por una caida a mitad de escritura
+                    return
@@ -0,0 +1,496 @@
+import argparse
+import asyncio
+import json
+import logging
+import re
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import datetime
+from functools import partial
+from http import HTTPStatus
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from src.models.clinica import Clinica
+from src.models.clinicaConcurrente import ClinicaConcurrente
+from src.models.paciente import Paciente
+from src.models.medico import Medico
+from src.models.turno import Turno, DURACION_POR_DEFECTO, id_turno, separar_id_turno
+from src.models.receta import Receta
+from src.importador import parsear_especialidades
+from src.exceptions.error import (
+    DatoInvalidoException,
+    EspecialidadInvalidaException,
+    PacienteNoEncontradoException,
+    PacienteDuplicadoException,
+    MedicoNoDisponibleException,
+    MedicoNoEncontradoException,
+    MedicoDuplicadoException,
+    TurnoOcupadoException,
+    TurnoNoEncontradoException,
+    RecetaInvalidaException
+)
+
+# Candados fijos entre los que se reparten las matriculas; acotan la memoria aunque los clientes
+# pidan matriculas inexistentes, a cambio de serializar a veces dos medicos que caen en el mismo
+CANTIDAD_BLOQUEOS_MEDICOS = 256
+
+# Hilos que atienden operaciones sobre una ClinicaConcurrente cuando no se indica otra cantidad
+HILOS_POR_DEFECTO = 4
+
+registro = logging.getLogger(__name__)
+
+# Codigo HTTP con el que se responde cada excepcion del dominio
+ESTADOS_POR_EXCEPCION = (
+    (PacienteNoEncontradoException, HTTPStatus.NOT_FOUND),
+    (MedicoNoEncontradoException, HTTPStatus.NOT_FOUND),
+    (TurnoNoEncontradoException, HTTPStatus.NOT_FOUND),
+    (PacienteDuplicadoException, HTTPStatus.CONFLICT),
+    (MedicoDuplicadoException, HTTPStatus.CONFLICT),
+    (TurnoOcupadoException, HTTPStatus.CONFLICT),
+    (MedicoNoDisponibleException, HTTPStatus.CONFLICT),
+    (EspecialidadInvalidaException, HTTPStatus.BAD_REQUEST),
+    (RecetaInvalidaException, HTTPStatus.BAD_REQUEST),
+    (DatoInvalidoException, HTTPStatus.BAD_REQUEST),
+)
+
+TAMANIO_MAXIMO_CUERPO = 1024 * 1024
+
+# Conexiones pendientes de aceptar; alcanza para varios cientos de clientes que conectan a la vez
+BACKLOG = 1024
+
+# Segundos entre compactaciones del diario mientras el servidor esta abierto
+INTERVALO_COMPACTACION = 300
+
+# Segundos entre cada paso de los turnos terminados al archivo frio
+INTERVALO_ARCHIVO = 3600
+
+
+class ErrorHttp(Exception):
+
+    def __init__(self, estado: HTTPStatus, mensaje: str):
+
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+#Serializacion
+
+def paciente_a_dict(paciente: Paciente) -> dict:
+
+    return {"nombre": paciente.obtener_nombre(), "dni": paciente.obtener_dni(),
+            "fecha_nacimiento": paciente.obtener_fecha_nacimiento()}
+
+
+def medico_a_dict(medico: Medico) -> dict:
+
+    return {"nombre": medico.obtener_nombre(), "matricula": medico.obtener_matricula(),
+            "especialidades": [{"tipo": e.obtener_especialidad(), "dias": e.obtener_dias()}
+                               for e in medico.vista_especialidades()]}
+
+
+def turno_a_dict(turno: Turno) -> dict:
+
+    return {"id": turno.obtener_id(),
+            "dni": turno.obtener_paciente().obtener_dni(), "matricula": turno.obtener_medico().obtener_matricula(),
+            "especialidad": turno.obtener_especialidad(), "fecha_hora": turno.obtener_fecha_hora().isoformat(),
+            "duracion": turno.obtener_duracion()}
+
+
+def receta_a_dict(receta: Receta) -> dict:
+
+    return {"dni": receta.obtener_paciente().obtener_dni(), "matricula": receta.obtener_medico().obtener_matricula(),
+            "medicamentos": receta.obtener_medicamentos(), "fecha": receta.obtener_fecha().isoformat()}
+
+
+#Lectura de parametros
+
+def _campo(datos: dict, nombre: str) -> str:
+
+    valor = datos.get(nombre)
+    if not isinstance(valor, str):
+        raise DatoInvalidoException(f"Falta el campo {nombre}")
+    return valor
+
+
+def _fecha(valor: str | None, nombre: str) -> datetime | None:
+
+    if valor is None:
+        return None
+    try:
+        return datetime.fromisoformat(valor)
+    except (TypeError, ValueError):
+        raise DatoInvalidoException(f"El campo {nombre} debe ser una fecha ISO 8601")
+
+
+def _entero(valor, nombre: str, defecto: int | None = None) -> int | None:
+
+    if valor is None:
+        return defecto
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        raise DatoInvalidoException(f"El campo {nombre} debe ser un numero entero")
+
+
+class ServidorClinica:
+
+    # Expone las operaciones de la CLI como JSON sobre HTTP/1.1 con conexiones persistentes.
+    # Las llamadas a la clinica pasan por un ejecutor y el bucle de eventos queda libre para leer y
+    # escribir sockets. Con una ClinicaConcurrente el ejecutor por defecto tiene HILOS_POR_DEFECTO
+    # hilos y los turnos de un mismo medico se serializan con el candado que le toca a su matricula,
+    # que cubre validar, registrar y confirmar; los de medicos en candados distintos se intercalan.
+    # Clinica no es segura entre hilos: usa un ejecutor de un solo hilo, que ya serializa todo, y
+    # los candados por matricula se omiten.
+
+    def __init__(self, clinica: Clinica, host: str = "127.0.0.1", puerto: int = 8080,
+                 ejecutor: Executor | None = None, intervalo_archivo: float | None = None):
+
+        self.__clinica__ = clinica
+        self.__intervalo_archivo__ = intervalo_archivo
+        self.__tarea_archivo__: asyncio.Task | None = None
+        self.__host__ = host
+        self.__puerto__ = puerto
+        self.__ejecutor_propio__ = ejecutor is None
+        self.__serializado__ = not isinstance(clinica, ClinicaConcurrente)
+        if ejecutor is None:
+            ejecutor = ThreadPoolExecutor(max_workers=1 if self.__serializado__ else HILOS_POR_DEFECTO)
+        self.__ejecutor__ = ejecutor
+        self.__bloqueos_medicos__ = [asyncio.Lock() for _ in range(CANTIDAD_BLOQUEOS_MEDICOS)]
+        self.__servidor__: asyncio.AbstractServer | None = None
+        self.__rutas__ = [
+            ("GET", re.compile(r"/pacientes"), self._listar_pacientes),
+            ("POST", re.compile(r"/pacientes"), self._agregar_paciente),
+            ("GET", re.compile(r"/pacientes/(?P<dni>[^/]+)/historia"), self._ver_historia_clinica),
+            ("GET", re.compile(r"/medicos"), self._listar_medicos),
+            ("POST", re.compile(r"/medicos"), self._agregar_medico),
+            ("POST", re.compile(r"/medicos/(?P<matricula>[^/]+)/especialidades"), self._agregar_especialidad),
+            ("GET", re.compile(r"/turnos"), self._listar_turnos),
+            ("POST", re.compile(r"/turnos"), self._agendar_turno),
+            ("GET", re.compile(r"/turnos/disponibles"), self._buscar_disponibles),
+            ("DELETE", re.compile(r"/turnos/(?P<id_turno>[^/]+)"), self._cancelar_turno),
+            ("POST", re.compile(r"/turnos/(?P<id_turno>[^/]+)/reprogramar"), self._reprogramar_turno),
+            ("POST", re.compile(r"/recetas"), self._emitir_receta),
+            ("GET", re.compile(r"/ocupacion"), self._ver_ocupacion),
+        ]
+
+    async def iniciar(self) -> "ServidorClinica":
+
+        self.__servidor__ = await asyncio.start_server(self._atender, self.__host__, self.__puerto__,
+                                                      backlog=BACKLOG)
+        self.__puerto__ = self.__servidor__.sockets[0].getsockname()[1]
+        if self.__intervalo_archivo__:
+            self.__tarea_archivo__ = asyncio.create_task(self._archivar_periodicamente())
+        return self
+
+    async def servir(self):
+
+        if self.__servidor__ is None:
+            await self.iniciar()
+        async with self.__servidor__:
+            await self.__servidor__.serve_forever()
+
+    async def cerrar(self):
+
+        if self.__tarea_archivo__ is not None:
+            self.__tarea_archivo__.cancel()
+        if self.__servidor__ is not None:
+            self.__servidor__.close()
+            await self.__servidor__.wait_closed()
+        if self.__ejecutor_propio__:
+            self.__ejecutor__.shutdown(wait=True)
+
+    def obtener_puerto(self) -> int:
+
+        return self.__puerto__
+
+    async def _archivar_periodicamente(self):
+
+        # Pasa los turnos terminados al archivo frio por el mismo ejecutor que las operaciones
+        while True:
+            await asyncio.sleep(self.__intervalo_archivo__)
+            # Un fallo no debe frenar la tarea para el resto de la vida del servidor
+            try:
+                await self._ejecutar(self.__clinica__.archivar_turnos)
+            except Exception:
+                registro.exception("Fallo el archivo periodico de turnos")
+
+    #Protocolo HTTP
+
+    async def _atender(self, lector: asyncio.StreamReader, escritor: asyncio.StreamWriter):
+
+        try:
+            while True:
+                peticion = await self._leer_peticion(lector)
+                if peticion is None:
+                    break
+                metodo, destino, version, encabezados, cuerpo = peticion
+                estado, respuesta = await self._despachar(metodo, destino, cuerpo)
+                mantener = (encabezados.get("connection", "").lower() != "close"
+                            and (version == "HTTP/1.1" or encabezados.get("connection", "").lower() == "keep-alive"))
+                self._escribir_respuesta(escritor, estado, respuesta, mantener)
+                await escritor.drain()
+                if not mantener:
+                    break
+        except ErrorHttp as e:
+            self._escribir_respuesta(escritor, e.estado, {"error": str(e)}, False)
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            # ValueError: StreamReader.readline lo lanza cuando una linea supera el limite del buffer
+            pass
+        finally:
+            escritor.close()
+
+    async def _leer_peticion(self, lector: asyncio.StreamReader):
+
+        linea = await lector.readline()
+        if not linea:
+            return None
+        try:
+            metodo, destino, version = linea.decode("latin-1").split()
+        except ValueError:
+            raise ErrorHttp(HTTPStatus.BAD_REQUEST, "Linea de peticion invalida")
+
+        encabezados = {}
+        while True:
+            linea = await lector.readline()
+            if linea in (b"\r\n", b"\n", b""):
+                break
+            nombre, _, valor = linea.decode("latin-1").partition(":")
+            encabezados[nombre.strip().lower()] = valor.strip()
+
+        try:
+            largo = _entero(encabezados.get("content-length"), "Content-Length", 0)
+        except DatoInvalidoException as e:
+            raise ErrorHttp(HTTPStatus.BAD_REQUEST, str(e))
+        if largo < 0 or largo > TAMANIO_MAXIMO_CUERPO:
+            raise ErrorHttp(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Cuerpo demasiado grande")
+        cuerpo = await lector.readexactly(largo) if largo else b""
+        return metodo.upper(), destino, version.upper(), encabezados, cuerpo
+
+    def _escribir_respuesta(self, escritor: asyncio.StreamWriter, estado: HTTPStatus, respuesta, mantener: bool):
+
+        cuerpo = json.dumps(respuesta, ensure_ascii=False).encode("utf-8")
+        escritor.write(
+            f"HTTP/1.1 {estado.value} {estado.phrase}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(cuerpo)}\r\n"
+            f"Connection: {'keep-alive' if mantener else 'close'}\r\n\r\n".encode("latin-1") + cuerpo
+        )
+
+    async def _despachar(self, metodo: str, destino: str, cuerpo: bytes) -> tuple[HTTPStatus, object]:
+
+        partes = urlsplit(destino)
+        consulta = {clave: valores[-1] for clave, valores in parse_qs(partes.query).items()}
+        metodos_de_la_ruta = []
+        for metodo_ruta, patron, manejador in self.__rutas__:
+            coincidencia = patron.fullmatch(partes.path.rstrip("/") or "/")
+            if coincidencia is None:
+                continue
+            metodos_de_la_ruta.append(metodo_ruta)
+            if metodo_ruta != metodo:
+                continue
+            try:
+                datos = json.loads(cuerpo) if cuerpo else {}
+                if not isinstance(datos, dict):
+                    raise DatoInvalidoException("El cuerpo debe ser un objeto JSON")
+                return await manejador(datos=datos, consulta=consulta, **coincidencia.groupdict())
+            except json.JSONDecodeError:
+                return HTTPStatus.BAD_REQUEST, {"error": "El cuerpo no es JSON valido"}
+            except Exception as e:
+                for tipo, estado in ESTADOS_POR_EXCEPCION:
+                    if isinstance(e, tipo):
+                        return estado, {"error": str(e)}
+                return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"Error inesperado: {e}"}
+        if metodos_de_la_ruta:
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"error": f"Metodo {metodo} no permitido"}
+        return HTTPStatus.NOT_FOUND, {"error": f"Ruta inexistente: {partes.path}"}
+
+    #Operaciones
+
+    async def _ejecutar(self, funcion, *args, **kwargs):
+
+        return await asyncio.get_running_loop().run_in_executor(self.__ejecutor__, partial(funcion, *args, **kwargs))
+
+    def _confirmado(self, funcion, *args, **kwargs):
+
+        # Corre una mutacion y la confirma en los almacenamientos antes de responder
+        resultado = funcion(*args, **kwargs)
+        self.__clinica__.confirmar()
+        return resultado
+
+    def _bloqueo_medico(self, matricula: str) -> asyncio.Lock | nullcontext:
+
+        if self.__serializado__:
+            return nullcontext()
+        return self.__bloqueos_medicos__[hash(matricula) % CANTIDAD_BLOQUEOS_MEDICOS]
+
+    async def _agregar_paciente(self, datos: dict, consulta: dict):
+
+        paciente = Paciente(_campo(datos, "nombre"), _campo(datos, "dni"), _campo(datos, "fecha_nacimiento"))
+        await self._ejecutar(self._confirmado, self.__clinica__.agregar_paciente, paciente)
+        return HTTPStatus.CREATED, paciente_a_dict(paciente)
+
+    async def _agregar_medico(self, datos: dict, consulta: dict):
+
+        medico = Medico(_campo(datos, "nombre"), _campo(datos, "matricula"))
+        for especialidad in parsear_especialidades(datos.get("especialidades")):
+            medico.agregar_especialidad(especialidad)
+        await self._ejecutar(self._confirmado, self.__clinica__.agregar_medico, medico)
+        return HTTPStatus.CREATED, medico_a_dict(medico)
+
+    async def _agregar_especialidad(self, datos: dict, consulta: dict, matricula: str):
+
+        especialidades = parsear_especialidades([datos])
+        async with self._bloqueo_medico(matricula):
+            medico = await self._ejecutar(self._confirmado, self.__clinica__.agregar_especialidad, matricula,
+                                          especialidades[0])
+        return HTTPStatus.CREATED, medico_a_dict(medico)
+
+    async def _agendar_turno(self, datos: dict, consulta: dict):
+
+        matricula = _campo(datos, "matricula")
+        fecha_hora = _fecha(_campo(datos, "fecha_hora"), "fecha_hora")
+        duracion = _entero(datos.get("duracion"), "duracion", DURACION_POR_DEFECTO)
+        async with self._bloqueo_medico(matricula):
+            await self._ejecutar(self._confirmado, self.__clinica__.agendar_turno, _campo(datos, "dni"),
+                                 matricula, _campo(datos, "especialidad"), fecha_hora, duracion)
+        return HTTPStatus.CREATED, {"id": id_turno(matricula, fecha_hora),
+                                    "dni": datos["dni"], "matricula": matricula, "especialidad": datos["especialidad"],
+                                    "fecha_hora": fecha_hora.isoformat(), "duracion": duracion}
+
+    async def _cancelar_turno(self, datos: dict, consulta: dict, id_turno: str):
+
+        # El id lleva ':' de la hora ISO, que un cliente puede mandar codificado
+        id_turno = unquote(id_turno)
+        matricula, _ = separar_id_turno(id_turno)
+        async with self._bloqueo_medico(matricula):
+            turno = await self._ejecutar(self._confirmado, self.__clinica__.cancelar_turno, id_turno)
+        return HTTPStatus.OK, turno_a_dict(turno)
+
+    async def _reprogramar_turno(self, datos: dict, consulta: dict, id_turno: str):
+
+        id_turno = unquote(id_turno)
+        matricula, _ = separar_id_turno(id_turno)
+        fecha_hora = _fecha(_campo(datos, "fecha_hora"), "fecha_hora")
+        duracion = _entero(datos.get("duracion"), "duracion", None)
+        async with self._bloqueo_medico(matricula):
+            turno = await self._ejecutar(self._confirmado, self.__clinica__.reprogramar_turno, id_turno,
+                                         fecha_hora, duracion)
+        return HTTPStatus.OK, turno_a_dict(turno)
+
+    async def _emitir_receta(self, datos: dict, consulta: dict):
+
+        medicamentos = datos.get("medicamentos")
+        if not isinstance(medicamentos, list) or not all(isinstance(m, str) for m in medicamentos):
+            raise DatoInvalidoException("El campo medicamentos debe ser una lista de textos")
+        await self._ejecutar(self._confirmado, self.__clinica__.emitir_receta,
+                             _campo(datos, "dni"), _campo(datos, "matricula"), medicamentos)
+        return HTTPStatus.CREATED, {"dni": datos["dni"], "matricula": datos["matricula"], "medicamentos": medicamentos}
+
+    async def _listar_pacientes(self, datos: dict, consulta: dict):
+
+        pacientes = await self._ejecutar(self.__clinica__.obtener_pacientes, _entero(consulta.get("offset"), "offset", 0),
+                                         _entero(consulta.get("limit"), "limit"))
+        return HTTPStatus.OK, [paciente_a_dict(p) for p in pacientes]
+
+    async def _listar_medicos(self, datos: dict, consulta: dict):
+
+        if "especialidad" in consulta:
+            medicos = await self._ejecutar(self.__clinica__.obtener_medicos_por_especialidad,
+                                           consulta["especialidad"], consulta.get("dia"))
+        else:
+            medicos = await self._ejecutar(self.__clinica__.obtener_medicos, _entero(consulta.get("offset"), "offset", 0),
+                                           _entero(consulta.get("limit"), "limit"))
+        return HTTPStatus.OK, [medico_a_dict(m) for m in medicos]
+
+    async def _listar_turnos(self, datos: dict, consulta: dict):
+
+        turnos = await self._ejecutar(
+            self.__clinica__.obtener_turnos, consulta.get("dni"), consulta.get("matricula"), consulta.get("especialidad"),
+            _fecha(consulta.get("desde"), "desde"), _fecha(consulta.get("hasta"), "hasta"),
+            _entero(consulta.get("offset"), "offset", 0), _entero(consulta.get("limit"), "limit")
+        )
+        return HTTPStatus.OK, [turno_a_dict(t) for t in turnos]
+
+    async def _buscar_disponibles(self, datos: dict, consulta: dict):
+
+        disponibles = await self._ejecutar(
+            self.__clinica__.buscar_turnos_disponibles, _campo(consulta, "especialidad"),
+            _entero(consulta.get("cantidad"), "cantidad", 1), _fecha(consulta.get("desde"), "desde"),
+            _entero(consulta.get("duracion"), "duracion", DURACION_POR_DEFECTO)
+        )
+        return HTTPStatus.OK, [{"fecha_hora": fecha_hora.isoformat(), "matricula": matricula}
+                               for fecha_hora, matricula in disponibles]
+
+    async def _ver_historia_clinica(self, datos: dict, consulta: dict, dni: str):
+
+        def ver():
+            historia = self.__clinica__.obtener_historia_clinica(dni)
+            return ([turno_a_dict(t) for t in historia.vista_turnos()],
+                    [receta_a_dict(r) for r in historia.vista_recetas()])
+
+        turnos, recetas = await self._ejecutar(ver)
+        return HTTPStatus.OK, {"dni": dni, "turnos": turnos, "recetas": recetas}
+
+    async def _ver_ocupacion(self, datos: dict, consulta: dict):
+
+        # Lee los contadores mantenidos al agendar, sin recorrer la agenda en cada consulta
+        dia = _fecha(_campo(consulta, "fecha"), "fecha").date()
+        matricula = consulta.get("matricula")
+
+        def ver():
+            contadores = self.__clinica__.obtener_contadores_ocupacion()
+            ocupacion = {"fecha": dia.isoformat(), "turnos": contadores.turnos_del_dia(dia),
+                         "por_especialidad": contadores.turnos_por_especialidad(dia),
+                         "por_hora": contadores.turnos_por_hora(dia)}
+            if matricula is not None:
+                ocupacion["medico"] = {"matricula": matricula,
+                                       "turnos": contadores.turnos_del_medico(matricula, dia),
+                                       "minutos_semana": contadores.carga_semanal(matricula, dia)}
+            return ocupacion
+
+        return HTTPStatus.OK, await self._ejecutar(ver)
+
+
+def main():
+
+    from src.persistencia.almacenamientoSQLite import AlmacenamientoSQLite
+    from src.persistencia.diario import Diario
+
+    parser = argparse.ArgumentParser(description="Servidor HTTP/JSON de la clinica")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8080)
+    parser.add_argument("--hilos", type=int, default=HILOS_POR_DEFECTO,
+                        help="hilos que atienden operaciones sobre una ClinicaConcurrente; "
+                             "con 1 se usa Clinica en un solo hilo")
+    parser.add_argument("--archivar-cada", type=float, default=INTERVALO_ARCHIVO,
+                        help="segundos entre cada archivado de turnos terminados; 0 lo desactiva")
+    persistencia = parser.add_mutually_exclusive_group()
+    persistencia.add_argument("--db", help="Archivo SQLite donde persistir los datos de la clinica")
+    persistencia.add_argument("--diario", help="Directorio del diario de operaciones y sus snapshots")
+    args = parser.parse_args()
+    if args.hilos < 1:
+        parser.error("--hilos debe ser al menos 1")
+
+    almacenamiento = AlmacenamientoSQLite(args.db) if args.db else None
+    diario = Diario(args.diario, intervalo_compactacion=INTERVALO_COMPACTACION) if args.diario else None
+    if args.hilos > 1:
+        clinica = ClinicaConcurrente(almacenamiento, diario)
+        ejecutor = ThreadPoolExecutor(max_workers=args.hilos)
+    else:
+        clinica = Clinica(almacenamiento, diario)
+        ejecutor = None
+    servidor = ServidorClinica(clinica, args.host, args.puerto, ejecutor, args.archivar_cada)
+
+    print(f"Escuchando en http://{args.host}:{args.puerto}")
+    try:
+        asyncio.run(servidor.servir())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for destino in (almacenamiento, diario):
+            if destino is not None:
+                destino.cerrar()
+
+
+if __name__ == "__main__":
+    main()
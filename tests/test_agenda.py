@@ -0,0 +1,65 @@
+import unittest
+from datetime import datetime, timedelta
+from src.models.agenda import Agenda
+from src.exceptions.error import TurnoOcupadoException
+
+class TestAgenda(unittest.TestCase):
+
+    def setUp(self):
+        self.agenda = Agenda()
+        self.agenda.agregar(datetime(2030, 6, 3, 9, 0), datetime(2030, 6, 3, 9, 30), "a")
+        self.agenda.agregar(datetime(2030, 6, 3, 11, 0), datetime(2030, 6, 3, 12, 0), "b")
+        self.agenda.agregar(datetime(2030, 6, 3, 15, 0), datetime(2030, 6, 3, 15, 30), "c")
+
+    #Superposicion
+
+    def test_detecta_superposicion_parcial(self):
+
+        self.assertTrue(self.agenda.hay_superposicion(datetime(2030, 6, 3, 9, 5), datetime(2030, 6, 3, 9, 35)))
+        self.assertTrue(self.agenda.hay_superposicion(datetime(2030, 6, 3, 10, 45), datetime(2030, 6, 3, 11, 15)))
+
+    def test_intervalos_contiguos_no_se_superponen(self):
+
+        self.assertFalse(self.agenda.hay_superposicion(datetime(2030, 6, 3, 9, 30), datetime(2030, 6, 3, 11, 0)))
+
+    def test_agregar_superpuesto_lanza_excepcion(self):
+
+        with self.assertRaises(TurnoOcupadoException):
+            self.agenda.agregar(datetime(2030, 6, 3, 11, 30), datetime(2030, 6, 3, 11, 45), "d")
+        self.assertEqual(len(self.agenda), 3)
+
+    def test_descartar_hasta_quita_el_prefijo_terminado(self):
+
+        self.assertEqual(self.agenda.descartar_hasta(datetime(2030, 6, 3, 12, 0)), ["a", "b"])
+        self.assertEqual(list(self.agenda), ["c"])
+        self.assertEqual(self.agenda.descartar_hasta(datetime(2030, 6, 3, 12, 0)), [])
+
+    def test_quitar_solo_el_elemento_indicado(self):
+
+        self.assertFalse(self.agenda.quitar(datetime(2030, 6, 3, 11, 0), "otro"))
+        self.assertFalse(self.agenda.quitar(datetime(2030, 6, 3, 16, 0), "c"))
+        self.assertTrue(self.agenda.quitar(datetime(2030, 6, 3, 11, 0), "b"))
+        self.assertEqual(list(self.agenda), ["a", "c"])
+        self.assertFalse(self.agenda.hay_superposicion(datetime(2030, 6, 3, 11, 0), datetime(2030, 6, 3, 12, 0)))
+
+    #Consultas por rango
+
+    def test_entre_devuelve_solo_intervalos_del_rango(self):
+
+        resultado = list(self.agenda.entre(datetime(2030, 6, 3, 10, 0), datetime(2030, 6, 3, 14, 0)))
+        self.assertEqual(resultado, ["b"])
+
+    def test_entre_incluye_intervalos_que_cruzan_los_bordes(self):
+
+        resultado = list(self.agenda.entre(datetime(2030, 6, 3, 9, 15), datetime(2030, 6, 3, 15, 1)))
+        self.assertEqual(resultado, ["a", "b", "c"])
+
+    #Inicios libres
+
+    def test_inicios_libres_saltea_intervalos_ocupados(self):
+
+        libres = list(self.agenda.inicios_libres(datetime(2030, 6, 3, 8, 0), datetime(2030, 6, 3, 12, 30), timedelta(minutes=30)))
+        self.assertEqual([inicio.strftime("%H:%M") for inicio in libres], ["08:00", "08:30", "09:30", "10:00", "10:30", "12:00"])
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
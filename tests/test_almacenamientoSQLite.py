@@ -0,0 +1,151 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime
+from src.models.paciente import Paciente
+from src.models.medico import Medico
+from src.models.especialidad import Especialidad
+from src.models.clinica import Clinica
+from src.persistencia.almacenamientoSQLite import AlmacenamientoSQLite
+from src.exceptions.error import (
+    PacienteDuplicadoException,
+    TurnoOcupadoException,
+    MedicoNoEncontradoException
+)
+
+class ConexionQueFalla:
+
+    # Deja pasar todo a la conexion real pero hace fallar el primer commit
+    def __init__(self, conexion):
+        self.conexion = conexion
+        self.fallar = True
+
+    def __getattr__(self, nombre):
+        return getattr(self.conexion, nombre)
+
+    def __enter__(self):
+        return self.conexion.__enter__()
+
+    def __exit__(self, *excepcion):
+        if self.fallar and excepcion[0] is None:
+            self.fallar = False
+            self.conexion.rollback()
+            raise sqlite3.OperationalError("disk I/O error")
+        return self.conexion.__exit__(*excepcion)
+
+class TestAlmacenamientoSQLite(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.directorio.name, "clinica.db")
+
+        almacenamiento = AlmacenamientoSQLite(self.ruta)
+        clinica = Clinica(almacenamiento)
+
+        clinica.agregar_paciente(Paciente("Lucia Herrera", "99887766", "05/01/1988"))
+        clinica.agregar_paciente(Paciente("Martin Diaz", "66554433", "18/09/1992"))
+        medico = Medico("Dr. Alejandro Ruiz", "MP201")
+        medico.agregar_especialidad(Especialidad("Cardiologia", ["lunes"]))
+        clinica.agregar_medico(medico)
+        medico.agregar_especialidad(Especialidad("Pediatria", ["martes"]))
+
+        clinica.agendar_turno("99887766", "MP201", "Cardiologia", datetime(2030, 6, 3, 10, 0))
+        clinica.agendar_turno("66554433", "MP201", "Pediatria", datetime(2030, 6, 4, 10, 0), 60)
+        clinica.emitir_receta("99887766", "MP201", ["Aspirina", "Paracetamol"])
+        almacenamiento.cerrar()
+
+        self.almacenamiento = AlmacenamientoSQLite(self.ruta)
+        self.clinica = Clinica(self.almacenamiento)
+
+    def tearDown(self):
+        self.almacenamiento.cerrar()
+        self.directorio.cleanup()
+
+    #Recuperacion del estado
+
+    def test_historia_clinica_recuperada(self):
+
+        historia = self.clinica.obtener_historia_clinica("99887766")
+        self.assertEqual(len(historia.obtener_turnos()), 1)
+        self.assertEqual(historia.obtener_turnos()[0].obtener_fecha_hora(), datetime(2030, 6, 3, 10, 0))
+        self.assertEqual(historia.obtener_recetas()[0].obtener_medicamentos(), ["Aspirina", "Paracetamol"])
+
+    def test_especialidad_agregada_despues_del_registro(self):
+
+        medico = self.clinica.obtener_medico_por_matricula("MP201")
+        self.assertTrue(medico.atiende("Pediatria", 1))
+
+    def test_indice_de_especialidades_incluye_medicos_persistidos(self):
+
+        medicos = self.clinica.obtener_medicos_por_especialidad("Pediatria", "martes")
+        self.assertEqual([m.obtener_matricula() for m in medicos], ["MP201"])
+
+    def test_turnos_filtrados_y_paginados(self):
+
+        turnos = self.clinica.obtener_turnos(dni="66554433")
+        self.assertEqual(len(turnos), 1)
+        self.assertEqual(turnos[0].obtener_duracion(), 60)
+        self.assertEqual([p.obtener_dni() for p in self.clinica.obtener_pacientes(offset=1, limit=1)], ["66554433"])
+        self.assertEqual(len(self.clinica.obtener_turnos()), 2)
+
+    #Validaciones contra datos persistidos
+
+    def test_validaciones_usan_datos_persistidos(self):
+
+        with self.assertRaises(PacienteDuplicadoException):
+            self.clinica.agregar_paciente(Paciente("Otra Persona", "99887766", "01/01/1990"))
+        with self.assertRaises(TurnoOcupadoException):
+            self.clinica.agendar_turno("66554433", "MP201", "Cardiologia", datetime(2030, 6, 3, 10, 15))
+        with self.assertRaises(MedicoNoEncontradoException):
+            self.clinica.obtener_medico_por_matricula("MP999")
+
+    def test_altas_nuevas_no_confirman_un_lote_cada_una(self):
+
+        for i in range(5):
+            self.clinica.agregar_paciente(Paciente("Paciente Nuevo", f"2000000{i}", "01/01/1990"))
+            self.clinica.agregar_medico(Medico("Dr. Nuevo", f"MP30{i}"))
+        self.assertEqual(self.almacenamiento.__cantidad_pendiente__, 10)
+
+        # Una clave pendiente si se confirma antes de buscarla
+        self.assertEqual(self.almacenamiento.cargar_paciente("20000003")[1], "20000003")
+        self.assertEqual(self.almacenamiento.__cantidad_pendiente__, 0)
+        with self.assertRaises(PacienteDuplicadoException):
+            self.clinica.agregar_paciente(Paciente("Otra Persona", "20000003", "01/01/1990"))
+
+    def test_historia_incluye_turnos_nuevos_sin_duplicar(self):
+
+        self.clinica.agendar_turno("99887766", "MP201", "Cardiologia", datetime(2030, 6, 10, 10, 0))
+        historia = self.clinica.obtener_historia_clinica("99887766")
+        self.assertEqual(len(historia.obtener_turnos()), 2)
+        self.assertEqual(len(self.clinica.obtener_turnos(matricula="MP201")), 3)
+
+    def test_cancelar_y_reprogramar_borran_la_fila(self):
+
+        self.clinica.agendar_turno("99887766", "MP201", "Cardiologia", datetime(2030, 6, 10, 10, 0))
+        self.clinica.cancelar_turno("MP201@2030-06-10T10:00:00")
+        self.clinica.reprogramar_turno("MP201@2030-06-03T10:00:00", datetime(2030, 6, 10, 10, 0))
+        self.almacenamiento.cerrar()
+
+        self.almacenamiento = AlmacenamientoSQLite(self.ruta)
+        clinica = Clinica(self.almacenamiento)
+        self.assertEqual([t.obtener_fecha_hora() for t in clinica.obtener_historia_clinica("99887766").obtener_turnos()],
+                         [datetime(2030, 6, 10, 10, 0)])
+        self.assertEqual(len(clinica.obtener_turnos()), 2)
+
+    def test_commit_fallido_conserva_lo_pendiente(self):
+
+        self.clinica.cancelar_turno("MP201@2030-06-03T10:00:00")
+        self.clinica.agregar_paciente(Paciente("Sofia Paez", "11223344", "02/03/1975"))
+        self.almacenamiento.__conexion__ = ConexionQueFalla(self.almacenamiento.__conexion__)
+        with self.assertRaises(sqlite3.OperationalError):
+            self.almacenamiento.confirmar()
+        self.almacenamiento.cerrar()
+
+        self.almacenamiento = AlmacenamientoSQLite(self.ruta)
+        clinica = Clinica(self.almacenamiento)
+        self.assertEqual([t.obtener_id() for t in clinica.obtener_turnos()], ["MP201@2030-06-04T10:00:00"])
+        self.assertEqual(clinica.obtener_paciente_por_dni("11223344").obtener_nombre(), "Sofia Paez")
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,125 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from src.models.paciente import Paciente
+from src.models.medico import Medico
+from src.models.especialidad import Especialidad
+from src.models.turno import Turno
+from src.models.clinica import Clinica
+from src.persistencia.almacenamientoSQLite import AlmacenamientoSQLite
+from src.exceptions.error import DatoInvalidoException, TurnoOcupadoException
+
+class TestArchivoTurnos(unittest.TestCase):
+
+    def setUp(self):
+        self.clinica = Clinica()
+
+        self.paciente1 = Paciente("Lucia Herrera", "99887766", "05/01/1988")
+        self.paciente2 = Paciente("Martin Diaz", "66554433", "18/09/1992")
+        self.clinica.agregar_paciente(self.paciente1)
+        self.clinica.agregar_paciente(self.paciente2)
+
+        self.medico = Medico("Dr. Alejandro Ruiz", "MP201")
+        self.medico.agregar_especialidad(Especialidad("Cardiologia", ["lunes", "martes"]))
+        self.clinica.agregar_medico(self.medico)
+
+        # Turnos pasados restaurados como lo hace el diario, y uno a futuro (2030-06-03 es lunes)
+        self.pasados = [
+            (self.paciente1, datetime(2020, 3, 2, 10, 0, 15, 250)),
+            (self.paciente2, datetime(2020, 3, 2, 10, 45)),
+            (self.paciente1, datetime(2021, 5, 4, 9, 0)),
+        ]
+        for paciente, fecha_hora in self.pasados:
+            self.clinica._registrar_turno(Turno.restaurar(paciente, self.medico, fecha_hora, "Cardiologia", 30))
+        self.clinica.agendar_turno("99887766", "MP201", "Cardiologia", datetime(2030, 6, 3, 10, 0))
+
+    #Archivado
+
+    def test_archivar_mueve_solo_los_turnos_terminados(self):
+
+        self.assertEqual(self.clinica.archivar_turnos(), 3)
+        self.assertEqual(len(self.clinica.obtener_archivo_turnos()), 3)
+        self.assertEqual(len(self.medico.obtener_turnos_entre(datetime(2000, 1, 1), datetime(2040, 1, 1))), 1)
+        self.assertEqual(self.clinica.archivar_turnos(), 0)
+
+    def test_consultas_incluyen_los_archivados(self):
+
+        self.clinica.archivar_turnos()
+        self.assertEqual(len(self.clinica.obtener_turnos()), 4)
+        fechas = [t.obtener_fecha_hora() for t in self.clinica.obtener_turnos(dni="99887766")]
+        self.assertEqual(fechas, [datetime(2020, 3, 2, 10, 0, 15, 250), datetime(2021, 5, 4, 9, 0),
+                                  datetime(2030, 6, 3, 10, 0)])
+        self.assertEqual(len(list(self.clinica.recorrer_turnos(hasta=datetime(2021, 1, 1)))), 2)
+        entre = self.clinica.obtener_turnos_medico_entre("MP201", datetime(2020, 3, 2, 10, 20), datetime(2030, 1, 1))
+        self.assertEqual([t.obtener_fecha_hora() for t in entre],
+                         [datetime(2020, 3, 2, 10, 0, 15, 250), datetime(2020, 3, 2, 10, 45), datetime(2021, 5, 4, 9, 0)])
+        self.assertEqual(self.clinica.verificar_contadores_ocupacion(), [])
+
+    def test_historia_clinica_conserva_los_archivados(self):
+
+        historia = self.clinica.obtener_historia_clinica("99887766")
+        antes = str(historia)
+        self.clinica.archivar_turnos()
+        self.assertEqual(len(historia.obtener_turnos()), 3)
+        self.assertEqual(str(historia), antes)
+        self.assertEqual(historia.vista_turnos()[0].obtener_paciente(), self.paciente1)
+
+    def test_agendar_despues_de_archivar(self):
+
+        self.clinica.archivar_turnos()
+        with self.assertRaises(TurnoOcupadoException):
+            self.clinica.agendar_turno("66554433", "MP201", "Cardiologia", datetime(2030, 6, 3, 10, 15))
+        self.clinica.agendar_turno("66554433", "MP201", "Cardiologia", datetime(2030, 6, 4, 10, 0))
+        self.assertEqual(len(self.clinica.obtener_historia_clinica("66554433").obtener_turnos()), 2)
+
+    def test_segmentos_se_fusionan_y_no_se_archiva_el_futuro(self):
+
+        self.assertEqual(self.clinica.archivar_turnos(datetime(2020, 12, 31)), 2)
+        self.assertEqual(self.clinica.archivar_turnos(datetime(2022, 1, 1)), 1)
+        self.assertEqual(len(self.clinica.obtener_archivo_turnos().obtener_segmentos()), 2)
+        self.clinica._registrar_turno(Turno.restaurar(self.paciente2, self.medico, datetime(2022, 2, 1, 9, 0),
+                                                      "Cardiologia", 30))
+        self.clinica._registrar_turno(Turno.restaurar(self.paciente2, self.medico, datetime(2022, 2, 1, 10, 0),
+                                                      "Cardiologia", 30))
+        self.assertEqual(self.clinica.archivar_turnos(datetime(2023, 1, 1)), 2)
+        self.assertEqual(len(self.clinica.obtener_archivo_turnos().obtener_segmentos()), 1)
+
+        with self.assertRaises(DatoInvalidoException):
+            self.clinica.archivar_turnos(datetime.now() + timedelta(days=1))
+
+    def test_con_almacenamiento_solo_archiva_lo_cargado(self):
+
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "clinica.db")
+            almacenamiento = AlmacenamientoSQLite(ruta)
+            clinica = Clinica(almacenamiento)
+            clinica.agregar_paciente(Paciente("Lucia Herrera", "99887766", "05/01/1988"))
+            clinica.agregar_paciente(Paciente("Martin Diaz", "66554433", "18/09/1992"))
+            for matricula in ("MP201", "MP202"):
+                medico = Medico("Dr. Alejandro Ruiz", matricula)
+                medico.agregar_especialidad(Especialidad("Cardiologia", ["lunes"]))
+                clinica.agregar_medico(medico)
+                for paciente, fecha_hora in self.pasados:
+                    clinica._registrar_turno(Turno.restaurar(paciente, medico, fecha_hora, "Cardiologia", 30))
+            almacenamiento.cerrar()
+
+            almacenamiento = AlmacenamientoSQLite(ruta)
+            clinica = Clinica(almacenamiento)
+            clinica.obtener_medico_por_matricula("MP201")
+            self.assertEqual(clinica.archivar_turnos(), 3)
+            self.assertFalse(clinica.__todo_cargado__)
+
+            # La historia se carga despues: los turnos de MP201 ya estan archivados y los de MP202 no
+            historia = clinica.obtener_historia_clinica("99887766")
+            self.assertEqual(len(historia.obtener_turnos()), 4)
+            self.assertEqual(len(historia.vista_turnos()), 4)
+            self.assertEqual(clinica.archivar_turnos(), 3)
+            self.assertEqual(len(clinica.obtener_archivo_turnos()), 6)
+            self.assertEqual([t.obtener_fecha_hora() for t in historia.obtener_turnos()][:2],
+                             [datetime(2020, 3, 2, 10, 0, 15, 250), datetime(2020, 3, 2, 10, 0, 15, 250)])
+            self.assertEqual(clinica.verificar_contadores_ocupacion(), [])
+            almacenamiento.cerrar()
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
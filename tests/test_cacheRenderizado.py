@@ -0,0 +1,137 @@
+import gc
+import threading
+import unittest
+from datetime import datetime
+from src.models.cacheRenderizado import CacheRenderizado
+from src.models.historiaClinica import HistoriaClinica
+from src.models.paciente import Paciente
+from src.models.medico import Medico
+from src.models.turno import Turno
+from src.models.receta import Receta
+from src.exceptions.error import DatoInvalidoException
+
+class TestCacheRenderizado(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = CacheRenderizado(capacidad=10)
+        self.medico = Medico("Dr. Roberto Silva", "MP101")
+
+    def crear_historia(self, dni, turnos):
+
+        paciente = Paciente("Carlos Rodríguez", dni, "25/12/1980")
+        historia = HistoriaClinica(paciente, cache=self.cache)
+        for i in range(turnos):
+            historia.agregar_turno(Turno(paciente, self.medico, datetime(2030, 6, 3 + i, 10, 0), "Medicina General"))
+        return historia
+
+    #Reutilizacion
+
+    def test_segunda_vista_no_vuelve_a_formatear(self):
+
+        historia = self.crear_historia("55667788", 3)
+        primera = str(historia)
+        self.assertEqual(self.cache.obtener_total_lineas(), 3)
+
+        segunda = str(historia)
+        self.assertEqual(segunda, primera)
+        self.assertEqual(self.cache.obtener_total_lineas(), 3)
+
+    def test_agregar_extiende_el_cache(self):
+
+        historia = self.crear_historia("55667788", 2)
+        str(historia)
+        historia.agregar_receta(Receta(historia.obtener_turnos()[0].obtener_paciente(), self.medico, ["Aspirina"]))
+
+        texto = str(historia)
+        self.assertIn("1. Receta del", texto)
+        self.assertEqual(self.cache.obtener_total_lineas(), 3)
+
+    def test_pagina_solo_guarda_lo_mostrado(self):
+
+        historia = self.crear_historia("55667788", 20)
+        "".join(historia.renderizar(ultimos=2))
+        lineas_turnos, lineas_recetas, cantidad, _ = self.cache.obtener(historia)
+        self.assertEqual(sorted(lineas_turnos), [19, 20])
+        self.assertEqual((lineas_recetas, cantidad), ({}, 2))
+
+    def test_pagina_solo_formatea_lo_mostrado(self):
+
+        historia = self.crear_historia("55667788", 5)
+        "".join(historia.renderizar(ultimos=2))
+        self.assertEqual(self.cache.obtener_total_lineas(), 2)
+        self.assertEqual(str(historia), str(self.crear_historia("11223344", 5)).replace("11223344", "55667788"))
+
+    #Desalojo
+
+    def test_desaloja_la_historia_menos_usada(self):
+
+        vieja = self.crear_historia("11111111", 4)
+        reciente = self.crear_historia("22222222", 4)
+        str(vieja)
+        str(reciente)
+        str(vieja)
+
+        str(self.crear_historia("33333333", 4))
+        self.assertIn(vieja, self.cache)
+        self.assertNotIn(reciente, self.cache)
+        self.assertLessEqual(self.cache.obtener_total_lineas(), 10)
+
+    def test_invalidar_descarta_las_lineas(self):
+
+        historia = self.crear_historia("55667788", 3)
+        str(historia)
+        self.cache.invalidar(historia)
+        self.assertNotIn(historia, self.cache)
+        self.assertEqual(self.cache.obtener_total_lineas(), 0)
+
+    def test_historia_vacia_no_ocupa_lugar(self):
+
+        str(self.crear_historia("55667788", 0))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_no_mantiene_viva_la_historia(self):
+
+        historia = self.crear_historia("55667788", 3)
+        str(historia)
+        self.assertEqual(len(self.cache), 1)
+
+        del historia
+        gc.collect()
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.obtener_total_lineas(), 0)
+
+    #Concurrencia
+
+    def test_hilos_que_renderizan_y_desalojan_a_la_vez(self):
+
+        historias = [self.crear_historia(f"{i:08d}", 3) for i in range(8)]
+        esperados = [str(historia) for historia in historias]
+        errores = []
+
+        def renderizar(desplazamiento):
+            try:
+                for vuelta in range(300):
+                    i = (vuelta + desplazamiento) % len(historias)
+                    if str(historias[i]) != esperados[i]:
+                        errores.append(i)
+                    if vuelta % 7 == 0:
+                        self.cache.invalidar(historias[i])
+            except Exception as e:
+                errores.append(e)
+
+        hilos = [threading.Thread(target=renderizar, args=(n,)) for n in range(6)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+        self.assertEqual(errores, [])
+        self.assertLessEqual(self.cache.obtener_total_lineas(), 10)
+
+    def test_capacidad_invalida(self):
+
+        with self.assertRaises(DatoInvalidoException):
+            CacheRenderizado(capacidad=-1)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
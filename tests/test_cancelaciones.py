@@ -0,0 +1,120 @@
+import unittest
+from datetime import datetime
+from src.models.paciente import Paciente
+from src.models.medico import Medico
+from src.models.especialidad import Especialidad
+from src.models.turno import Turno
+from src.models.clinica import Clinica
+from src.exceptions.error import (
+    DatoInvalidoException,
+    MedicoNoDisponibleException,
+    TurnoNoEncontradoException,
+    TurnoOcupadoException
+)
+
+class TestCancelaciones(unittest.TestCase):
+
+    def setUp(self):
+        self.clinica = Clinica()
+
+        self.clinica.agregar_paciente(Paciente("Lucia Herrera", "99887766", "05/01/1988"))
+        self.clinica.agregar_paciente(Paciente("Martin Diaz", "66554433", "18/09/1992"))
+        self.medico = Medico("Dr. Alejandro Ruiz", "MP201")
+        self.medico.agregar_especialidad(Especialidad("Cardiologia", ["lunes"]))
+        self.clinica.agregar_medico(self.medico)
+
+        # 2030-06-03 es lunes
+        self.clinica.agendar_turno("99887766", "MP201", "Cardiologia", datetime(2030, 6, 3, 10, 0))
+        self.clinica.agendar_turno("66554433", "MP201", "Cardiologia", datetime(2030, 6, 3, 10, 30))
+        self.historia = self.clinica.obtener_historia_clinica("99887766")
+
+    def agenda(self):
+
+        return self.medico.obtener_turnos_entre(datetime(2030, 1, 1), datetime(2031, 1, 1))
+
+    #Cancelar
+
+    def test_id_del_turno(self):
+
+        turno = self.clinica.obtener_turnos(dni="99887766")[0]
+        self.assertEqual(turno.obtener_id(), "MP201@2030-06-03T10:00:00")
+        self.assertIs(self.clinica.obtener_turno("MP201@2030-06-03T10:00:00"), turno)
+
+    def test_cancelar_quita_el_turno_de_todas_las_estructuras(self):
+
+        str(self.historia)
+        turno = self.clinica.cancelar_turno("MP201@2030-06-03T10:00:00")
+
+        self.assertEqual(turno.obtener_paciente().obtener_dni(), "99887766")
+        self.assertEqual([t.obtener_paciente().obtener_dni() for t in self.clinica.obtener_turnos()], ["66554433"])
+        self.assertEqual(self.clinica.obtener_turnos(dni="99887766"), [])
+        self.assertEqual(len(self.agenda()), 1)
+        self.assertEqual(self.historia.obtener_turnos(), [])
+        self.assertIn("No hay turnos registrados.", str(self.historia))
+        self.assertEqual(len(self.clinica.obtener_columnas_turnos()), 1)
+        self.assertEqual(self.clinica.obtener_contadores_ocupacion().turnos_del_dia(datetime(2030, 6, 3)), 1)
+        self.assertEqual(self.clinica.verificar_contadores_ocupacion(), [])
+
+        # El horario queda libre para otro paciente
+        self.clinica.agendar_turno("66554433", "MP201", "Cardiologia", datetime(2030, 6, 3, 10, 0))
+        self.assertEqual(len(self.agenda()), 2)
+
+    def test_cancelar_turno_inexistente(self):
+
+        with self.assertRaises(TurnoNoEncontradoException):
+            self.clinica.cancelar_turno("MP201@2030-06-03T11:00:00")
+        with self.assertRaises(TurnoNoEncontradoException):
+            self.clinica.cancelar_turno("MP999@2030-06-03T10:00:00")
+        with self.assertRaises(DatoInvalidoException):
+            self.clinica.cancelar_turno("MP201-2030-06-03")
+        self.clinica.cancelar_turno("MP201@2030-06-03T10:00:00")
+        with self.assertRaises(TurnoNoEncontradoException):
+            self.clinica.cancelar_turno("MP201@2030-06-03T10:00:00")
+
+    def test_los_turnos_archivados_no_se_cancelan(self):
+
+        paciente = self.clinica.obtener_paciente_por_dni("99887766")
+        self.clinica._registrar_turno(Turno.restaurar(paciente, self.medico, datetime(2020, 3, 2, 10, 0), "Cardiologia", 30))
+        self.clinica.archivar_turnos()
+        with self.assertRaises(TurnoNoEncontradoException):
+            self.clinica.cancelar_turno("MP201@2020-03-02T10:00:00")
+
+    #Reprogramar
+
+    def test_reprogramar_mueve_el_turno(self):
+
+        nuevo = self.clinica.reprogramar_turno("MP201@2030-06-03T10:00:00", datetime(2030, 6, 10, 9, 0), 45)
+
+        self.assertEqual(nuevo.obtener_id(), "MP201@2030-06-10T09:00:00")
+        self.assertEqual(nuevo.obtener_duracion(), 45)
+        self.assertEqual([t.obtener_fecha_hora() for t in self.historia.obtener_turnos()], [datetime(2030, 6, 10, 9, 0)])
+        self.assertEqual([t.obtener_fecha_hora() for t in self.agenda()],
+                         [datetime(2030, 6, 3, 10, 30), datetime(2030, 6, 10, 9, 0)])
+        self.assertEqual(len(self.clinica.obtener_columnas_turnos()), 2)
+        self.assertEqual(self.clinica.verificar_contadores_ocupacion(), [])
+
+    def test_reprogramar_puede_pisar_su_propio_horario(self):
+
+        # 09:45 a 10:15 se superpone solo con el turno que se esta moviendo
+        self.clinica.reprogramar_turno("MP201@2030-06-03T10:00:00", datetime(2030, 6, 3, 9, 45))
+        self.clinica.reprogramar_turno("MP201@2030-06-03T09:45:00", datetime(2030, 6, 3, 9, 45), 15)
+        turno = self.clinica.obtener_turno("MP201@2030-06-03T09:45:00")
+        self.assertEqual(turno.obtener_duracion(), 15)
+        self.assertEqual(len(self.agenda()), 2)
+
+    def test_reprogramar_fallido_conserva_el_turno(self):
+
+        turno = self.clinica.obtener_turno("MP201@2030-06-03T10:00:00")
+        with self.assertRaises(TurnoOcupadoException):
+            self.clinica.reprogramar_turno("MP201@2030-06-03T10:00:00", datetime(2030, 6, 3, 10, 15))
+        with self.assertRaises(MedicoNoDisponibleException):
+            self.clinica.reprogramar_turno("MP201@2030-06-03T10:00:00", datetime(2030, 6, 4, 10, 0))
+
+        self.assertIs(self.clinica.obtener_turno("MP201@2030-06-03T10:00:00"), turno)
+        self.assertEqual(len(self.agenda()), 2)
+        self.assertEqual(self.historia.obtener_turnos(), [turno])
+        with self.assertRaises(TurnoOcupadoException):
+            self.clinica.agendar_turno("66554433", "MP201", "Cardiologia", datetime(2030, 6, 3, 10, 0))
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,159 @@
+import sys
+import threading
+import unittest
+from datetime import datetime, timedelta
+from src.models.paciente import Paciente
+from src.models.medico import Medico
+from src.models.especialidad import Especialidad
+from src.models.clinicaConcurrente import ClinicaConcurrente
+from src.exceptions.error import DatoInvalidoException, TurnoOcupadoException
+
+class TestClinicaConcurrente(unittest.TestCase):
+
+    def setUp(self):
+        self.clinica = ClinicaConcurrente(franjas=4)
+        for i in range(8):
+            self.clinica.agregar_paciente(Paciente("Lucia Herrera", f"{10000000 + i}", "05/01/1988"))
+        for i in range(4):
+            medico = Medico("Dr. Alejandro Ruiz", f"MP{i}")
+            medico.agregar_especialidad(Especialidad("Cardiologia", ["lunes"]))
+            self.clinica.agregar_medico(medico)
+
+    def en_paralelo(self, cantidad, objetivo):
+
+        resultados = []
+        barrera = threading.Barrier(cantidad)
+
+        def correr(numero):
+            barrera.wait()
+            try:
+                objetivo(numero)
+                resultados.append(True)
+            except TurnoOcupadoException:
+                resultados.append(False)
+
+        hilos = [threading.Thread(target=correr, args=(numero,)) for numero in range(cantidad)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        return resultados
+
+    #Reservas concurrentes
+
+    def test_mismo_horario_se_otorga_una_sola_vez(self):
+
+        resultados = self.en_paralelo(8, lambda n: self.clinica.agendar_turno(
+            f"{10000000 + n}", "MP0", "Cardiologia", datetime(2030, 6, 3, 10, n)))
+
+        self.assertEqual(resultados.count(True), 1)
+        self.assertEqual(len(self.clinica.obtener_turnos(matricula="MP0")), 1)
+
+    def test_medicos_distintos_no_se_bloquean(self):
+
+        resultados = self.en_paralelo(8, lambda n: self.clinica.agendar_turno(
+            f"{10000000 + n}", f"MP{n % 4}", "Cardiologia", datetime(2030, 6, 3, 10, 0) + timedelta(hours=n // 4)))
+
+        self.assertTrue(all(resultados))
+        self.assertEqual(len(self.clinica.obtener_turnos()), 8)
+        self.assertEqual(len(self.clinica.obtener_historia_clinica("10000003").vista_turnos()), 1)
+
+    def test_lote_con_reservas_individuales(self):
+
+        reporte = self.clinica.agendar_turnos_lote([("10000000", "MP1", "Cardiologia", datetime(2030, 6, 3, 9, 0))])
+        self.assertTrue(reporte[0]["ok"])
+        with self.assertRaises(TurnoOcupadoException):
+            self.clinica.agendar_turno("10000001", "MP1", "Cardiologia", datetime(2030, 6, 3, 9, 15))
+
+    def test_cancelar_y_reagendar_en_paralelo(self):
+
+        for n in range(8):
+            self.clinica.agendar_turno(f"{10000000 + n}", f"MP{n % 4}", "Cardiologia",
+                                       datetime(2030, 6, 3, 10, 0) + timedelta(hours=n // 4))
+
+        movidos = {}
+
+        def cancelar_y_reagendar(n):
+            fecha_hora = datetime(2030, 6, 3, 10, 0) + timedelta(hours=n // 4)
+            turno = self.clinica.cancelar_turno(f"MP{n % 4}@{fecha_hora.isoformat()}")
+            self.clinica.agendar_turno(f"{10000000 + (n + 1) % 8}", f"MP{n % 4}", "Cardiologia", fecha_hora)
+            movidos[n] = self.clinica.reprogramar_turno(turno.obtener_id(), fecha_hora + timedelta(days=7))
+
+        self.assertTrue(all(self.en_paralelo(8, cancelar_y_reagendar)))
+        for n, movido in movidos.items():
+            self.assertEqual(movido.obtener_fecha_hora(), datetime(2030, 6, 10, 10, 0) + timedelta(hours=n // 4))
+        self.assertEqual(len(movidos), 8)
+        self.assertEqual(len(self.clinica.obtener_turnos(desde=datetime(2030, 6, 10))), 8)
+        self.assertEqual(len(self.clinica.obtener_turnos()), 8)
+        self.assertEqual(self.clinica.verificar_contadores_ocupacion(), [])
+
+    #Lecturas concurrentes
+
+    def test_lecturas_mientras_se_agenda(self):
+
+        errores = []
+        terminado = threading.Event()
+        # Agendas ya cargadas para que cada recorrido dure lo suficiente como para cruzarse
+        self.clinica.agendar_turnos_lote([
+            (f"{10000001 + i % 7}", f"MP{i % 4}", "Cardiologia",
+             datetime(2030, 8, 5) + timedelta(days=7 * (i // 192), minutes=30 * (i // 4 % 48)))
+            for i in range(1920)
+        ])
+
+        def agendar(n):
+            for i in range(120):
+                fecha_hora = datetime(2030, 6, 3) + timedelta(days=7 * (i // 48), minutes=30 * (i % 48))
+                self.clinica.agendar_turno("10000000", f"MP{n}", "Cardiologia", fecha_hora)
+
+        lecturas = [
+            lambda: sum(1 for _ in self.clinica.obtener_historia_clinica("10000000").vista_turnos()),
+            lambda: str(self.clinica.obtener_historia_clinica("10000000")),
+            lambda: sum(1 for _ in self.clinica.vista_turnos()),
+            lambda: sum(1 for _ in self.clinica.recorrer_turnos(dni="10000000")),
+            lambda: self.clinica.obtener_turnos_medico_entre("MP0", datetime(2030, 6, 3), datetime(2030, 7, 1)),
+            lambda: self.clinica.obtener_contadores_ocupacion().turnos_por_hora(datetime(2030, 6, 3)),
+            lambda: self.clinica.obtener_columnas_turnos().utilizacion_semanal(),
+            lambda: self.clinica.buscar_turnos_disponibles("Cardiologia", 5, desde=datetime(2030, 6, 3)),
+        ]
+
+        def leer(lectura):
+            while not terminado.is_set():
+                try:
+                    lectura()
+                except Exception as error:
+                    errores.append(error)
+                    return
+
+        # Cambios de hilo frecuentes para que las lecturas se crucen con las reservas
+        intervalo = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        lectores = [threading.Thread(target=leer, args=(lectura,)) for lectura in lecturas]
+        for lector in lectores:
+            lector.start()
+        try:
+            self.assertTrue(all(self.en_paralelo(4, agendar)))
+        finally:
+            terminado.set()
+            for lector in lectores:
+                lector.join()
+            sys.setswitchinterval(intervalo)
+
+        self.assertEqual(errores, [])
+        self.assertEqual(len(self.clinica.obtener_historia_clinica("10000000").vista_turnos()), 480)
+        self.assertEqual(self.clinica.verificar_contadores_ocupacion(), [])
+
+    def test_agregar_especialidad_a_medico_registrado(self):
+
+        self.clinica.agregar_especialidad("MP0", Especialidad("Pediatria", ["martes"]))
+
+        self.assertEqual([medico.obtener_matricula() for medico in
+                          self.clinica.obtener_medicos_por_especialidad("Pediatria", "martes")], ["MP0"])
+        self.clinica.agendar_turno("10000000", "MP0", "Pediatria", datetime(2030, 6, 4, 10, 0))
+
+    def test_franjas_invalidas(self):
+
+        with self.assertRaises(DatoInvalidoException):
+            ClinicaConcurrente(franjas=0)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,116 @@
+import unittest
+from datetime import datetime, timedelta
+from src.models.paciente import Paciente
+from src.models.medico import Medico
+from src.models.especialidad import Especialidad
+from src.models.clinica import Clinica
+from src.models.columnasTurnos import COMPACTAR_DESDE, ColumnasTurnos, minuto_epoca
+
+class TestColumnasTurnos(unittest.TestCase):
+
+    def setUp(self):
+        self.clinica = Clinica()
+
+        self.clinica.agregar_paciente(Paciente("Lucia Herrera", "99887766", "05/01/1988"))
+        self.clinica.agregar_paciente(Paciente("Martin Diaz", "66554433", "18/09/1992"))
+
+        medico1 = Medico("Dr. Alejandro Ruiz", "MP201")
+        medico1.agregar_especialidad(Especialidad("Cardiología", ["lunes"]))
+        medico1.agregar_especialidad(Especialidad("Pediatria", ["martes"]))
+        medico2 = Medico("Dra. Sofia Castro", "MP202")
+        medico2.agregar_especialidad(Especialidad("Cardiologia", ["lunes", "martes"]))
+        self.clinica.agregar_medico(medico1)
+        self.clinica.agregar_medico(medico2)
+
+        # 2030-06-03 es lunes
+        self.clinica.agendar_turno("99887766", "MP201", "Cardiologia", datetime(2030, 6, 3, 10, 0))
+        self.clinica.agendar_turno("66554433", "MP201", "Cardiologia", datetime(2030, 6, 3, 10, 30), 60)
+        self.clinica.agendar_turno("66554433", "MP201", "Pediatria", datetime(2030, 6, 4, 11, 0))
+        self.clinica.agendar_turno("99887766", "MP202", "cardiologia", datetime(2030, 7, 1, 9, 0))
+        self.columnas = self.clinica.obtener_columnas_turnos()
+
+    #Consultas
+
+    def test_refleja_los_turnos_agendados(self):
+
+        self.assertEqual(len(self.columnas), 4)
+        self.assertEqual(minuto_epoca(datetime(1970, 1, 2, 1, 5)), 1440 + 65)
+
+    def test_utilizacion_semanal(self):
+
+        # El turno de 60 minutos de las 10:30 reparte 30 a las 10 y 30 a las 11
+        self.assertEqual(self.columnas.utilizacion_semanal(), {
+            ("MP201", "lunes", 10): 60,
+            ("MP201", "lunes", 11): 30,
+            ("MP201", "martes", 11): 30,
+            ("MP202", "lunes", 9): 30,
+        })
+        self.assertEqual(self.columnas.utilizacion_semanal(matricula="MP202"), {("MP202", "lunes", 9): 30})
+
+    def test_utilizacion_reparte_turnos_largos_entre_horas(self):
+
+        columnas = ColumnasTurnos()
+        # 2030-06-09 es domingo: el turno de las 23:30 sigue en el lunes 00:00 de la semana tipo
+        columnas.agregar_fila("99887766", "MP201", "Cardiologia", datetime(2030, 6, 3, 10, 30), 90)
+        columnas.agregar_fila("66554433", "MP201", "Cardiologia", datetime(2030, 6, 4, 10, 30), 90)
+        columnas.agregar_fila("66554433", "MP201", "Cardiologia", datetime(2030, 6, 9, 23, 30), 45)
+        self.assertEqual(columnas.utilizacion_semanal(), {
+            ("MP201", "lunes", 10): 30,
+            ("MP201", "lunes", 11): 60,
+            ("MP201", "martes", 10): 30,
+            ("MP201", "martes", 11): 60,
+            ("MP201", "domingo", 23): 30,
+            ("MP201", "lunes", 0): 15,
+        })
+        self.assertTrue(all(minutos <= 60 for minutos in columnas.utilizacion_semanal().values()))
+
+    def test_cantidad_por_especialidad_con_rango(self):
+
+        self.assertEqual(self.columnas.cantidad_por_especialidad(), {"Cardiologia": 3, "Pediatria": 1})
+        self.assertEqual(self.columnas.cantidad_por_especialidad(desde=datetime(2030, 6, 3, 10, 30),
+                                                                 hasta=datetime(2030, 7, 1, 9, 0)),
+                         {"Cardiologia": 1, "Pediatria": 1})
+
+    def test_tendencia_mensual(self):
+
+        self.assertEqual(self.columnas.tendencia_mensual(), {(2030, 6): 3, (2030, 7): 1})
+        self.assertEqual(self.columnas.tendencia_mensual(especialidad="CARDIOLOGÍA", matricula="MP201"),
+                         {(2030, 6): 2})
+        self.assertEqual(self.columnas.tendencia_mensual(matricula="MP999"), {})
+
+    def test_lote_tambien_actualiza_las_columnas(self):
+
+        self.clinica.agendar_turnos_lote([("99887766", "MP202", "Cardiologia", datetime(2030, 6, 10, 9, 0))])
+        self.assertEqual(self.columnas.tendencia_mensual(matricula="MP202"), {(2030, 6): 1, (2030, 7): 1})
+
+    def test_agregar_lote_equivale_a_agregar_de_a_uno(self):
+
+        turnos = list(self.clinica.vista_turnos())
+        de_a_uno = ColumnasTurnos()
+        for turno in turnos:
+            de_a_uno.agregar(turno)
+        por_lote = ColumnasTurnos()
+        por_lote.agregar_lote(turnos[:1])
+        por_lote.agregar_lote(turnos[1:])
+
+        for atributo in ColumnasTurnos.__slots__:
+            self.assertEqual(getattr(por_lote, atributo), getattr(de_a_uno, atributo), atributo)
+
+    def test_cancelaciones_se_excluyen_y_se_compactan(self):
+
+        self.clinica.cancelar_turno("MP201@2030-06-03T10:00:00")
+        self.assertEqual(len(self.columnas), 3)
+        self.assertEqual(self.columnas.cantidad_por_especialidad(), {"Cardiologia": 2, "Pediatria": 1})
+
+        # Con COMPACTAR_DESDE filas borradas que son la mitad del total se reescriben las columnas
+        for i in range(COMPACTAR_DESDE):
+            self.clinica.agendar_turno("99887766", "MP202", "Cardiologia", datetime(2031, 1, 6, 0, 0) + timedelta(weeks=i))
+        for i in range(COMPACTAR_DESDE):
+            self.clinica.cancelar_turno(f"MP202@{(datetime(2031, 1, 6, 0, 0) + timedelta(weeks=i)).isoformat()}")
+        self.assertEqual(len(self.columnas), 3)
+        self.assertEqual(self.columnas.tendencia_mensual(matricula="MP202"), {(2030, 7): 1})
+        self.clinica.cancelar_turno("MP202@2030-07-01T09:00:00")
+        self.assertEqual(self.columnas.cantidad_por_especialidad(), {"Cardiologia": 1, "Pediatria": 1})
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,80 @@
+import io
+import unittest
+from datetime import datetime
+from src.models.clinica import Clinica
+from src.comandos import EjecutorComandos, separar
+
+class TestComandos(unittest.TestCase):
+
+    def setUp(self):
+        self.clinica = Clinica()
+        self.salida = io.StringIO()
+        self.ejecutor = EjecutorComandos(self.clinica, self.salida)
+
+    def ejecutar(self, texto):
+
+        return self.ejecutor.ejecutar(texto.splitlines())
+
+    #Separacion de argumentos
+
+    def test_separar_con_y_sin_comillas(self):
+
+        self.assertEqual(separar('paciente "Lucia Herrera" 99887766 05/01/1988'),
+                         ["paciente", "Lucia Herrera", "99887766", "05/01/1988"])
+        self.assertEqual(separar("historia 99887766 # ultimos"), ["historia", "99887766"])
+        with self.assertRaises(ValueError):
+            separar('paciente "Lucia Herrera 99887766')
+
+    #Ejecucion
+
+    def test_operaciones_sobre_la_clinica(self):
+
+        reporte = self.ejecutar(
+            '# alta de datos\n'
+            'paciente "Lucia Herrera" 99887766 05/01/1988\n'
+            'medico "Dr. Alejandro Ruiz" MP201 "Cardiologia:lunes"\n'
+            'especialidad MP201 Pediatria martes\n'
+            '\n'
+            'turno 99887766 MP201 Cardiologia 03/06/2030 10:00\n'
+            'turno 99887766 MP201 Pediatria 04/06/2030 10:00 60\n'
+            'receta 99887766 MP201 Aspirina "Vitamina C"\n'
+            'historia 99887766\n'
+        )
+
+        self.assertFalse(reporte["fallidas"])
+        self.assertEqual(reporte["exitosas"]["turno"], 2)
+        historia = self.clinica.obtener_historia_clinica("99887766")
+        self.assertEqual(historia.obtener_turnos()[1].obtener_fecha_hora(), datetime(2030, 6, 4, 10, 0))
+        self.assertEqual(historia.obtener_turnos()[1].obtener_duracion(), 60)
+        self.assertEqual(historia.obtener_recetas()[0].obtener_medicamentos(), ["Aspirina", "Vitamina C"])
+        self.assertIn("Turno agendado exitosamente.", self.salida.getvalue())
+        self.assertIn(str(historia), self.salida.getvalue())
+
+    def test_errores_se_informan_y_no_cortan(self):
+
+        reporte = self.ejecutar(
+            'paciente "Lucia Herrera" 99887766 05/01/1988\n'
+            'turno 99887766 MP999 Cardiologia 03/06/2030 10:00\n'
+            'turno 99887766 MP201 Cardiologia 2030-06-03 10:00\n'
+            'bailar 1 2\n'
+            'paciente "Martin Diaz" 66554433 18/09/1992\n'
+        )
+
+        self.assertEqual(reporte["exitosas"]["paciente"], 2)
+        self.assertEqual(reporte["fallidas"]["turno"], 2)
+        self.assertEqual(reporte["fallidas"]["bailar"], 1)
+        self.assertIn("linea 2:", self.salida.getvalue())
+        self.assertIn("linea 4: Operacion desconocida: bailar", self.salida.getvalue())
+
+    def test_modo_resumen(self):
+
+        ejecutor = EjecutorComandos(self.clinica, self.salida, resumen=True)
+        reporte = ejecutor.ejecutar(['paciente "Lucia Herrera" 99887766 05/01/1988', "paciente x"])
+        ejecutor.escribir_resumen(reporte)
+
+        self.assertNotIn("agregado exitosamente", self.salida.getvalue())
+        self.assertIn("2 operaciones", self.salida.getvalue())
+        self.assertIn("paciente: 1 exitosas, 1 con errores", self.salida.getvalue())
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
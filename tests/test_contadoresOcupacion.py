@@ -0,0 +1,84 @@
+import unittest
+from datetime import date, datetime
+from src.models.paciente import Paciente
+from src.models.medico import Medico
+from src.models.especialidad import Especialidad
+from src.models.clinica import Clinica
+from src.models.contadoresOcupacion import ContadoresOcupacion
+
+class TestContadoresOcupacion(unittest.TestCase):
+
+    def setUp(self):
+        self.clinica = Clinica()
+
+        self.clinica.agregar_paciente(Paciente("Lucia Herrera", "99887766", "05/01/1988"))
+        self.clinica.agregar_paciente(Paciente("Martin Diaz", "66554433", "18/09/1992"))
+
+        medico1 = Medico("Dr. Alejandro Ruiz", "MP201")
+        medico1.agregar_especialidad(Especialidad("Cardiología", ["lunes"]))
+        medico1.agregar_especialidad(Especialidad("Pediatria", ["martes"]))
+        medico2 = Medico("Dra. Sofia Castro", "MP202")
+        medico2.agregar_especialidad(Especialidad("Cardiologia", ["lunes", "martes"]))
+        self.clinica.agregar_medico(medico1)
+        self.clinica.agregar_medico(medico2)
+
+        # 2030-06-03 es lunes
+        self.clinica.agendar_turno("99887766", "MP201", "Cardiologia", datetime(2030, 6, 3, 10, 0))
+        self.clinica.agendar_turno("66554433", "MP201", "Cardiologia", datetime(2030, 6, 3, 10, 30), 60)
+        self.clinica.agendar_turno("66554433", "MP202", "cardiologia", datetime(2030, 6, 3, 11, 0))
+        self.clinica.agendar_turno("66554433", "MP201", "Pediatria", datetime(2030, 6, 4, 11, 0))
+        self.contadores = self.clinica.obtener_contadores_ocupacion()
+
+    #Lecturas
+
+    def test_turnos_del_dia_por_especialidad(self):
+
+        self.assertEqual(self.contadores.turnos_del_dia(date(2030, 6, 3)), 3)
+        self.assertEqual(self.contadores.turnos_del_dia(date(2030, 6, 3), "CARDIOLOGÍA"), 3)
+        self.assertEqual(self.contadores.turnos_del_dia(datetime(2030, 6, 4, 15, 0), "Cardiologia"), 0)
+        self.assertEqual(self.contadores.turnos_por_especialidad(date(2030, 6, 4)), {"Pediatria": 1})
+        self.assertEqual(self.contadores.turnos_por_especialidad(date(2030, 6, 5)), {})
+
+    def test_turnos_por_hora_y_por_medico(self):
+
+        self.assertEqual(self.contadores.turnos_por_hora(date(2030, 6, 3)), {10: 2, 11: 1})
+        self.assertEqual(self.contadores.turnos_del_medico("MP201", date(2030, 6, 3)), 2)
+        self.assertEqual(self.contadores.turnos_del_medico("MP999", date(2030, 6, 3)), 0)
+
+    def test_carga_semanal_en_minutos(self):
+
+        self.assertEqual(self.contadores.carga_semanal("MP201", date(2030, 6, 9)), 120)
+        self.assertEqual(self.contadores.carga_semanal("MP202", date(2030, 6, 3)), 30)
+        self.assertEqual(self.contadores.carga_semanal("MP201", date(2030, 6, 10)), 0)
+
+    def test_lote_tambien_actualiza_los_contadores(self):
+
+        self.clinica.agendar_turnos_lote([("99887766", "MP202", "Cardiologia", datetime(2030, 6, 4, 9, 0))])
+        self.assertEqual(self.contadores.turnos_del_dia(date(2030, 6, 4), "Cardiologia"), 1)
+        self.assertEqual(self.clinica.verificar_contadores_ocupacion(), [])
+
+    def test_agregar_lote_equivale_a_agregar_de_a_uno(self):
+
+        turnos = list(self.clinica.vista_turnos())
+        por_lote = ContadoresOcupacion()
+        por_lote.agregar_lote(turnos[:2])
+        por_lote.agregar_lote(turnos[2:])
+
+        self.assertEqual(por_lote.verificar(turnos), [])
+        self.assertEqual(por_lote.turnos_por_especialidad(date(2030, 6, 3)), {"Cardiologia": 3})
+
+    #Verificacion
+
+    def test_quitar_vuelve_a_coincidir_con_el_recalculo(self):
+
+        turno = self.clinica.obtener_turnos(matricula="MP202")[0]
+        self.contadores.quitar(turno)
+        problemas = self.clinica.verificar_contadores_ocupacion()
+        self.assertTrue(problemas)
+        self.assertTrue(any("por dia" in problema for problema in problemas))
+
+        self.contadores.agregar(turno)
+        self.assertEqual(self.clinica.verificar_contadores_ocupacion(), [])
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
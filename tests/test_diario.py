@@ -0,0 +1,139 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from src.models.paciente import Paciente
+from src.models.medico import Medico
+from src.models.especialidad import Especialidad
+from src.models.clinica import Clinica
+from src.persistencia.diario import Diario
+from src.models.clinicaConcurrente import ClinicaConcurrente
+from src.persistencia.almacenamientoSQLite import AlmacenamientoSQLite
+from src.exceptions.error import DatoInvalidoException, TurnoOcupadoException
+
+class TestDiario(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.diario = Diario(self.directorio.name, tamanio_grupo=2)
+        self.clinica = Clinica(diario=self.diario)
+
+        self.clinica.agregar_paciente(Paciente("Lucia Herrera", "99887766", "05/01/1988"))
+        medico = Medico("Dr. Alejandro Ruiz", "MP201")
+        medico.agregar_especialidad(Especialidad("Cardiologia", ["lunes"]))
+        self.clinica.agregar_medico(medico)
+        medico.agregar_especialidad(Especialidad("Pediatria", ["martes"]))
+        self.clinica.agendar_turno("99887766", "MP201", "Cardiologia", datetime(2030, 6, 3, 10, 0))
+        self.clinica.emitir_receta("99887766", "MP201", ["Aspirina"])
+
+    def tearDown(self):
+        self.directorio.cleanup()
+
+    def _reiniciar(self) -> Clinica:
+
+        self.diario.cerrar()
+        self.diario = Diario(self.directorio.name)
+        return Clinica(diario=self.diario)
+
+    #Reproduccion
+
+    def test_reinicio_reproduce_operaciones(self):
+
+        clinica = self._reiniciar()
+        historia = clinica.obtener_historia_clinica("99887766")
+
+        self.assertEqual(len(historia.obtener_turnos()), 1)
+        self.assertEqual(historia.obtener_recetas()[0].obtener_medicamentos(), ["Aspirina"])
+        self.assertTrue(clinica.obtener_medico_por_matricula("MP201").atiende("Pediatria", 1))
+        with self.assertRaises(TurnoOcupadoException):
+            clinica.agendar_turno("99887766", "MP201", "Cardiologia", datetime(2030, 6, 3, 10, 15))
+        self.diario.cerrar()
+
+    def test_reinicio_tras_compactar_solo_reproduce_la_cola(self):
+
+        self.diario.compactar(en_segundo_plano=True).join()
+        self.clinica.agregar_paciente(Paciente("Martin Diaz", "66554433", "18/09/1992"))
+        self.clinica.agendar_turno("66554433", "MP201", "Pediatria", datetime(2030, 6, 4, 10, 0))
+
+        clinica = self._reiniciar()
+        segmentos = [nombre for nombre in os.listdir(self.directorio.name) if nombre.startswith("diario-")]
+
+        self.assertIn("snapshot.jsonl", os.listdir(self.directorio.name))
+        self.assertEqual(len(segmentos), 2)
+        self.assertEqual(len(clinica.obtener_turnos()), 2)
+        self.assertEqual(len(clinica.obtener_historia_clinica("66554433").obtener_turnos()), 1)
+        self.diario.cerrar()
+
+    def test_cancelaciones_sobreviven_al_reinicio_y_a_compactar(self):
+
+        self.clinica.reprogramar_turno("MP201@2030-06-03T10:00:00", datetime(2030, 6, 10, 10, 0))
+        self.clinica.agendar_turno("99887766", "MP201", "Cardiologia", datetime(2030, 6, 3, 10, 0))
+        self.clinica.cancelar_turno("MP201@2030-06-03T10:00:00")
+
+        clinica = self._reiniciar()
+        self.assertEqual([t.obtener_id() for t in clinica.obtener_turnos()], ["MP201@2030-06-10T10:00:00"])
+
+        # El snapshot queda solo con el turno vigente y sin las cancelaciones
+        self.diario.compactar()
+        with open(os.path.join(self.directorio.name, "snapshot.jsonl"), encoding="utf-8") as archivo:
+            snapshot = archivo.read()
+        self.assertNotIn("cancelacion", snapshot)
+        self.assertEqual(snapshot.count('["turno"'), 1)
+        clinica = self._reiniciar()
+        self.assertEqual([t.obtener_id() for t in clinica.obtener_turnos()], ["MP201@2030-06-10T10:00:00"])
+        self.assertEqual(len(clinica.obtener_historia_clinica("99887766").obtener_turnos()), 1)
+        self.diario.cerrar()
+
+    def test_linea_truncada_al_final_se_ignora(self):
+
+        self.diario.cerrar()
+        segmento = sorted(nombre for nombre in os.listdir(self.directorio.name) if nombre.startswith("diario-"))[-1]
+        with open(os.path.join(self.directorio.name, segmento), "a", encoding="utf-8") as archivo:
+            archivo.write('["paciente","Martin')
+
+        self.diario = Diario(self.directorio.name)
+        clinica = Clinica(diario=self.diario)
+        self.assertEqual(len(clinica.obtener_pacientes()), 1)
+        self.diario.cerrar()
+
+    def test_restaura_turnos_pasados(self):
+
+        self.diario.cerrar()
+        segmento = sorted(nombre for nombre in os.listdir(self.directorio.name) if nombre.startswith("diario-"))[-1]
+        with open(os.path.join(self.directorio.name, segmento), "a", encoding="utf-8") as archivo:
+            archivo.write('["turno","99887766","MP201","Cardiologia","2020-01-06T10:00:00",30]\n')
+
+        self.diario = Diario(self.directorio.name)
+        clinica = Clinica(diario=self.diario)
+        self.assertEqual(len(clinica.obtener_turnos(desde=datetime(2020, 1, 1), hasta=datetime(2021, 1, 1))), 1)
+        self.diario.cerrar()
+
+    def test_reproducir_no_deja_segmentos_nuevos(self):
+
+        self.diario.compactar()
+        self.clinica.agendar_turno("99887766", "MP201", "Cardiologia", datetime(2030, 6, 10, 10, 0))
+        self.diario.cerrar()
+        archivos = sorted(os.listdir(self.directorio.name))
+
+        clinica = Diario.reproducir(self.directorio.name, Clinica())
+        self.assertEqual(len(clinica.obtener_turnos()), 2)
+        self.assertEqual(len(clinica.obtener_historia_clinica("99887766").obtener_recetas()), 1)
+        self.assertEqual(sorted(os.listdir(self.directorio.name)), archivos)
+        with self.assertRaises(FileNotFoundError):
+            Diario.reproducir(os.path.join(self.directorio.name, "otro"), Clinica())
+
+    def test_no_se_combina_con_sqlite(self):
+
+        self.diario.cerrar()
+        self.diario = Diario(self.directorio.name)
+        almacenamiento = AlmacenamientoSQLite()
+        with self.assertRaises(DatoInvalidoException):
+            Clinica(almacenamiento, self.diario)
+        with self.assertRaises(DatoInvalidoException):
+            ClinicaConcurrente(almacenamiento, self.diario)
+        self.assertEqual(almacenamiento.dnis(), [])
+        almacenamiento.cerrar()
+        self.diario.cerrar()
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -49,6 +49,22 @@ class TestEspecialidad(unittest.TestCase):
         self.assertTrue(especialidad.verificar_dia("LUNES"))
         self.assertTrue(especialidad.verificar_dia("Lunes"))
     
+    #Mascara de dias
+
+    def test_mascara_de_dias(self):
+        especialidad = Especialidad("Cardiología", ["lunes", "Miércoles", "domingo", "lunes"])
+        self.assertEqual(especialidad.obtener_mascara(), 0b1000101)
+        self.assertTrue(especialidad.atiende_en(2))
+        self.assertFalse(especialidad.atiende_en(1))
+
+    def test_medico_atiende_por_clave_canonica(self):
+        self.medico.agregar_especialidad(Especialidad("Cardiología", ["lunes", "viernes"]))
+
+        self.assertTrue(self.medico.atiende("cardiologia", 0))
+        self.assertTrue(self.medico.atiende(" CARDIOLOGÍA ", 4))
+        self.assertFalse(self.medico.atiende("Cardiología", 1))
+        self.assertFalse(self.medico.atiende("Pediatria", 0))
+    
     #Agregado de especialidad a medico
     def test_agregar_especialidad_a_medico_registrado(self):
         especialidad = Especialidad("Cardiología", ["lunes", "martes"])
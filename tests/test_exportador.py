@@ -0,0 +1,165 @@
+import csv
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest.mock import patch
+from datetime import datetime
+from src.models.paciente import Paciente
+from src.models.medico import Medico
+from src.models.especialidad import Especialidad
+from src.models.clinica import Clinica
+from src.persistencia.almacenamientoSQLite import AlmacenamientoSQLite
+from src.persistencia.diario import Diario
+from src.exportador import (
+    exportar_historias,
+    exportar_historias_db,
+    exportar_recetas,
+    exportar_recetas_db,
+    exportar_turnos,
+    exportar_turnos_db,
+    main,
+    ruta_historia
+)
+
+class TestExportador(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.ruta_db = os.path.join(self.directorio.name, "clinica.db")
+        self.salida = os.path.join(self.directorio.name, "historias")
+
+        self.almacenamiento = AlmacenamientoSQLite(self.ruta_db)
+        self.clinica = Clinica(self.almacenamiento)
+        self.clinica.agregar_paciente(Paciente("Lucia Herrera", "99887766", "05/01/1988"))
+        self.clinica.agregar_paciente(Paciente("Martin Diaz", "66554433", "18/09/1992"))
+        self.clinica.agregar_paciente(Paciente("Sofia Paez", "11223344", "02/03/1975"))
+        medico = Medico("Dr. Alejandro Ruiz", "MP201")
+        medico.agregar_especialidad(Especialidad("Cardiologia", ["lunes", "martes"]))
+        self.clinica.agregar_medico(medico)
+
+        self.clinica.agendar_turno("99887766", "MP201", "Cardiologia", datetime(2030, 6, 3, 10, 0))
+        self.clinica.agendar_turno("99887766", "MP201", "Cardiologia", datetime(2030, 6, 4, 10, 0), 60)
+        self.clinica.agendar_turno("66554433", "MP201", "Cardiologia", datetime(2030, 6, 3, 11, 0))
+        self.clinica.emitir_receta("99887766", "MP201", ["Aspirina", "Paracetamol"])
+        self.clinica.confirmar()
+
+    def tearDown(self):
+        self.almacenamiento.cerrar()
+        self.directorio.cleanup()
+
+    def leer(self, dni):
+
+        with open(ruta_historia(self.salida, dni), encoding="utf-8") as archivo:
+            return archivo.read()
+
+    #Exportacion desde la clinica en memoria
+
+    def test_cada_historia_en_su_archivo(self):
+
+        progreso = []
+        reporte = exportar_historias(self.clinica, self.salida, procesos=2, tamanio_lote=1,
+                                     progreso=lambda hechas, total: progreso.append((hechas, total)))
+
+        self.assertEqual(reporte["historias"], 3)
+        self.assertEqual(progreso[-1], (3, 3))
+        self.assertEqual(sum(p["historias"] for p in reporte["procesos"].values()), 3)
+        for dni in ("99887766", "66554433", "11223344"):
+            self.assertEqual(self.leer(dni), str(self.clinica.obtener_historia_clinica(dni)))
+
+    #Exportacion desde SQLite
+
+    def test_exportar_desde_db(self):
+
+        reporte = exportar_historias_db(self.ruta_db, self.salida, procesos=2, tamanio_lote=2)
+
+        self.assertEqual(reporte["historias"], 3)
+        self.assertEqual(sorted(os.listdir(self.salida)),
+                         ["historia_11223344.txt", "historia_66554433.txt", "historia_99887766.txt"])
+        self.assertEqual(self.leer("99887766"), str(self.clinica.obtener_historia_clinica("99887766")))
+        self.assertIn("No hay recetas registradas.", self.leer("66554433"))
+
+    #Turnos y recetas
+
+    def test_exportar_turnos_csv_filtrados(self):
+
+        ruta = os.path.join(self.directorio.name, "turnos.csv")
+        cantidad = exportar_turnos(self.clinica, ruta, desde=datetime(2030, 6, 3, 10, 30))
+
+        self.assertEqual(cantidad, 2)
+        with open(ruta, newline="", encoding="utf-8") as archivo:
+            filas = list(csv.DictReader(archivo))
+        self.assertEqual([fila["fecha_hora"] for fila in filas], ["2030-06-03T11:00:00", "2030-06-04T10:00:00"])
+        self.assertEqual(filas[1]["duracion"], "60")
+
+    def test_exportar_recetas_jsonl(self):
+
+        ruta = os.path.join(self.directorio.name, "recetas.jsonl")
+        cantidad = exportar_recetas(self.clinica, ruta, matricula="MP201")
+
+        self.assertEqual(cantidad, 1)
+        with open(ruta, encoding="utf-8") as archivo:
+            fila = json.loads(archivo.readline())
+        self.assertEqual(fila["dni"], "99887766")
+        self.assertEqual(fila["medicamentos"], ["Aspirina", "Paracetamol"])
+
+    def test_exportar_desde_db_igual_que_en_memoria(self):
+
+        for exportar, exportar_db in ((exportar_turnos, exportar_turnos_db), (exportar_recetas, exportar_recetas_db)):
+            memoria = os.path.join(self.directorio.name, "memoria.csv")
+            db = os.path.join(self.directorio.name, "db.csv")
+            exportar(self.clinica, memoria, dni="99887766")
+            exportar_db(self.ruta_db, db, dni="99887766")
+            with open(memoria, encoding="utf-8") as esperado, open(db, encoding="utf-8") as obtenido:
+                self.assertEqual(obtenido.read(), esperado.read())
+
+    def test_exportar_desde_db_inexistente_no_crea_nada(self):
+
+        ruta_db = os.path.join(self.directorio.name, "clinca.db")
+        ruta = os.path.join(self.directorio.name, "turnos.csv")
+        with self.assertRaises(FileNotFoundError):
+            exportar_turnos_db(ruta_db, ruta)
+        with self.assertRaises(FileNotFoundError):
+            exportar_historias_db(ruta_db, self.salida, procesos=1)
+        self.assertFalse(os.path.exists(ruta_db))
+        self.assertFalse(os.path.exists(ruta))
+
+    def test_la_db_se_abre_solo_para_lectura(self):
+
+        almacenamiento = AlmacenamientoSQLite(self.ruta_db, solo_lectura=True)
+        try:
+            self.assertEqual(sorted(almacenamiento.dnis()), ["11223344", "66554433", "99887766"])
+            almacenamiento.guardar_paciente(Paciente("Sofia Paez", "44556677", "02/03/1975"))
+            with self.assertRaises(sqlite3.OperationalError):
+                almacenamiento.confirmar()
+        finally:
+            almacenamiento.__conexion__.close()
+
+    #Linea de comandos
+
+    def test_exportar_desde_diario_no_escribe_en_el_diario(self):
+
+        ruta_diario = os.path.join(self.directorio.name, "diario")
+        diario = Diario(ruta_diario)
+        clinica = Clinica(diario=diario)
+        clinica.agregar_paciente(Paciente("Lucia Herrera", "99887766", "05/01/1988"))
+        medico = Medico("Dr. Alejandro Ruiz", "MP201")
+        medico.agregar_especialidad(Especialidad("Cardiologia", ["lunes"]))
+        clinica.agregar_medico(medico)
+        clinica.agendar_turno("99887766", "MP201", "Cardiologia", datetime(2030, 6, 3, 10, 0))
+        diario.cerrar()
+        archivos = sorted(os.listdir(ruta_diario))
+
+        ruta = os.path.join(self.directorio.name, "turnos.csv")
+        with patch("sys.argv", ["exportador", "turnos", ruta, "--diario", ruta_diario]), redirect_stdout(StringIO()):
+            main()
+
+        self.assertEqual(sorted(os.listdir(ruta_diario)), archivos)
+        with open(ruta, encoding="utf-8") as archivo:
+            self.assertEqual(len(list(csv.reader(archivo))), 2)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -1,3 +1,4 @@
+import io
 import unittest
 from datetime import datetime
 from src.models.paciente import Paciente
@@ -6,6 +7,7 @@ from src.models.medico import Medico
 from src.models.turno import Turno
 from src.models.receta import Receta
 from src.models.clinica import Clinica
+from src.exceptions.error import DatoInvalidoException
 
 class TestHistoriaClinica(unittest.TestCase):
     
@@ -96,6 +98,65 @@ class TestHistoriaClinica(unittest.TestCase):
         recetas.clear()  
 
         self.assertEqual(len(self.historia.obtener_recetas()), 1)
-            
+
+    #Renderizado
+
+    def agregar_turnos(self, cantidad):
+
+        for i in range(cantidad):
+            self.historia.agregar_turno(
+                Turno(self.paciente, self.medico, datetime(2030, 6, 3 + i, 10, 0), "Medicina General"))
+
+    def test_str_historia_vacia(self):
+
+        esperado = (
+            f"=== Historia Clinica de {self.paciente} ===\n\n"
+            "TURNOS (0):\nNo hay turnos registrados.\n"
+            "\nRECETAS (0):\nNo hay recetas registradas.\n"
+        )
+        self.assertEqual(str(self.historia), esperado)
+
+    def test_escribir_en_archivo(self):
+
+        self.agregar_turnos(3)
+        self.historia.agregar_receta(Receta(self.paciente, self.medico, ["Paracetamol"]))
+        salida = io.StringIO()
+        self.historia.escribir(salida)
+        self.assertEqual(salida.getvalue(), str(self.historia))
+        self.assertIn("3. Turno:", salida.getvalue())
+        self.assertIn("1. Receta del", salida.getvalue())
+
+    def test_renderizar_primeros_y_ultimos(self):
+
+        self.agregar_turnos(5)
+        primeros = "".join(self.historia.renderizar(primeros=2))
+        self.assertIn("2. Turno:", primeros)
+        self.assertNotIn("3. Turno:", primeros)
+
+        ultimos = "".join(self.historia.renderizar(ultimos=2))
+        self.assertIn("TURNOS (5):", ultimos)
+        self.assertIn("4. Turno:", ultimos)
+        self.assertIn("5. Turno:", ultimos)
+        self.assertNotIn("3. Turno:", ultimos)
+
+    def test_renderizar_rango_de_fechas(self):
+
+        self.agregar_turnos(5)
+        texto = "".join(self.historia.renderizar(desde=datetime(2030, 6, 4), hasta=datetime(2030, 6, 6)))
+        self.assertIn("2. Turno:", texto)
+        self.assertIn("3. Turno:", texto)
+        self.assertNotIn("1. Turno:", texto)
+        self.assertNotIn("4. Turno:", texto)
+
+        texto = "".join(self.historia.renderizar(desde=datetime(2031, 1, 1)))
+        self.assertIn("No hay turnos en el rango solicitado.", texto)
+
+    def test_renderizar_parametros_invalidos(self):
+
+        with self.assertRaises(DatoInvalidoException):
+            self.historia.renderizar(primeros=1, ultimos=1)
+        with self.assertRaises(DatoInvalidoException):
+            self.historia.renderizar(ultimos=-1)
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
\ No newline at end of file
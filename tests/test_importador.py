@@ -0,0 +1,88 @@
+import json
+import os
+import tempfile
+import unittest
+from src.models.clinica import Clinica
+from src.importador import importar_pacientes, importar_medicos
+
+class TestImportador(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.clinica = Clinica()
+
+    def tearDown(self):
+        self.directorio.cleanup()
+
+    def _escribir(self, nombre: str, contenido: str) -> str:
+
+        ruta = os.path.join(self.directorio.name, nombre)
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            archivo.write(contenido)
+        return ruta
+
+    #Pacientes
+
+    def test_importar_pacientes_csv_con_errores(self):
+
+        ruta = self._escribir("pacientes.csv", (
+            "nombre,dni,fecha_nacimiento\n"
+            "Lucia Herrera,99887766,05/01/1988\n"
+            "Martin Diaz,123,18/09/1992\n"
+            "Ana López,87654321,20/05/1990\n"
+            "Otra Persona,99887766,01/01/1990\n"
+        ))
+        avances = []
+        reporte = importar_pacientes(self.clinica, ruta, progreso=lambda *avance: avances.append(avance), cada=2)
+
+        self.assertEqual(reporte["procesadas"], 4)
+        self.assertEqual(reporte["importadas"], 2)
+        self.assertEqual([numero for numero, _ in reporte["errores"]], [3, 5])
+        self.assertIn("8 caracteres", reporte["errores"][0][1])
+        self.assertEqual(avances, [(2, 1, 1), (4, 2, 2)])
+        self.assertEqual(len(self.clinica.obtener_pacientes()), 2)
+
+    def test_importar_pacientes_jsonl(self):
+
+        ruta = self._escribir("pacientes.jsonl", "\n".join([
+            json.dumps({"nombre": "Lucia Herrera", "dni": 99887766, "fecha_nacimiento": "05/01/1988"}),
+            "{no es json",
+        ]))
+        reporte = importar_pacientes(self.clinica, ruta)
+
+        self.assertEqual(reporte["importadas"], 1)
+        self.assertEqual(reporte["errores"][0][0], 2)
+
+    #Medicos
+
+    def test_importar_medicos_con_especialidades(self):
+
+        ruta = self._escribir("medicos.csv", (
+            "nombre,matricula,especialidades\n"
+            "Dr. Alejandro Ruiz,MP201,Cardiologia:lunes|miercoles;Pediatria:martes\n"
+            "Dra. Sofia Castro,MP202,Cardiologia:feriado\n"
+        ))
+        reporte = importar_medicos(self.clinica, ruta)
+
+        self.assertEqual(reporte["importadas"], 1)
+        self.assertEqual(reporte["cantidad_errores"], 1)
+        medico = self.clinica.obtener_medico_por_matricula("MP201")
+        self.assertTrue(medico.atiende("Pediatria", 1))
+        self.assertTrue(medico.atiende("Cardiologia", 2))
+
+    def test_especialidades_jsonl_con_tipos_invalidos(self):
+
+        ruta = self._escribir("medicos.jsonl", "\n".join(json.dumps(fila) for fila in [
+            {"nombre": "Dr. Alejandro Ruiz", "matricula": "MP201", "especialidades": [{"tipo": 5, "dias": ["lunes"]}]},
+            {"nombre": "Dra. Sofia Castro", "matricula": "MP202", "especialidades": [{"tipo": "Pediatria", "dias": [1]}]},
+            {"nombre": "Dr. Pedro Martin", "matricula": "MP203", "especialidades": [{"tipo": "Pediatria", "dias": "lunes"}]},
+            {"nombre": "Dra. Ana Lopez", "matricula": "MP204", "especialidades": [{"tipo": "Pediatria", "dias": ["lunes"]}]},
+        ]))
+        reporte = importar_medicos(self.clinica, ruta)
+
+        self.assertEqual(reporte["importadas"], 1)
+        self.assertEqual([numero for numero, _ in reporte["errores"]], [1, 2, 3])
+        self.assertTrue(self.clinica.obtener_medico_por_matricula("MP204").atiende("Pediatria", 0))
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,98 @@
+import unittest
+from datetime import datetime
+from src.models.paciente import Paciente
+from src.models.medico import Medico
+from src.models.especialidad import Especialidad
+from src.models.clinica import Clinica
+from src.models.indiceTurnos import IndiceTurnos
+from src.models.turno import Turno
+
+class TestIndiceTurnos(unittest.TestCase):
+
+    def setUp(self):
+        self.clinica = Clinica()
+
+        self.clinica.agregar_paciente(Paciente("Lucia Herrera", "99887766", "05/01/1988"))
+        self.clinica.agregar_paciente(Paciente("Martin Diaz", "66554433", "18/09/1992"))
+
+        medico1 = Medico("Dr. Alejandro Ruiz", "MP201")
+        medico1.agregar_especialidad(Especialidad("Cardiología", ["lunes", "miercoles"]))
+        medico1.agregar_especialidad(Especialidad("Pediatria", ["martes"]))
+        medico2 = Medico("Dra. Sofia Castro", "MP202")
+        medico2.agregar_especialidad(Especialidad("Cardiologia", ["lunes", "martes"]))
+        self.clinica.agregar_medico(medico1)
+        self.clinica.agregar_medico(medico2)
+
+        # 2030-06-03 es lunes
+        self.clinica.agendar_turno("99887766", "MP201", "Cardiologia", datetime(2030, 6, 3, 10, 0))
+        self.clinica.agendar_turno("66554433", "MP202", "Cardiologia", datetime(2030, 6, 3, 9, 0))
+        self.clinica.agendar_turno("66554433", "MP201", "Pediatria", datetime(2030, 6, 4, 11, 0))
+        self.clinica.agendar_turno("99887766", "MP202", "Cardiologia", datetime(2030, 6, 11, 9, 0))
+
+    def test_agregar_lote_equivale_a_agregar_de_a_uno(self):
+
+        turnos = list(self.clinica.vista_turnos())
+        de_a_uno = IndiceTurnos()
+        for turno in turnos:
+            de_a_uno.agregar(turno)
+        por_lote = IndiceTurnos()
+        por_lote.agregar_lote(turnos[2:])
+        por_lote.agregar_lote(turnos[:2])
+
+        self.assertEqual(por_lote.__fechas__, de_a_uno.__fechas__)
+        for atributo in ("__por_clave__", "__por_dni__", "__por_matricula__", "__por_especialidad__", "__por_fecha__"):
+            self.assertEqual({clave: set(grupo) if not isinstance(grupo, Turno) else grupo
+                              for clave, grupo in getattr(por_lote, atributo).items()},
+                             {clave: set(grupo) if not isinstance(grupo, Turno) else grupo
+                              for clave, grupo in getattr(de_a_uno, atributo).items()}, atributo)
+
+    #Filtros individuales
+
+    def test_sin_filtros_devuelve_todos(self):
+
+        self.assertEqual(len(self.clinica.obtener_turnos()), 4)
+
+    def test_filtrar_por_paciente(self):
+
+        turnos = self.clinica.obtener_turnos(dni="99887766")
+        self.assertEqual([t.obtener_fecha_hora().day for t in turnos], [3, 11])
+
+    def test_filtrar_por_especialidad_sin_tildes(self):
+
+        turnos = self.clinica.obtener_turnos(especialidad="CARDIOLOGÍA")
+        self.assertEqual(len(turnos), 3)
+
+    def test_filtrar_por_rango_de_fechas(self):
+
+        turnos = self.clinica.obtener_turnos(desde=datetime(2030, 6, 3, 9, 30), hasta=datetime(2030, 6, 10))
+        self.assertEqual([t.obtener_fecha_hora() for t in turnos],
+                         [datetime(2030, 6, 3, 10, 0), datetime(2030, 6, 4, 11, 0)])
+
+    #Filtros combinados
+
+    def test_combinar_filtros(self):
+
+        turnos = self.clinica.obtener_turnos(matricula="MP202", dni="66554433", hasta=datetime(2030, 6, 5))
+        self.assertEqual(len(turnos), 1)
+        self.assertEqual(turnos[0].obtener_fecha_hora(), datetime(2030, 6, 3, 9, 0))
+
+    def test_filtro_sin_resultados(self):
+
+        self.assertEqual(self.clinica.obtener_turnos(dni="00000000"), [])
+        self.assertEqual(self.clinica.obtener_turnos(matricula="MP201", especialidad="Neurologia"), [])
+
+    #Recorrido sin copiar
+
+    def test_recorrer_coincide_con_obtener(self):
+
+        for filtros in ({"dni": "66554433"}, {"matricula": "MP201"}, {"especialidad": "cardiologia"},
+                        {"desde": datetime(2030, 6, 3, 9, 30), "hasta": datetime(2030, 6, 11)}):
+            self.assertEqual(list(self.clinica.recorrer_turnos(**filtros)), self.clinica.obtener_turnos(**filtros))
+
+    def test_recorrer_sin_filtros_ordena_por_fecha(self):
+
+        fechas = [t.obtener_fecha_hora() for t in self.clinica.recorrer_turnos()]
+        self.assertEqual(fechas, sorted(t.obtener_fecha_hora() for t in self.clinica.obtener_turnos()))
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -1,5 +1,6 @@
 import unittest
 from src.models.medico import Medico
+from src.models.especialidad import Especialidad
 from src.models.clinica import Clinica
 from src.exceptions.error import (
     DatoInvalidoException,
@@ -49,6 +50,32 @@ class TestMedico(unittest.TestCase):
         with self.assertRaises(MedicoNoEncontradoException):
             self.clinica.obtener_medico_por_matricula("MP999")
     
+    #Medicos por especialidad y dia
+    def test_obtener_medicos_por_especialidad_y_dia(self):
+
+        self.medico1.agregar_especialidad(Especialidad("Pediatría", ["martes", "jueves"]))
+        self.medico2.agregar_especialidad(Especialidad("Pediatria", ["jueves"]))
+        self.clinica.agregar_medico(self.medico1)
+        self.clinica.agregar_medico(self.medico2)
+
+        self.assertEqual(self.clinica.obtener_medicos_por_especialidad("pediatria", "Martes"), [self.medico1])
+        self.assertEqual(self.clinica.obtener_medicos_por_especialidad("Pediatria", "jueves"), [self.medico1, self.medico2])
+        self.assertEqual(self.clinica.obtener_medicos_por_especialidad("Pediatria", "lunes"), [])
+
+    def test_especialidad_agregada_despues_actualiza_el_indice(self):
+
+        self.clinica.agregar_medico(self.medico1)
+        self.assertEqual(self.clinica.obtener_medicos_por_especialidad("Cardiologia"), [])
+
+        self.medico1.agregar_especialidad(Especialidad("Cardiologia", ["miercoles"]))
+        self.assertEqual(self.clinica.obtener_medicos_por_especialidad("Cardiologia"), [self.medico1])
+        self.assertEqual(self.clinica.obtener_medicos_por_especialidad("Cardiologia", "miércoles"), [self.medico1])
+
+    def test_obtener_medicos_por_especialidad_dia_invalido(self):
+
+        with self.assertRaises(DatoInvalidoException):
+            self.clinica.obtener_medicos_por_especialidad("Cardiologia", "feriado")
+
     #Campos invalidos
     def test_crear_medico_nombre_vacio(self):
 
@@ -1,4 +1,5 @@
 import unittest
+from datetime import datetime
 from src.models.paciente import Paciente
 from src.models.clinica import Clinica
 from src.models.historiaClinica import HistoriaClinica
@@ -36,6 +37,12 @@ class TestPaciente(unittest.TestCase):
         historia = self.clinica.obtener_historia_clinica("99887766")
         self.assertIsInstance(historia, HistoriaClinica)
 
+    def test_paciente_sin_diccionario_de_instancia(self):
+
+        self.assertFalse(hasattr(self.paciente, "__dict__"))
+        self.assertEqual(self.paciente.obtener_nombre(), "Lucia Herrera")
+        self.assertEqual(self.paciente.obtener_fecha_nacimiento(), "05/01/1988")
+
     #Campos invalidos
 
     def test_crear_paciente_nombre_vacio(self):
@@ -82,6 +89,33 @@ class TestPaciente(unittest.TestCase):
         with self.assertRaises(DatoInvalidoException):
             Paciente(nombre_largo, "12345678", "15/03/1985")
 
+    #Validacion rapida de fechas
+
+    def test_fecha_sin_ceros_a_la_izquierda(self):
+
+        paciente = Paciente("Juan Pérez", "12345678", "5/3/1985")
+        self.assertEqual(paciente.obtener_fecha_nacimiento(), "5/3/1985")
+
+    def test_fecha_inexistente(self):
+
+        with self.assertRaises(DatoInvalidoException) as contexto:
+            Paciente("Juan Pérez", "12345678", "31/02/1985")
+        self.assertEqual(str(contexto.exception), "La fecha de nacimiento debe tener el formato dd/mm/aaaa")
+
+    def test_fecha_futura_respecto_de_ahora_compartido(self):
+
+        ahora = datetime(2000, 1, 1, 12, 0)
+        Paciente("Juan Pérez", "12345678", "01/01/2000", ahora=ahora)
+        with self.assertRaises(DatoInvalidoException) as contexto:
+            Paciente("Juan Pérez", "12345678", "02/01/2000", ahora=ahora)
+        self.assertEqual(str(contexto.exception), "La fecha de nacimiento no puede ser en el futuro")
+
+    def test_nombre_con_otros_espacios(self):
+
+        self.assertEqual(Paciente("Juan\tPérez", "12345678", "15/03/1985").obtener_nombre(), "Juan\tPérez")
+        with self.assertRaises(DatoInvalidoException):
+            Paciente("Juan_Pérez", "12345678", "15/03/1985")
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
\ No newline at end of file
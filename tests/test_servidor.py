@@ -0,0 +1,174 @@
+import asyncio
+import json
+import unittest
+from datetime import datetime
+from src.models.clinica import Clinica
+from src.models.clinicaConcurrente import ClinicaConcurrente
+from src.models.turno import Turno
+from src.servidor import ServidorClinica, CANTIDAD_BLOQUEOS_MEDICOS, HILOS_POR_DEFECTO
+
+class TestServidor(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.clinica = Clinica()
+        self.servidor = await ServidorClinica(self.clinica, puerto=0).iniciar()
+        self.lector, self.escritor = await asyncio.open_connection("127.0.0.1", self.servidor.obtener_puerto())
+
+        await self.pedir("POST", "/pacientes", {"nombre": "Lucia Herrera", "dni": "99887766", "fecha_nacimiento": "05/01/1988"})
+        await self.pedir("POST", "/medicos", {"nombre": "Dr. Alejandro Ruiz", "matricula": "MP201",
+                                              "especialidades": [{"tipo": "Cardiologia", "dias": ["lunes"]}]})
+
+    async def asyncTearDown(self):
+        self.escritor.close()
+        await self.servidor.cerrar()
+
+    async def pedir(self, metodo, ruta, datos=None, lector=None, escritor=None):
+
+        # Cliente HTTP/1.1 minimo sobre una conexion persistente
+        lector = lector or self.lector
+        escritor = escritor or self.escritor
+        cuerpo = json.dumps(datos).encode() if datos is not None else b""
+        escritor.write(f"{metodo} {ruta} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(cuerpo)}\r\n\r\n".encode() + cuerpo)
+        await escritor.drain()
+
+        estado = int((await lector.readline()).split()[1])
+        largo = 0
+        while (linea := await lector.readline()) != b"\r\n":
+            nombre, _, valor = linea.decode().partition(":")
+            if nombre.lower() == "content-length":
+                largo = int(valor)
+        return estado, json.loads(await lector.readexactly(largo))
+
+    #Operaciones
+
+    async def test_agendar_y_listar_turnos(self):
+
+        estado, _ = await self.pedir("POST", "/turnos", {"dni": "99887766", "matricula": "MP201",
+                                                          "especialidad": "Cardiologia", "fecha_hora": "2030-06-03T10:00"})
+        self.assertEqual(estado, 201)
+
+        estado, turnos = await self.pedir("GET", "/turnos?matricula=MP201")
+        self.assertEqual(estado, 200)
+        self.assertEqual(turnos[0]["fecha_hora"], "2030-06-03T10:00:00")
+
+        estado, historia = await self.pedir("GET", "/pacientes/99887766/historia")
+        self.assertEqual(len(historia["turnos"]), 1)
+
+    async def test_errores_del_dominio_como_codigos_http(self):
+
+        turno = {"dni": "99887766", "matricula": "MP201", "especialidad": "Cardiologia", "fecha_hora": "2030-06-03T10:00"}
+        await self.pedir("POST", "/turnos", turno)
+        self.assertEqual((await self.pedir("POST", "/turnos", turno))[0], 409)
+        self.assertEqual((await self.pedir("POST", "/turnos", dict(turno, matricula="MP999")))[0], 404)
+        self.assertEqual((await self.pedir("POST", "/turnos", dict(turno, fecha_hora="manana")))[0], 400)
+        self.assertEqual((await self.pedir("GET", "/inexistente"))[0], 404)
+        self.assertEqual((await self.pedir("DELETE", "/turnos"))[0], 405)
+
+    async def test_cancelar_y_reprogramar(self):
+
+        estado, turno = await self.pedir("POST", "/turnos", {"dni": "99887766", "matricula": "MP201",
+                                                             "especialidad": "Cardiologia", "fecha_hora": "2030-06-03T10:00"})
+        self.assertEqual(turno["id"], "MP201@2030-06-03T10:00:00")
+
+        estado, movido = await self.pedir("POST", "/turnos/MP201@2030-06-03T10%3A00%3A00/reprogramar",
+                                          {"fecha_hora": "2030-06-10T11:00", "duracion": 45})
+        self.assertEqual(estado, 200)
+        self.assertEqual((movido["id"], movido["duracion"]), ("MP201@2030-06-10T11:00:00", 45))
+
+        self.assertEqual((await self.pedir("DELETE", f"/turnos/{movido['id']}"))[0], 200)
+        self.assertEqual((await self.pedir("DELETE", f"/turnos/{movido['id']}"))[0], 404)
+        self.assertEqual((await self.pedir("DELETE", "/turnos/sin-fecha"))[0], 400)
+        self.assertEqual(self.clinica.obtener_turnos(), [])
+
+    async def test_ocupacion_del_dia(self):
+
+        await self.pedir("POST", "/turnos", {"dni": "99887766", "matricula": "MP201",
+                                             "especialidad": "Cardiologia", "fecha_hora": "2030-06-03T10:00"})
+        estado, ocupacion = await self.pedir("GET", "/ocupacion?fecha=2030-06-03&matricula=MP201")
+        self.assertEqual(estado, 200)
+        self.assertEqual(ocupacion["por_especialidad"], {"Cardiologia": 1})
+        self.assertEqual(ocupacion["por_hora"], {"10": 1})
+        self.assertEqual(ocupacion["medico"]["minutos_semana"], 30)
+        self.assertEqual((await self.pedir("GET", "/ocupacion"))[0], 400)
+
+    async def test_archiva_turnos_terminados_periodicamente(self):
+
+        paciente = self.clinica.obtener_paciente_por_dni("99887766")
+        medico = self.clinica.obtener_medico_por_matricula("MP201")
+        self.clinica._registrar_turno(Turno.restaurar(paciente, medico, datetime(2020, 3, 2, 10, 0), "Cardiologia", 30))
+        servidor = await ServidorClinica(self.clinica, puerto=0, intervalo_archivo=0.01).iniciar()
+        await asyncio.sleep(0.1)
+        await servidor.cerrar()
+        self.assertEqual(len(self.clinica.obtener_archivo_turnos()), 1)
+
+    async def test_archivo_periodico_sigue_tras_un_fallo(self):
+
+        llamadas = []
+        archivar = self.clinica.archivar_turnos
+
+        def archivar_con_fallo():
+            llamadas.append(None)
+            if len(llamadas) == 1:
+                raise RuntimeError("disco lleno")
+            return archivar()
+
+        self.clinica.archivar_turnos = archivar_con_fallo
+        servidor = await ServidorClinica(self.clinica, puerto=0, intervalo_archivo=0.01).iniciar()
+        with self.assertLogs("src.servidor", level="ERROR"):
+            await asyncio.sleep(0.1)
+        self.assertFalse(servidor.__tarea_archivo__.done())
+        await servidor.cerrar()
+        self.assertGreater(len(llamadas), 1)
+
+    #Concurrencia
+
+    async def test_reservas_concurrentes_del_mismo_horario(self):
+
+        conexiones = [await asyncio.open_connection("127.0.0.1", self.servidor.obtener_puerto()) for _ in range(20)]
+        turno = {"dni": "99887766", "matricula": "MP201", "especialidad": "Cardiologia", "fecha_hora": "2030-06-03T11:00"}
+
+        resultados = await asyncio.gather(*(self.pedir("POST", "/turnos", turno, lector, escritor)
+                                            for lector, escritor in conexiones))
+        for _, escritor in conexiones:
+            escritor.close()
+
+        self.assertEqual(sorted(estado for estado, _ in resultados), [201] + [409] * 19)
+        self.assertEqual(len(self.clinica.obtener_turnos()), 1)
+
+    async def test_matriculas_desconocidas_no_agregan_candados(self):
+
+        for i in range(300):
+            estado, _ = await self.pedir("DELETE", f"/turnos/MX{i}@2030-06-03T10:00:00")
+            self.assertEqual(estado, 404)
+        self.assertEqual(len(self.servidor.__bloqueos_medicos__), CANTIDAD_BLOQUEOS_MEDICOS)
+
+    async def test_clinica_comun_se_atiende_en_un_solo_hilo(self):
+
+        self.assertEqual(self.servidor.__ejecutor__._max_workers, 1)
+        self.assertFalse(isinstance(self.servidor._bloqueo_medico("MP201"), asyncio.Lock))
+
+    async def test_clinica_concurrente_se_atiende_en_paralelo(self):
+
+        servidor = await ServidorClinica(ClinicaConcurrente(), puerto=0).iniciar()
+        lector, escritor = await asyncio.open_connection("127.0.0.1", servidor.obtener_puerto())
+        await self.pedir("POST", "/pacientes", {"nombre": "Lucia Herrera", "dni": "99887766",
+                                                "fecha_nacimiento": "05/01/1988"}, lector, escritor)
+        await self.pedir("POST", "/medicos", {"nombre": "Dr. Alejandro Ruiz", "matricula": "MP201",
+                                              "especialidades": [{"tipo": "Cardiologia", "dias": ["lunes"]}]},
+                         lector, escritor)
+        conexiones = [await asyncio.open_connection("127.0.0.1", servidor.obtener_puerto()) for _ in range(20)]
+        turno = {"dni": "99887766", "matricula": "MP201", "especialidad": "Cardiologia", "fecha_hora": "2030-06-03T11:00"}
+
+        resultados = await asyncio.gather(*(self.pedir("POST", "/turnos", turno, lector, escritor)
+                                            for lector, escritor in conexiones))
+        for _, escritor_turno in conexiones:
+            escritor_turno.close()
+        escritor.close()
+        await servidor.cerrar()
+
+        self.assertEqual(servidor.__ejecutor__._max_workers, HILOS_POR_DEFECTO)
+        self.assertIsInstance(servidor._bloqueo_medico("MP201"), asyncio.Lock)
+        self.assertEqual(sorted(estado for estado, _ in resultados), [201] + [409] * 19)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
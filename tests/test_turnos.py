@@ -1,10 +1,10 @@
 import unittest
-from datetime import datetime
+from datetime import datetime, time
 from src.models.paciente import Paciente
 from src.models.medico import Medico
-from src.models.turno import Turno
+from src.models.turno import Turno, DURACION_MAXIMA
 from src.models.especialidad import Especialidad
-from src.models.clinica import Clinica
+from src.models.clinica import Clinica, LOTE_RECHAZADO
 from src.exceptions.error import (
     DatoInvalidoException,
     PacienteNoEncontradoException,
@@ -154,6 +154,182 @@ class TestTurno(unittest.TestCase):
         
         with self.assertRaises(TurnoOcupadoException):
             self.clinica.agendar_turno("66554433", "MP201", "Cardiologia", fecha)
+
+    def test_misma_fecha_distinto_medico_no_es_duplicado(self):
+
+        self.medico1.agregar_especialidad(self.especialidad_cardiologia)
+        self.medico2.agregar_especialidad(Especialidad("Cardiologia", ["lunes"]))
+        self.clinica.agregar_paciente(self.paciente1)
+        self.clinica.agregar_paciente(self.paciente2)
+        self.clinica.agregar_medico(self.medico1)
+        self.clinica.agregar_medico(self.medico2)
+
+        fecha = datetime(2030, 6, 3, 10, 0)
+        self.clinica.agendar_turno("99887766", "MP201", "Cardiologia", fecha)
+        self.clinica.agendar_turno("66554433", "MP202", "Cardiologia", fecha)
+
+        self.assertEqual(len(self.clinica.obtener_turnos()), 2)
+        with self.assertRaises(TurnoOcupadoException):
+            self.clinica.agendar_turno("66554433", "MP201", "Cardiologia", fecha)
+
+
+    #Duracion y superposicion
+
+    def test_agendar_turno_superpuesto_mismo_medico(self):
+
+        self.medico1.agregar_especialidad(self.especialidad_cardiologia)
+        self.clinica.agregar_paciente(self.paciente1)
+        self.clinica.agregar_paciente(self.paciente2)
+        self.clinica.agregar_medico(self.medico1)
+
+        self.clinica.agendar_turno("99887766", "MP201", "Cardiologia", datetime(2030, 6, 3, 9, 0))
+        with self.assertRaises(TurnoOcupadoException):
+            self.clinica.agendar_turno("66554433", "MP201", "Cardiologia", datetime(2030, 6, 3, 9, 5))
+
+        self.clinica.agendar_turno("66554433", "MP201", "Cardiologia", datetime(2030, 6, 3, 9, 30), 45)
+        self.assertEqual(len(self.clinica.obtener_turnos()), 2)
+
+    def test_crear_turno_duracion_invalida(self):
+
+        with self.assertRaises(DatoInvalidoException):
+            Turno(self.paciente, self.medico, datetime(2030, 6, 3, 9, 0), "Cardiologia", 0)
+        with self.assertRaises(DatoInvalidoException):
+            Turno(self.paciente, self.medico, datetime(2030, 6, 3, 9, 0), "Cardiologia", DURACION_MAXIMA + 1)
+        with self.assertRaises(DatoInvalidoException):
+            Turno(self.paciente, self.medico, datetime(9999, 12, 31, 23, 50), "Cardiologia", 30)
+
+    def test_turno_restaurado_con_duracion_invalida_no_queda_a_medias(self):
+
+        self.medico1.agregar_especialidad(self.especialidad_cardiologia)
+        self.clinica.agregar_paciente(self.paciente1)
+        self.clinica.agregar_medico(self.medico1)
+        turno = Turno.restaurar(self.paciente1, self.medico1, datetime(2030, 6, 3, 9, 0), "Cardiologia", 70_000)
+        with self.assertRaises(DatoInvalidoException):
+            self.clinica._registrar_turno(turno)
+
+        self.assertEqual(self.clinica.obtener_turnos(), [])
+        self.clinica.agendar_turno("99887766", "MP201", "Cardiologia", datetime(2030, 6, 3, 9, 0))
+
+    def test_obtener_turnos_medico_entre(self):
+
+        self.medico1.agregar_especialidad(self.especialidad_cardiologia)
+        self.clinica.agregar_paciente(self.paciente1)
+        self.clinica.agregar_medico(self.medico1)
+
+        for hora in (9, 10, 12, 14, 16):
+            self.clinica.agendar_turno("99887766", "MP201", "Cardiologia", datetime(2030, 6, 3, hora, 0))
+
+        turnos = self.clinica.obtener_turnos_medico_entre("MP201", datetime(2030, 6, 3, 10, 0), datetime(2030, 6, 3, 14, 0))
+        self.assertEqual([t.obtener_fecha_hora().hour for t in turnos], [10, 12])
+
+
+    #Agendado por lote
+
+    def _preparar_lote(self):
+
+        self.medico1.agregar_especialidad(self.especialidad_cardiologia)
+        self.clinica.agregar_paciente(self.paciente1)
+        self.clinica.agregar_paciente(self.paciente2)
+        self.clinica.agregar_medico(self.medico1)
+
+    def test_agendar_turnos_lote_valido(self):
+
+        self._preparar_lote()
+        reporte = self.clinica.agendar_turnos_lote([
+            ("99887766", "MP201", "Cardiologia", datetime(2030, 6, 3, 10, 0)),
+            ("66554433", "MP201", "Cardiologia", datetime(2030, 6, 3, 9, 0), 60),
+        ])
+
+        self.assertTrue(all(resultado["ok"] for resultado in reporte))
+        self.assertEqual(len(self.clinica.obtener_turnos()), 2)
+        turnos = self.clinica.obtener_turnos_medico_entre("MP201", datetime(2030, 6, 3, 0, 0), datetime(2030, 6, 4, 0, 0))
+        self.assertEqual([t.obtener_fecha_hora().hour for t in turnos], [9, 10])
+
+    def test_agendar_turnos_lote_con_error_no_registra_nada(self):
+
+        self._preparar_lote()
+        reporte = self.clinica.agendar_turnos_lote([
+            ("99887766", "MP201", "Cardiologia", datetime(2030, 6, 3, 10, 0)),
+            ("99999999", "MP201", "Cardiologia", datetime(2030, 6, 3, 11, 0)),
+            ("66554433", "MP201", "Cardiologia", datetime(2030, 6, 4, 11, 0)),
+        ])
+
+        self.assertEqual([resultado["ok"] for resultado in reporte], [False, False, False])
+        self.assertIn("99999999", reporte[1]["error"])
+        self.assertEqual(reporte[0]["error"], LOTE_RECHAZADO)
+        self.assertEqual(len(self.clinica.obtener_turnos()), 0)
+
+    def test_agendar_turnos_lote_detecta_superposicion_interna(self):
+
+        self._preparar_lote()
+        self.clinica.agendar_turno("99887766", "MP201", "Cardiologia", datetime(2030, 6, 3, 8, 0))
+        reporte = self.clinica.agendar_turnos_lote([
+            ("99887766", "MP201", "Cardiologia", datetime(2030, 6, 3, 10, 0)),
+            ("66554433", "MP201", "Cardiologia", datetime(2030, 6, 3, 10, 15)),
+            ("66554433", "MP201", "Cardiologia", datetime(2030, 6, 3, 8, 15)),
+        ])
+
+        self.assertEqual([resultado["ok"] for resultado in reporte], [False, False, False])
+        self.assertEqual(reporte[0]["error"], LOTE_RECHAZADO)
+        self.assertEqual(len(self.clinica.obtener_turnos()), 1)
+
+    def test_agendar_turnos_lote_informa_cada_fila_invalida(self):
+
+        self._preparar_lote()
+        self.clinica.agendar_turno("99887766", "MP201", "Cardiologia", datetime(2030, 6, 3, 8, 0))
+        reporte = self.clinica.agendar_turnos_lote([
+            ("99887766", "MP201", None, datetime(2030, 6, 3, 10, 0)),
+            ("99887766", "MP201", "Cardiologia", datetime(2020, 6, 1, 10, 0)),
+            ("66554433", "MP201", "Cardiologia", datetime(2030, 6, 3, 8, 0)),
+            ("66554433", "MP201", "Cardiologia", datetime(2030, 6, 3, 11, 0), 0),
+            ("66554433", "MP201", " Cardiologia ", datetime(2030, 6, 3, 12, 0)),
+        ])
+
+        self.assertEqual([resultado["ok"] for resultado in reporte], [False] * 5)
+        self.assertIn("especialidad", reporte[0]["error"])
+        self.assertIn("futuro", reporte[1]["error"])
+        self.assertIn("superpone", reporte[2]["error"])
+        self.assertIn("duracion", reporte[3]["error"])
+        self.assertEqual(reporte[4]["error"], LOTE_RECHAZADO)
+
+        reporte = self.clinica.agendar_turnos_lote([("66554433", "MP201", " Cardiologia ", datetime(2030, 6, 3, 12, 0))])
+        self.assertTrue(reporte[0]["ok"])
+        self.assertEqual(self.clinica.obtener_turno("MP201@2030-06-03T12:00:00").obtener_especialidad(), "Cardiologia")
+
+    #Busqueda de turnos disponibles
+
+    def _preparar_busqueda(self):
+
+        self._preparar_lote()
+        self.medico2.agregar_especialidad(Especialidad("Cardiologia", ["martes"]))
+        self.clinica.agregar_medico(self.medico2)
+
+    def test_buscar_turnos_disponibles_saltea_ocupados(self):
+
+        self._preparar_busqueda()
+        self.clinica.agendar_turno("99887766", "MP201", "Cardiologia", datetime(2030, 6, 3, 8, 0), 45)
+
+        disponibles = self.clinica.buscar_turnos_disponibles("cardiología", cantidad=2, desde=datetime(2030, 6, 3, 7, 0))
+        self.assertEqual(disponibles, [(datetime(2030, 6, 3, 9, 0), "MP201"), (datetime(2030, 6, 3, 9, 30), "MP201")])
+
+    def test_buscar_turnos_disponibles_combina_medicos_en_orden(self):
+
+        self._preparar_busqueda()
+        disponibles = self.clinica.buscar_turnos_disponibles(
+            "Cardiologia", cantidad=3, desde=datetime(2030, 6, 3, 17, 10), hora_inicio=time(17, 0), hora_fin=time(18, 0)
+        )
+        self.assertEqual(disponibles, [
+            (datetime(2030, 6, 3, 17, 30), "MP201"),
+            (datetime(2030, 6, 4, 17, 0), "MP202"),
+            (datetime(2030, 6, 4, 17, 30), "MP202"),
+        ])
+
+    def test_buscar_turnos_disponibles_sin_medicos_de_la_especialidad(self):
+
+        self._preparar_busqueda()
+        self.assertEqual(self.clinica.buscar_turnos_disponibles("Pediatria", desde=datetime(2030, 6, 3)), [])
+        with self.assertRaises(DatoInvalidoException):
+            self.clinica.buscar_turnos_disponibles("Cardiologia", cantidad=0)
     
 if __name__ == '__main__':
     unittest.main(verbosity=2)
\ No newline at end of file
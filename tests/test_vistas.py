@@ -0,0 +1,96 @@
+import unittest
+from datetime import datetime
+from src.models.paciente import Paciente
+from src.models.medico import Medico
+from src.models.especialidad import Especialidad
+from src.models.clinica import Clinica
+from src.models.vistas import VistaEncadenada, VistaSecuencia, paginar
+from src.exceptions.error import DatoInvalidoException
+
+class TestVistas(unittest.TestCase):
+
+    def setUp(self):
+        self.clinica = Clinica()
+        for i in range(5):
+            self.clinica.agregar_paciente(Paciente("Paciente Prueba", f"1000000{i}", "01/01/1990"))
+        self.clinica.agregar_medico(Medico("Dr. Roberto Silva", "MP101"))
+
+    #Paginacion
+
+    def test_obtener_pacientes_paginado(self):
+
+        pagina = self.clinica.obtener_pacientes(offset=1, limit=2)
+        self.assertEqual([p.obtener_dni() for p in pagina], ["10000001", "10000002"])
+        self.assertEqual(len(self.clinica.obtener_pacientes(offset=4)), 1)
+
+    def test_paginar_parametros_invalidos(self):
+
+        with self.assertRaises(DatoInvalidoException):
+            paginar([1, 2, 3], offset=-1)
+        with self.assertRaises(DatoInvalidoException):
+            paginar([1, 2, 3], limit=-1)
+
+    def test_historia_recetas_paginadas(self):
+
+        for medicamento in ["Aspirina", "Paracetamol", "Ibuprofeno"]:
+            self.clinica.emitir_receta("10000000", "MP101", [medicamento])
+
+        historia = self.clinica.obtener_historia_clinica("10000000")
+        pagina = historia.obtener_recetas(offset=1, limit=1)
+        self.assertEqual(len(pagina), 1)
+        self.assertIn("Paracetamol", str(pagina[0]))
+
+    #Vistas de solo lectura
+
+    def test_vista_pacientes_refleja_cambios_y_es_de_solo_lectura(self):
+
+        vista = self.clinica.vista_pacientes()
+        self.clinica.agregar_paciente(Paciente("Paciente Nuevo", "20000000", "01/01/1990"))
+
+        self.assertIn("20000000", vista)
+        with self.assertRaises(TypeError):
+            vista["30000000"] = None
+
+    def test_vista_recetas_no_copia(self):
+
+        historia = self.clinica.obtener_historia_clinica("10000000")
+        vista = historia.vista_recetas()
+        self.assertEqual(len(vista), 0)
+
+        self.clinica.emitir_receta("10000000", "MP101", ["Aspirina"])
+        self.assertEqual(len(vista), 1)
+        self.assertIsInstance(vista, VistaSecuencia)
+        self.assertFalse(hasattr(vista, "append"))
+        self.assertEqual(vista.pagina(0, 1)[0].obtener_paciente().obtener_dni(), "10000000")
+
+    def test_vista_encadenada_sobre_varias_partes(self):
+
+        lista, activos = [1, 2], dict.fromkeys([3, 4, 5])
+        vista = VistaEncadenada((lista.__len__, lista.__iter__), (activos.__len__, activos.__iter__))
+
+        self.assertEqual(list(vista), [1, 2, 3, 4, 5])
+        self.assertEqual((vista[0], vista[3], vista[-1]), (1, 4, 5))
+        self.assertEqual(vista[1:4], [2, 3, 4])
+        self.assertEqual(vista[::-2], [5, 3, 1])
+        self.assertEqual(vista.pagina(3, 5), [4, 5])
+        with self.assertRaises(IndexError):
+            vista[5]
+        activos[6] = None
+        self.assertEqual(len(vista), 6)
+        self.assertEqual(list(reversed(vista))[0], 6)
+
+    def test_vista_turnos_no_copia(self):
+
+        medico = self.clinica.obtener_medico_por_matricula("MP101")
+        medico.agregar_especialidad(Especialidad("Cardiologia", ["lunes"]))
+        vista = self.clinica.vista_turnos()
+        historia = self.clinica.obtener_historia_clinica("10000000").vista_turnos()
+
+        # 2030-06-03 es lunes
+        self.clinica.agendar_turno("10000000", "MP101", "Cardiologia", datetime(2030, 6, 3, 10, 0))
+        self.assertEqual(len(vista), 1)
+        self.assertEqual(historia[0].obtener_fecha_hora(), datetime(2030, 6, 3, 10, 0))
+        self.assertFalse(hasattr(vista, "append"))
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)